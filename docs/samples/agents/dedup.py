@@ -3,13 +3,17 @@
 import re
 
 from ..llm_service import calc_distance_m
+from ..metrics import traced
+
+_BRANCH_SUFFIX_RE = re.compile(r"\s*(본점|지점|점|역점|직영점)\s*$")
+_SPACES_RE = re.compile(r"\s+")
 
 
 def normalize_name(name: str) -> str:
     """Normalize place name for dedup matching."""
     result = name.strip().lower()
-    result = re.sub(r"\s*(본점|지점|점|역점|직영점)\s*$", "", result)
-    result = re.sub(r"\s+", " ", result)
+    result = _BRANCH_SUFFIX_RE.sub("", result)
+    result = _SPACES_RE.sub(" ", result)
     return result
 
 
@@ -30,6 +34,7 @@ def is_same_place(a: dict, b: dict) -> bool:
     return True
 
 
+@traced("dedup")
 def deduplicate_places(places: list[dict]) -> list[dict]:
     """Deduplicate crawled places by name + proximity, merge sources."""
     groups: list[dict] = []
@@ -1,15 +1,24 @@
 """DiningCode scraper — extract POI data from list page."""
 
+import os
 import json
+import codecs
+import hashlib
 import re
 import logging
 import random
+from urllib.parse import quote
 
-import requests
-from bs4 import BeautifulSoup
+from ..metrics import counter, span, traced
 
 logger = logging.getLogger(__name__)
 
+DININGCODE_BASE_URL = os.getenv("DININGCODE_BASE_URL", "https://www.diningcode.com")
+STREAM_LIST_PAGES = os.getenv("DINING_DC_STREAM", "1") == "1"  # stop list downloads once listData + cards are in
+STREAM_CHUNK_BYTES = 16 * 1024
+
+FETCH_BYTES = counter("dining_diningcode_fetch_bytes_total", "Decoded DiningCode bytes read, by fetch mode")
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -17,8 +26,58 @@ USER_AGENTS = [
 ]
 
 
-def _fetch_html(url: str, timeout: int = 15) -> str:
-    resp = requests.get(
+_LIST_DATA_RE = re.compile(r"localStorage\.setItem\('listData',\s*'(.+?)'\)")
+_LIST_DATA_START = "localStorage.setItem('listData'"
+_CARD_RE = re.compile(r"""<li\b[^>]*class=["'][^"']*(?:PoiBlock|dc-poi|poi)""")
+_OVERLAP = 200  # longer than any marker we look for, so chunk edges are rescanned
+_PROFILE_HOST_RE = re.compile(r"^https?://(www\.)?diningcode\.com")
+_MENU_DATA_RE = re.compile(r"const\s+menuData\s*=\s*(\[[\s\S]*?\]);")
+
+
+class ListPageScanner:
+    """Watches a list page arrive and says when parse_list_page has all it needs.
+
+    That is the listData payload plus, when some POIs have no tags in
+    listData, one closed HTML card per POI (the tag fallback). Pages without
+    recognisable cards are read to the end.
+    """
+
+    def __init__(self):
+        self.html = ""
+        self._list_start = -1
+        self._scan_pos = 0
+        self._cards_needed: int | None = None  # known once listData is complete
+        self._cards = 0
+
+    def feed(self, text: str) -> bool:
+        self.html += text
+        if self._cards_needed is None:
+            if self._list_start < 0:
+                self._list_start = self.html.find(_LIST_DATA_START, self._scan_pos)
+                if self._list_start < 0:
+                    self._scan_pos = max(0, len(self.html) - _OVERLAP)
+                    return False
+            m = _LIST_DATA_RE.search(self.html, self._list_start)
+            if not m:
+                return False
+            pois = _decode_list_data(m.group(1))[:20]
+            untagged = any(not (_extract_terms(poi.get("keyword")) or _extract_terms(poi.get("hash"))) for poi in pois)
+            self._cards_needed = len(pois) if untagged else 0
+            self._scan_pos = 0  # cards may come before the script
+        if not self._cards_needed:
+            return True
+
+        last = None
+        for last in _CARD_RE.finditer(self.html, self._scan_pos):
+            self._cards += 1
+        self._scan_pos = last.end() if last else max(self._scan_pos, len(self.html) - _OVERLAP)
+        return self._cards >= self._cards_needed and self.html.find("</li>", self._scan_pos) >= 0
+
+
+def _request(url: str, timeout: int, stream: bool = False):
+    import requests  # loaded on first use, like bs4 below
+
+    return requests.get(
         url,
         headers={
             "User-Agent": random.choice(USER_AGENTS),
@@ -26,26 +85,52 @@ def _fetch_html(url: str, timeout: int = 15) -> str:
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
         },
         timeout=timeout,
+        stream=stream,
     )
-    resp.raise_for_status()
-    return resp.text
+
+
+@traced("diningcode.fetch")
+def _fetch_html(url: str, timeout: int = 15, scanner: ListPageScanner | None = None) -> str:
+    """Download a page; with a scanner, stream it and hang up once the scanner is satisfied."""
+    if scanner is None:
+        resp = _request(url, timeout)
+        resp.raise_for_status()
+        FETCH_BYTES.inc(len(resp.content), mode="full")
+        return resp.text
+
+    with _request(url, timeout, stream=True) as resp:
+        resp.raise_for_status()
+        # iter_content un-gzips incrementally; the text decoder keeps split multi-byte characters
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        read = 0
+        for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+            read += len(chunk)
+            if scanner.feed(decoder.decode(chunk)):
+                break
+        else:
+            scanner.feed(decoder.decode(b"", final=True))
+    FETCH_BYTES.inc(read, mode="stream")
+    return scanner.html
 
 
 def _extract_list_data(html: str) -> list[dict]:
     """Extract listData from DiningCode list page localStorage script."""
+    from bs4 import BeautifulSoup  # crawl path only; warmup.py leaves it out of the master
+
     soup = BeautifulSoup(html, "html.parser")
     list_data_raw = ""
 
     for script in soup.find_all("script"):
         text = script.string or ""
-        m = re.search(r"localStorage\.setItem\('listData',\s*'(.+?)'\)", text)
+        m = _LIST_DATA_RE.search(text)
         if m:
             list_data_raw = m.group(1)
             break
 
-    if not list_data_raw:
-        return []
+    return _decode_list_data(list_data_raw) if list_data_raw else []
+
 
+def _decode_list_data(list_data_raw: str) -> list[dict]:
     try:
         # Double-escaped JSON — strip JS-escaped single quotes
         sanitized = list_data_raw.replace("\\'", "'")
@@ -70,25 +155,46 @@ def _extract_terms(field) -> str | None:
     return None
 
 
+def fetch_list_page(search_term: str, stream: bool = STREAM_LIST_PAGES) -> str:
+    """Download the DiningCode list page for a search term.
+
+    Streaming stops after the listData script and the cards parse_list_page
+    needs, so the returned HTML may be a prefix of the page.
+    """
+    encoded = quote(search_term)
+    url = f"{DININGCODE_BASE_URL}/list.dc?query={encoded}"
+    return _fetch_html(url, scanner=ListPageScanner() if stream else None)
+
+
+def page_fingerprint(html: str) -> str:
+    """Content hash of a list page — the listData payload, ignoring ads and markup churn."""
+    m = _LIST_DATA_RE.search(html)
+    return hashlib.sha256((m.group(1) if m else html).encode()).hexdigest()
+
+
 def crawl_diningcode(search_term: str) -> list[dict]:
     """Crawl DiningCode for a search term and return raw place data."""
-    encoded = requests.utils.quote(search_term)
-    url = f"https://www.diningcode.com/list.dc?query={encoded}"
-    html = _fetch_html(url)
+    return parse_list_page(fetch_list_page(search_term))
 
-    poi_list = _extract_list_data(html)
-    soup = BeautifulSoup(html, "html.parser")
 
-    # Build tag map from HTML cards
-    html_tag_map: dict[str, str] = {}
-    for el in soup.select(".PoiBlock, .dc-poi, li[class*='poi']"):
-        name_el = el.select_one(".InfoHeader, .tit, .name")
-        tag_el = el.select_one(".Hash, .Category, .keyword, .tag")
-        if name_el and tag_el:
-            card_name = name_el.get_text(strip=True)
-            tag_text = tag_el.get_text(strip=True).replace("#", "").strip()
-            if card_name and tag_text:
-                html_tag_map[card_name] = tag_text
+def parse_list_page(html: str) -> list[dict]:
+    """Turn a DiningCode list page into raw place dicts."""
+    from bs4 import BeautifulSoup
+
+    with span("diningcode.parse"):
+        poi_list = _extract_list_data(html)
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Build tag map from HTML cards
+        html_tag_map: dict[str, str] = {}
+        for el in soup.select(".PoiBlock, .dc-poi, li[class*='poi']"):
+            name_el = el.select_one(".InfoHeader, .tit, .name")
+            tag_el = el.select_one(".Hash, .Category, .keyword, .tag")
+            if name_el and tag_el:
+                card_name = name_el.get_text(strip=True)
+                tag_text = tag_el.get_text(strip=True).replace("#", "").strip()
+                if card_name and tag_text:
+                    html_tag_map[card_name] = tag_text
 
     results = []
     for poi in poi_list[:20]:
@@ -121,3 +227,38 @@ def crawl_diningcode(search_term: str) -> list[dict]:
         })
 
     return results
+
+
+# --------------- Profile pages (menus) ---------------
+
+MENU_LIMIT = 10
+
+
+def profile_url(source_url: str) -> str:
+    """Point a stored profile link at DININGCODE_BASE_URL (a stand-in in benchmarks)."""
+    return _PROFILE_HOST_RE.sub(DININGCODE_BASE_URL, source_url)
+
+
+def _extract_menu_data(html: str) -> list[dict]:
+    """Extract the menuData JSON array from a profile page."""
+    m = _MENU_DATA_RE.search(html)
+    if not m:
+        return []
+    try:
+        data = json.loads(m.group(1))
+    except ValueError:
+        return []
+    return [d for d in data if isinstance(d, dict) and d.get("menu")] if isinstance(data, list) else []
+
+
+def parse_profile_menus(html: str) -> tuple[list[dict], str | None]:
+    """Top-ranked menus (up to MENU_LIMIT) and tags: best menus first, else top 3 by rank."""
+    menu_data = _extract_menu_data(html)
+    if not menu_data:
+        return [], None
+
+    by_rank = sorted(menu_data, key=lambda m: m.get("rank") or 0)
+    best = [m["menu"] for m in menu_data if m.get("best") == 1]
+    tags = ", ".join(best or [m["menu"] for m in by_rank[:3]])
+    menus = [{"menuName": m["menu"], "price": m.get("price") or None} for m in by_rank[:MENU_LIMIT]]
+    return menus, tags
@@ -0,0 +1,250 @@
+"""Fuzzy place matching — MinHash/LSH blocking, confirmed by similarity + 200m.
+
+Each name gets two views:
+
+- ``name_key``: normalize_name without spaces or punctuation
+  ("스타벅스 이태원점" → "스타벅스이태원");
+- ``phonetic_key``: romanized (Revised Romanization for Hangul) and reduced
+  to consonant classes, so "Blue Bottle" and "블루보틀" both become "plptl".
+
+Character 2-gram MinHash signatures of each view are banded (LSH); two
+places become candidates when any band of either view collides. A
+candidate pair is a match when its names are similar enough and, if both
+have coordinates, they are within MATCH_DISTANCE_M — the same 200m rule as
+dedup.is_same_place.
+"""
+
+import re
+import struct
+import hashlib
+from array import array
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from ..llm_service import calc_distance_m
+from .dedup import normalize_name
+
+MATCH_DISTANCE_M = 200
+NAME_SIMILARITY = 0.8  # SequenceMatcher ratio of name keys
+PHONETIC_SIMILARITY = 0.85  # ratio of phonetic keys, used across Hangul/Latin names
+NO_COORD_SIMILARITY = 0.9  # stricter when the distance rule can't be applied
+
+BANDS = 12
+ROWS = 2
+NUM_PERM = BANDS * ROWS
+_GRAM_STRUCT = struct.Struct(f"<{NUM_PERM}I")
+_GRAM_CACHE_MAX = 1 << 20
+# Blocking cells are a bit larger than MATCH_DISTANCE_M everywhere in Korea (lat ≤ 38.6°),
+# so a match is always in the same or a neighbouring cell
+_CELL_LAT = MATCH_DISTANCE_M * 1.05 / 111_320
+_CELL_LNG = _CELL_LAT / 0.78
+_HALF_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+# --------------- Keys ---------------
+
+_INITIALS = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we",
+            "wi", "yu", "eu", "ui", "i"]
+_FINALS = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "p", "l", "l", "p", "l", "m", "p", "p",
+           "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+_NON_KEY_RE = re.compile(r"[^0-9a-z가-힣]")
+_NON_ALPHA_RE = re.compile(r"[^a-z]")
+_VOWELS_RE = re.compile(r"[aeiouhwy]")
+_REPEATS_RE = re.compile(r"(.)\1+")
+_PHONETIC_CLASSES = str.maketrans({
+    "b": "p", "f": "p", "v": "p",
+    "c": "k", "g": "k", "q": "k",
+    "d": "t",
+    "z": "s", "x": "s", "j": "s",
+    "r": "l",
+})
+
+
+def name_key(name: str) -> str:
+    """normalize_name, then drop spaces and punctuation."""
+    return _NON_KEY_RE.sub("", normalize_name(name or ""))
+
+
+def romanize(text: str) -> str:
+    """Hangul syllables → Revised Romanization; everything else passes through."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_INITIALS[code // 588] + _MEDIALS[(code % 588) // 28] + _FINALS[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def phonetic_key(name: str) -> str:
+    """Consonant-class skeleton of the romanized name key."""
+    text = romanize(name_key(name)).replace("ck", "k").replace("ph", "f")
+    text = _NON_ALPHA_RE.sub("", text).translate(_PHONETIC_CLASSES)
+    text = _VOWELS_RE.sub("", text)
+    return _REPEATS_RE.sub(r"\1", text)
+
+
+def _has_hangul(text: str) -> bool:
+    return any("가" <= ch <= "힣" for ch in text)
+
+
+def _key_similarity(ka: str, kb: str, pa: str, pb: str) -> float:
+    if ka == kb:
+        return 1.0
+    score = SequenceMatcher(None, ka, kb).ratio()
+    if _has_hangul(ka) != _has_hangul(kb) and min(len(pa), len(pb)) >= 3:
+        # Rescale so PHONETIC_SIMILARITY lines up with NAME_SIMILARITY
+        phon = SequenceMatcher(None, pa, pb).ratio()
+        score = max(score, phon * NAME_SIMILARITY / PHONETIC_SIMILARITY)
+    return score
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Best similarity of two names over both views (1.0 = same key)."""
+    return _key_similarity(name_key(a), name_key(b), phonetic_key(a), phonetic_key(b))
+
+
+def _is_match(a: dict, b: dict, similarity) -> bool:
+    has_coords = all(p.get("lat") is not None and p.get("lng") is not None for p in (a, b))
+    if has_coords and calc_distance_m(a["lat"], a["lng"], b["lat"], b["lng"]) > MATCH_DISTANCE_M:
+        return False
+    return similarity() >= (NAME_SIMILARITY if has_coords else NO_COORD_SIMILARITY)
+
+
+def is_fuzzy_match(a: dict, b: dict) -> bool:
+    """Fuzzy counterpart of dedup.is_same_place."""
+    return _is_match(a, b, lambda: name_similarity(a["name"], b["name"]))
+
+
+# --------------- MinHash / LSH ---------------
+
+
+_gram_cache: dict[str, tuple] = {}
+
+
+def _gram_hashes(gram: str) -> tuple:
+    # NUM_PERM independent 32-bit hashes from one SHAKE digest; 2-grams repeat a lot, so cache them
+    values = _gram_cache.get(gram)
+    if values is None:
+        if len(_gram_cache) >= _GRAM_CACHE_MAX:
+            _gram_cache.clear()
+        values = _gram_cache[gram] = _GRAM_STRUCT.unpack(
+            hashlib.shake_128(gram.encode()).digest(_GRAM_STRUCT.size)
+        )
+    return values
+
+
+def minhash(key: str) -> list[int]:
+    """NUM_PERM 32-bit MinHash values of a key's character 2-grams."""
+    grams = [key[i:i + 2] for i in range(len(key) - 1)] or [key]
+    if len(grams) == 1:
+        return list(_gram_hashes(grams[0]))
+    return list(map(min, zip(*map(_gram_hashes, grams))))
+
+
+def _cell(lat: float, lng: float) -> tuple[int, int]:
+    return int(lat // _CELL_LAT), int(lng // _CELL_LNG)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def find_duplicate_groups(places: list[dict]) -> list[list[int]]:
+    """Index groups (size ≥ 2) of places that fuzzy-match, smallest index first."""
+    n = len(places)
+    keys = [name_key(p["name"]) for p in places]
+    phonetic = [phonetic_key(p["name"]) for p in places]
+    views = []
+    for view in (keys, phonetic):
+        sigs = array("Q")
+        for key in view:
+            sigs.extend(minhash(key))
+        views.append(sigs)
+
+    cells = [
+        _cell(p["lat"], p["lng"]) if p.get("lat") is not None and p.get("lng") is not None else None
+        for p in places
+    ]
+    uf = _UnionFind(n)
+    rejected: set[tuple[int, int]] = set()
+
+    def check(i: int, j: int):
+        if uf.find(i) == uf.find(j) or (i, j) in rejected:
+            return
+        if _is_match(places[i], places[j], lambda: _key_similarity(keys[i], keys[j], phonetic[i], phonetic[j])):
+            uf.union(i, j)
+        else:
+            rejected.add((i, j))
+
+    for sigs in views:
+        for band in range(BANDS):
+            located: dict[tuple, list[int]] = defaultdict(list)  # (band value, cell) -> places
+            floating: dict[int, list[int]] = defaultdict(list)  # band value -> places without coords
+            values = []
+            for i in range(n):
+                s = i * NUM_PERM + band * ROWS
+                value = (sigs[s] << 32) | sigs[s + 1]
+                values.append(value)
+                if cells[i] is None:
+                    floating[value].append(i)
+                else:
+                    located[(value, *cells[i])].append(i)
+
+            for (value, cx, cy), members in located.items():
+                for x, i in enumerate(members):
+                    for j in members[x + 1:]:
+                        check(i, j)
+                for dx, dy in _HALF_NEIGHBOURS:
+                    for j in located.get((value, cx + dx, cy + dy), ()):
+                        for i in members:
+                            check(min(i, j), max(i, j))
+            if floating:
+                # Places without coordinates meet every place with the same band value
+                for i in range(n):
+                    for j in floating.get(values[i], ()):
+                        if i < j or (i > j and cells[i] is not None):
+                            check(min(i, j), max(i, j))
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in range(n):
+        groups[uf.find(i)].append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+class SeedMatcher:
+    """Fuzzy lookup of crawled places against the (small) seed list."""
+
+    def __init__(self, seed_places: list[dict]):
+        self._keys = {name_key(p["name"]) for p in seed_places}
+        self._cells: dict[tuple[int, int], list[dict]] = defaultdict(list)
+        for p in seed_places:
+            if p.get("lat") is not None and p.get("lng") is not None:
+                self._cells[_cell(p["lat"], p["lng"])].append(p)
+
+    def matches(self, place: dict) -> bool:
+        if name_key(place["name"]) in self._keys:
+            return True
+        if place.get("lat") is None or place.get("lng") is None:
+            return False
+        cx, cy = _cell(place["lat"], place["lng"])
+        return any(
+            is_fuzzy_match(place, seed)
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            for seed in self._cells.get((cx + dx, cy + dy), ())
+        )
@@ -0,0 +1,64 @@
+"""Payload size and latency per zoom level: clustered vs. raw bounds query.
+
+Usage (from repo root):
+    python -m docs.samples.bench.cluster_zoom --places 50000
+"""
+
+import argparse
+import json
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+
+def _viewport(zoom: int) -> dict:
+    # ~4 tiles across, the size of a typical phone/desktop map
+    half = 360.0 / (2 ** zoom) * 2
+    return {"swLat": SEOUL_LAT - half / 2, "neLat": SEOUL_LAT + half / 2,
+            "swLng": SEOUL_LNG - half, "neLng": SEOUL_LNG + half}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_dining_db():
+        from ..models import CrawledPlace, get_dining_read_session, get_dining_session
+        from ..place_cluster import cluster_places, rebuild_place_grid
+        from ..place_mapper import map_crawled_to_places
+
+        session = get_dining_session()
+        session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.places))
+        session.commit()
+        rebuild_place_grid(session)
+
+        read = get_dining_read_session()
+        print(f"{'zoom':>4} {'raw_n':>7} {'raw_kb':>9} {'raw_ms':>8} {'clusters':>8} {'cl_kb':>7} {'cl_ms':>7}")
+        for zoom in range(8, 17):
+            bounds = _viewport(zoom)
+
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = read.query(CrawledPlace).filter(
+                    CrawledPlace.lat.between(bounds["swLat"], bounds["neLat"]),
+                    CrawledPlace.lng.between(bounds["swLng"], bounds["neLng"]),
+                ).all()
+                raw = json.dumps(map_crawled_to_places(rows), ensure_ascii=False).encode()
+                read.rollback()
+            raw_ms = (time.perf_counter() - t0) / args.repeat * 1000
+
+            t0 = time.perf_counter()
+            for _ in range(args.repeat):
+                clusters = cluster_places(read, bounds, zoom)
+                clustered = json.dumps(clusters, ensure_ascii=False).encode()
+                read.rollback()
+            cl_ms = (time.perf_counter() - t0) / args.repeat * 1000
+
+            print(f"{zoom:4d} {len(rows):7d} {len(raw) / 1024:9.1f} {raw_ms:8.1f} "
+                  f"{len(clusters):8d} {len(clustered) / 1024:7.1f} {cl_ms:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""diningcodeRank: JSON metadata + Python sort vs. the SQL window over dc_score.
+
+Loads 100k crawled places with DiningCode sources (metadata JSON only, as
+rows written before the dc_score column), times the backfill, then ranks a
+few viewport sizes both ways and checks they agree. "json" is what
+/api/places used to do after loading the rows: read every place's sources,
+json.loads the metadata and sort; "sql" is place_cache.diningcode_ranks.
+
+Usage (from repo root):
+    python -m docs.samples.bench.diningcode_rank --places 100000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+VIEWPORTS = [("street", 0.005), ("neighbourhood", 0.02), ("district", 0.05), ("city", 0.2)]
+
+
+def _bounds(half: float) -> dict:
+    return {"swLat": SEOUL_LAT - half, "swLng": SEOUL_LNG - half, "neLat": SEOUL_LAT + half, "neLng": SEOUL_LNG + half}
+
+
+def _json_ranks(session, bounds: dict) -> dict[int, int]:
+    from sqlalchemy.orm import selectinload
+
+    from ..models import CrawledPlace
+
+    rows = session.query(CrawledPlace).options(selectinload(CrawledPlace.sources)).filter(
+        CrawledPlace.lat >= bounds["swLat"], CrawledPlace.lat <= bounds["neLat"],
+        CrawledPlace.lng >= bounds["swLng"], CrawledPlace.lng <= bounds["neLng"],
+    ).all()
+    scored = []
+    for cp in rows:
+        dc = next((s for s in cp.sources if s.source == "diningcode"), None)
+        if dc and dc.metadata_:
+            score = json.loads(dc.metadata_).get("score")
+            if score is not None:
+                scored.append((cp.id, score))
+    scored.sort(key=lambda x: (-x[1], x[0]))
+    return {pid: i for i, (pid, _) in enumerate(scored, start=1)}
+
+
+def _time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_dining_db():
+        from .. import models
+        from ..models import CrawledPlace, PlaceSource, get_dining_read_session, get_dining_session
+        from ..place_cache import diningcode_ranks
+
+        rng = random.Random(0)
+        session = get_dining_session()
+        places = [{**r, "id": i} for i, r in enumerate(crawled_place_rows(args.places), start=1)]
+        session.bulk_insert_mappings(CrawledPlace, places)
+        session.bulk_insert_mappings(PlaceSource, [
+            {"crawled_place_id": p["id"], "source": "diningcode",
+             "metadata_": json.dumps({"score": round(rng.uniform(60, 95), 1)}) if rng.random() < 0.9 else None}
+            for p in places
+        ])
+        session.commit()
+        session.remove()
+
+        t0 = time.perf_counter()
+        models._backfill_dc_scores(models._get_engine())
+        print(f"{args.places} places, dc_score backfill {time.perf_counter() - t0:.2f}s")
+
+        read = get_dining_read_session()
+        print(f"{'viewport':<14} {'places':>7} {'json ms':>8} {'sql ms':>8}")
+        for label, half in VIEWPORTS:
+            bounds = _bounds(half)
+            expected = _json_ranks(read, bounds)
+            assert diningcode_ranks(read, bounds) == expected, label
+            json_ms = _time(lambda: _json_ranks(read, bounds), args.repeat)
+            read.expunge_all()
+            sql_ms = _time(lambda: diningcode_ranks(read, bounds), args.repeat)
+            print(f"{label:<14} {len(expected):>7} {json_ms:>8.1f} {sql_ms:>8.1f}")
+        read.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Mixed read/write concurrency benchmark for the dining.db engine profile.
+
+Usage (from repo root):
+    python -m docs.samples.bench.engine_concurrency --readers 6 --writers 2 --seconds 10
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+SEOUL_LAT, SEOUL_LNG = 37.55, 126.98
+
+
+def _random_place(rng: random.Random, i: int) -> dict:
+    return {
+        "name": f"벤치식당{i}",
+        "category": rng.choice(["한식", "일식", "카페", "술집"]),
+        "lat": SEOUL_LAT + rng.uniform(-0.05, 0.05),
+        "lng": SEOUL_LNG + rng.uniform(-0.05, 0.05),
+        "sources": [{"source": "diningcode", "rating": rng.uniform(3, 5)}],
+    }
+
+
+def _reader(db_path: str, seconds: float, out: mp.Queue):
+    os.environ["DINING_DB_PATH"] = db_path
+    from ..models import get_dining_read_session
+    from ..place_cache import find_cached_places
+
+    session = get_dining_read_session()
+    rng = random.Random(os.getpid())
+    ops, errors, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        lat, lng = SEOUL_LAT + rng.uniform(-0.04, 0.04), SEOUL_LNG + rng.uniform(-0.04, 0.04)
+        bounds = {"swLat": lat - 0.01, "neLat": lat + 0.01, "swLng": lng - 0.01, "neLng": lng + 0.01}
+        t0 = time.perf_counter()
+        try:
+            find_cached_places(session, bounds)
+            session.rollback()
+            ops += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    out.put(("read", ops, errors, latencies))
+
+
+def _writer(db_path: str, seconds: float, out: mp.Queue):
+    os.environ["DINING_DB_PATH"] = db_path
+    from ..models import get_dining_session
+    from ..place_cache import save_crawled_places
+
+    session = get_dining_session()
+    rng = random.Random(os.getpid())
+    ops, errors, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            save_crawled_places(session, [_random_place(rng, rng.randrange(5000))])
+            ops += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    out.put(("write", ops, errors, latencies))
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=6)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "dining.db")
+        os.environ["DINING_DB_PATH"] = db_path
+        from ..models import get_dining_session, init_dining_db
+        from ..place_cache import save_crawled_places
+
+        init_dining_db()
+        rng = random.Random(0)
+        save_crawled_places(get_dining_session()(), [_random_place(rng, i) for i in range(args.seed_rows)])
+
+        out: mp.Queue = mp.Queue()
+        procs = [mp.Process(target=_reader, args=(db_path, args.seconds, out)) for _ in range(args.readers)]
+        procs += [mp.Process(target=_writer, args=(db_path, args.seconds, out)) for _ in range(args.writers)]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    for kind in ("read", "write"):
+        rows = [r for r in results if r[0] == kind]
+        ops = sum(r[1] for r in rows)
+        errors = sum(r[2] for r in rows)
+        lat = [x for r in rows for x in r[3]]
+        print(
+            f"{kind:5s} ops/s={ops / args.seconds:8.1f} errors={errors:4d} "
+            f"p50={_pct(lat, 0.5):6.2f}ms p99={_pct(lat, 0.99):6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Facet filters: bitmap index vs. a linear scan, multi-facet queries at 1M places.
+
+Places get a type, a price range, an atmosphere, 1–3 goodFor values and
+2–5 tags drawn from a long-tailed vocabulary. Each query combines the
+bounds with several facets and also computes the facet counts, which is
+what /api/places?…&facets=1 does before loading rows.
+
+Usage (from repo root):
+    python -m docs.samples.bench.facet_filter --places 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, _TAGS
+
+PRICES = ["₩", "₩₩", "₩₩₩", "₩₩₩₩"]
+ATMOSPHERES = ["조용한", "활기찬", "캐주얼", "로맨틱", "모던", "전통적", "깔끔한", "아늑한"]
+GOOD_FOR = ["데이트", "가족", "혼밥", "회식", "친구", "기념일", "접대", "단체", "술자리", "외국인"]
+TYPES = ["restaurant", "restaurant", "cafe", "bar", "bakery"]
+EXTRA_TAGS = [f"태그{i}" for i in range(2000)]
+
+QUERIES = [
+    ("downtown, cafe + 데이트", 0.03, {"type": ["cafe"], "goodFor": ["데이트"]}),
+    ("downtown, 3 facets", 0.03, {"type": ["restaurant"], "priceRange": ["₩", "₩₩"], "goodFor": ["혼밥"]}),
+    ("city, 4 facets", 0.2, {"type": ["restaurant", "bar"], "priceRange": ["₩₩"], "atmosphere": ["활기찬"],
+                             "goodFor": ["회식", "단체"]}),
+    ("city, rare tag", 0.2, {"tags": ["태그1500"], "type": ["cafe"]}),
+    ("neighbourhood, counts only", 0.01, {}),
+]
+
+
+def _docs(n: int, seed: int = 0):
+    from ..facet_index import _values
+
+    rng = random.Random(seed)
+    tags = _TAGS + EXTRA_TAGS
+    weights = [1 / (i + 1) for i in range(len(tags))]
+    for i in range(n):
+        yield (
+            "crawled", i, SEOUL_LAT + rng.gauss(0, 0.05), SEOUL_LNG + rng.gauss(0, 0.06),
+            _values(rng.choice(TYPES), rng.choice(PRICES), rng.choice(ATMOSPHERES),
+                    ",".join(rng.sample(GOOD_FOR, rng.randint(1, 3))),
+                    ", ".join(set(rng.choices(tags, weights, k=rng.randint(2, 5))))),
+        )
+
+
+def _bounds(half: float) -> dict:
+    return {"swLat": SEOUL_LAT - half, "swLng": SEOUL_LNG - half, "neLat": SEOUL_LAT + half, "neLng": SEOUL_LNG + half}
+
+
+def _scan(docs, bounds: dict, filters: dict) -> int:
+    wanted = {f: set(v) for f, v in filters.items()}
+    hits = 0
+    for _, _, lat, lng, values in docs:
+        if not (bounds["swLat"] <= lat <= bounds["neLat"] and bounds["swLng"] <= lng <= bounds["neLng"]):
+            continue
+        have: dict[str, set] = {}
+        for f, v in values:
+            have.setdefault(f, set()).add(v)
+        if all(have.get(f, set()) & vals for f, vals in wanted.items()):
+            hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scan-repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    from ..facet_index import FacetIndex
+
+    docs = list(_docs(args.places))
+    t0 = time.perf_counter()
+    index = FacetIndex.build(docs)
+    print(f"{args.places} places, {len(index.value_names)} facet values, build {time.perf_counter() - t0:.1f}s")
+    print(f"{'query':<28} {'hits':>7} {'p50 ms':>8} {'p95 ms':>8} {'scan ms':>9}")
+    for label, half, filters in QUERIES:
+        bounds = _bounds(half)
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            matches, _counts = index.query(bounds, filters)
+            times.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        for _ in range(args.scan_repeat):
+            expected = _scan(docs, bounds, filters)
+        scan_ms = (time.perf_counter() - t0) * 1000 / args.scan_repeat
+        assert expected == len(matches), (label, expected, len(matches))
+        times.sort()
+        print(f"{label:<28} {len(matches):>7} {statistics.median(times):>8.1f} "
+              f"{times[int(len(times) * 0.95) - 1]:>8.1f} {scan_ms:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""DiningCode list page fetch: full download vs. streaming with early termination.
+
+The stand-in serves large list pages at a throttled rate (gzip-compressed
+with --gzip; the stand-in padding compresses very well, so wire savings
+shrink there while decode work stays).
+For each mode the bench fetches and parses the same queries and reports
+time per page, bytes on the wire (server side, so a hang-up counts) and
+peak Python memory during fetch + parse. "card tags" pages keep the tags
+only in the HTML cards, so the streaming fetch also has to wait for those.
+
+Usage (from repo root):
+    python -m docs.samples.bench.list_page_fetch --pages 20 --page-kb 512 --kbps 2048
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+from .standins import Behavior, StandinServer
+
+
+def _run(fetch_list_page, parse_list_page, server, queries: list[str], stream: bool) -> dict:
+    stats = server.stats["diningcode"]
+    bytes_before = stats.bytes_out
+    tracemalloc.start()
+    started = time.perf_counter()
+    places = 0
+    for q in queries:
+        places += len(parse_list_page(fetch_list_page(q, stream=stream)))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    time.sleep(0.2)  # let the server notice hang-ups before reading its byte count
+    return {
+        "msPerPage": elapsed / len(queries) * 1000,
+        "kbPerPage": (stats.bytes_out - bytes_before) / len(queries) / 1024,
+        "peakKb": peak / 1024,
+        "places": places,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=512, help="padding before and after the list markup")
+    parser.add_argument("--kbps", type=float, default=2048, help="stand-in transfer rate")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    behavior = Behavior(latency_ms=args.latency_ms, bytes_per_sec=args.kbps * 1024, gzip=args.gzip)
+    queries = [f"벤치{i} 맛집" for i in range(args.pages)]
+    print(f"{args.pages} pages, ~{args.page_kb * 2}KB each before gzip, {args.kbps:.0f}KB/s")
+    print(f"{'page':>10} {'mode':>7} {'ms/page':>8} {'KB/page':>8} {'peak KB':>8} {'places':>7}")
+    for card_tags_only in (False, True):
+        with StandinServer(behaviors={"diningcode": behavior}, page_kb=args.page_kb,
+                           card_tags_only=card_tags_only) as server:
+            os.environ.update(server.env())
+            from ..agents import diningcode
+
+            diningcode.DININGCODE_BASE_URL = server.base_url
+            for stream in (False, True):
+                r = _run(diningcode.fetch_list_page, diningcode.parse_list_page, server, queries, stream)
+                print(f"{'card tags' if card_tags_only else 'listData':>10} {'stream' if stream else 'full':>7} "
+                      f"{r['msPerPage']:>8.1f} {r['kbPerPage']:>8.1f} {r['peakKb']:>8.0f} {r['places']:>7}")
+
+
+if __name__ == "__main__":
+    main()
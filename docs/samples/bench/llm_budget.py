@@ -0,0 +1,79 @@
+"""Traffic spike against the OpenRouter stand-in with token/concurrency budgets.
+
+Fires a burst of get_recommendations calls and reports how many ran on the
+Pro model, were degraded to FLASH_MODEL or shed to keyword_fallback, and the
+token usage accounted per call site and model.
+
+Usage (from repo root):
+    python -m docs.samples.bench.llm_budget --burst 60 --max-concurrent 4 --tokens-per-minute 200000
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+from .standins import Behavior, StandinServer
+from .synthetic import api_places
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=60)
+    parser.add_argument("--places", type=int, default=200)
+    parser.add_argument("--max-concurrent", type=int, default=4, help="Pro-model concurrency")
+    parser.add_argument("--flash-concurrent", type=int, default=8)
+    parser.add_argument("--tokens-per-minute", type=int, default=200_000, help="Pro-model tokens/min")
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    parser.add_argument("--llm-latency-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    with StandinServer({"openrouter": Behavior(latency_ms=args.llm_latency_ms)}) as upstream:
+        os.environ.update(upstream.env())
+        pro = os.getenv("OPENROUTER_MODEL", "google/gemini-3-pro-preview")
+        flash = os.getenv("OPENROUTER_FLASH_MODEL", "google/gemini-2.5-flash")
+        os.environ["OPENROUTER_MAX_CONCURRENT"] = json.dumps({pro: args.max_concurrent, flash: args.flash_concurrent})
+        os.environ["OPENROUTER_MODEL_TOKENS_PER_MINUTE"] = json.dumps({pro: args.tokens_per_minute})
+        os.environ["OPENROUTER_QUEUE_TIMEOUT_SEC"] = str(args.queue_timeout)
+
+        from ..llm_service import get_recommendations
+        from ..openrouter_client import LLM_CALLS, LLM_TOKENS
+        from ..metrics import render_prometheus
+
+        places = api_places(args.places)
+        latencies, warnings = [], []
+        lock = threading.Lock()
+
+        def one():
+            t0 = time.perf_counter()
+            result = get_recommendations("이태원 데이트 맛집", places)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+                warnings.append(result.get("warning"))
+
+        threads = [threading.Thread(target=one) for _ in range(args.burst)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+
+        latencies.sort()
+        site = "recommendations"
+        print(f"burst={args.burst} wall={wall:.1f}s p50={latencies[len(latencies) // 2] * 1000:.0f}ms "
+              f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f}ms")
+        print(f"pro ok={LLM_CALLS.value(site=site, model=pro, outcome='ok'):g} "
+              f"degraded={LLM_CALLS.value(site=site, model=pro, outcome='degraded'):g} "
+              f"flash ok={LLM_CALLS.value(site=site, model=flash, outcome='ok'):g} "
+              f"shed={LLM_CALLS.value(site=site, model=pro, outcome='shed'):g} "
+              f"keyword_fallback={sum(1 for w in warnings if w)}")
+        for model in (pro, flash):
+            print(f"tokens {model}: prompt={LLM_TOKENS.value(site=site, model=model, kind='prompt'):g} "
+                  f"completion={LLM_TOKENS.value(site=site, model=model, kind='completion'):g}")
+        print("\n".join(line for line in render_prometheus().splitlines() if line.startswith("dining_llm_")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""End-to-end load test of the search and crawl endpoints against local stand-ins.
+
+Starts the stand-in upstreams, a threaded Flask app with the dining
+Blueprint on a temporary dining.db, then drives POST /dining/api/places/search
+and the crawl SSE stream at increasing concurrency. Reports p50/p95/p99
+latency, error rate, throughput and the level where throughput saturates.
+
+Usage (from repo root):
+    python -m docs.samples.bench.loadtest --levels 1 2 4 8 16 32 --seconds 15 \\
+        --llm-latency-ms 800 --llm-error-rate 0.02 --llm-rps 20
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from .standins import Behavior, StandinServer
+from .synthetic import crawled_place_rows, temp_dining_db
+
+SEARCH_QUERIES = ["이태원에서 데이트 맛집", "홍대 근처 카페", "강남역 주변 회식", "성수동에 차대고 갈만한 곳"]
+CRAWL_KEYWORDS = ["이태원 맛집", "연남동 카페", "을지로 술집", "성수 베이커리"]
+
+
+def _post(url: str, body: dict, timeout: float) -> urllib.request.Request:
+    req = urllib.request.Request(url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+def _search(base: str, rng: random.Random, timeout: float) -> bool:
+    with _post(f"{base}/dining/api/places/search", {"query": rng.choice(SEARCH_QUERIES)}, timeout) as resp:
+        return "error" not in json.loads(resp.read())
+
+
+def _crawl(base: str, rng: random.Random, timeout: float) -> bool:
+    with _post(f"{base}/dining/api/places/crawl", {"keyword": rng.choice(CRAWL_KEYWORDS)}, timeout) as resp:
+        last = None
+        for line in resp:
+            if line.startswith(b"data: "):
+                last = json.loads(line[6:])
+        return bool(last) and last.get("step") == "done"
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+def run_level(base: str, concurrency: int, seconds: float, crawl_ratio: float, timeout: float) -> dict:
+    results: list[tuple[str, float, bool]] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            kind = "crawl" if rng.random() < crawl_ratio else "search"
+            t0 = time.perf_counter()
+            try:
+                ok = (_crawl if kind == "crawl" else _search)(base, rng, timeout)
+            except (urllib.error.URLError, OSError, ValueError):
+                ok = False
+            with lock:
+                results.append((kind, time.perf_counter() - t0, ok))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    out = {"concurrency": concurrency, "rps": len(results) / elapsed}
+    for kind in ("search", "crawl"):
+        rows = [r for r in results if r[0] == kind]
+        lat = [r[1] for r in rows if r[2]]
+        out[kind] = {
+            "n": len(rows),
+            "error_rate": (sum(1 for r in rows if not r[2]) / len(rows)) if rows else 0.0,
+            "p50": _pct(lat, 0.50), "p95": _pct(lat, 0.95), "p99": _pct(lat, 0.99),
+        }
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--crawl-ratio", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed-places", type=int, default=20_000)
+    parser.add_argument("--dc-latency-ms", type=float, default=300)
+    parser.add_argument("--geo-latency-ms", type=float, default=80)
+    parser.add_argument("--llm-latency-ms", type=float, default=1500)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rps", type=float, default=0.0, help="OpenRouter rate limit (0 = none)")
+    parser.add_argument("--saturation-gain", type=float, default=0.10,
+                        help="throughput gain below which a level counts as saturated")
+    args = parser.parse_args()
+
+    behaviors = {
+        "diningcode": Behavior(latency_ms=args.dc_latency_ms, jitter_ms=args.dc_latency_ms / 2),
+        "naver": Behavior(latency_ms=args.geo_latency_ms, jitter_ms=args.geo_latency_ms / 2),
+        "nominatim": Behavior(latency_ms=args.geo_latency_ms * 3, jitter_ms=args.geo_latency_ms),
+        "openrouter": Behavior(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_latency_ms / 2,
+                               error_rate=args.llm_error_rate, rate_limit_rps=args.llm_rps),
+    }
+
+    with StandinServer(behaviors) as upstreams:
+        # URLs are read at import time, so set them before importing the app
+        os.environ.update(upstreams.env())
+        with temp_dining_db():
+            from flask import Flask
+            from werkzeug.serving import make_server
+
+            from ..models import CrawledPlace, get_dining_session
+            from ..place_cluster import rebuild_place_grid
+            from ..routes import dining_bp
+
+            session = get_dining_session()
+            session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.seed_places))
+            session.commit()
+            rebuild_place_grid(session)
+
+            app = Flask(__name__)
+            app.register_blueprint(dining_bp)
+            server = make_server("127.0.0.1", 0, app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base = f"http://127.0.0.1:{server.server_port}"
+
+            print(f"{'conc':>4} {'rps':>7} | {'search p50/p95/p99 ms':>24} {'err':>5} | "
+                  f"{'crawl p50/p95/p99 ms':>24} {'err':>5}")
+            levels = []
+            for level in args.levels:
+                r = run_level(base, level, args.seconds, args.crawl_ratio, args.timeout)
+                levels.append(r)
+                s, c = r["search"], r["crawl"]
+                print(f"{level:>4} {r['rps']:>7.2f} | {s['p50']:>7.0f}/{s['p95']:>7.0f}/{s['p99']:>7.0f} "
+                      f"{s['error_rate']:>5.1%} | {c['p50']:>7.0f}/{c['p95']:>7.0f}/{c['p99']:>7.0f} "
+                      f"{c['error_rate']:>5.1%}")
+            server.shutdown()
+
+            saturated = next(
+                (cur for prev, cur in zip(levels, levels[1:])
+                 if cur["rps"] < prev["rps"] * (1 + args.saturation_gain)),
+                None,
+            )
+            if saturated:
+                print(f"throughput saturates at concurrency {saturated['concurrency']} "
+                      f"(~{saturated['rps']:.2f} req/s)")
+            else:
+                print("no saturation within the tested levels")
+            for name, st in upstreams.stats.items():
+                print(f"upstream {name:<10} requests={st.requests} errors={st.errors} throttled={st.throttled}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Menu ingestion throughput against a local DiningCode profile stand-in.
+
+Compares the old one-page-at-a-time crawl with the threaded ingester at a
+few concurrency / per-host settings. Politeness delay is 0 here so the
+numbers measure fetch + parse + upsert, not the sleep.
+
+Usage (from repo root):
+    python -m docs.samples.bench.menu_ingest --places 500 --latency-ms 80
+"""
+
+import argparse
+import os
+
+from .standins import Behavior, StandinServer
+from .synthetic import crawled_place_rows, temp_dining_db
+
+SETTINGS = [(1, 1), (8, 2), (8, 8), (32, 32)]  # (concurrency, per_host)
+
+
+def _seed(n: int):
+    from ..models import CrawledPlace, PlaceSource, get_dining_session
+
+    session = get_dining_session()
+    rows = crawled_place_rows(n, seed=7)
+    for i, row in enumerate(rows):
+        row["name"] = f"메뉴장소{i}"
+    session.bulk_insert_mappings(CrawledPlace, rows)
+    session.commit()
+    ids = [pid for (pid,) in session.query(CrawledPlace.id).order_by(CrawledPlace.id)]
+    session.bulk_insert_mappings(PlaceSource, [
+        {"crawled_place_id": pid, "source": "diningcode",
+         "source_url": f"https://www.diningcode.com/profile.php?rid=M{pid}"}
+        for pid in ids
+    ])
+    session.commit()
+    session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    behaviors = {"diningcode": Behavior(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4)}
+    with StandinServer(behaviors=behaviors) as server:
+        os.environ.update(server.env())
+        with temp_dining_db():
+            from ..menu_ingest import HostLimiter, find_menus, ingest_menus
+            from ..models import Menu, get_dining_read_session
+
+            _seed(args.places)
+            print(f"{'concurrency':>11} {'per host':>8} {'pages/s':>9} {'seconds':>8} {'menus':>7}")
+            for concurrency, per_host in SETTINGS:
+                stats = ingest_menus(
+                    only_missing=False,
+                    concurrency=concurrency,
+                    limiter=HostLimiter(per_host=per_host, delay_ms=0),
+                )
+                print(f"{concurrency:>11} {per_host:>8} {stats['pagesPerSec']:>9} "
+                      f"{stats['seconds']:>8} {stats['menus']:>7}")
+
+            session = get_dining_read_session()
+            total = session.query(Menu).count()
+            sample = find_menus(session, place_id=1)
+            session.remove()
+            print(f"menu rows: {total}, place 1: {len(sample)} menus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Nearest-parking precomputation: KD-tree vs. brute force, full rebuild and incremental adds.
+
+Usage (from repo root):
+    python -m docs.samples.bench.nearest_parking --places 100000 --lots 10000
+"""
+
+import argparse
+import random
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+
+def _lots(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"name": f"주차장{i}", "type": "공영", "lat": SEOUL_LAT + rng.gauss(0, 0.05),
+         "lng": SEOUL_LNG + rng.gauss(0, 0.05), "capacity": 50, "hourly_rate": 1200,
+         "description": "bench", "operating_hours": "00:00~24:00"}
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--lots", type=int, default=10_000)
+    parser.add_argument("--brute-sample", type=int, default=1000)
+    args = parser.parse_args()
+
+    from ..llm_service import calc_distance_m
+    from ..parking_index import PARKING_K, PARKING_MAX_M, ParkingIndex
+
+    lots = _lots(args.lots)
+    places = crawled_place_rows(args.places, seed=3)
+
+    t0 = time.perf_counter()
+    index = ParkingIndex([(i, lot["lat"], lot["lng"]) for i, lot in enumerate(lots)])
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = [index.nearest(p["lat"], p["lng"]) for p in places]
+    tree_s = time.perf_counter() - t0
+
+    sample = places[: args.brute_sample]
+    t0 = time.perf_counter()
+    mismatches = 0
+    for p, got in zip(sample, results):
+        dists = sorted((calc_distance_m(p["lat"], p["lng"], lot["lat"], lot["lng"]), i) for i, lot in enumerate(lots))
+        expected = [d for d, _ in dists if d <= PARKING_MAX_M][:PARKING_K]
+        mismatches += [d for _, d in got] != expected
+    brute_s = (time.perf_counter() - t0) / len(sample) * len(places)
+
+    print(f"{args.lots} lots, {args.places} places, K={PARKING_K}, max {PARKING_MAX_M}m")
+    print(f"  kd-tree build        {build * 1000:8.1f} ms")
+    print(f"  kd-tree all places   {tree_s:8.2f} s  ({tree_s / len(places) * 1e6:.1f} µs/place)")
+    print(f"  brute force (est.)   {brute_s:8.2f} s  ({brute_s / tree_s:.0f}x slower)")
+    print(f"  distance mismatches  {mismatches}/{len(sample)}")
+
+    with temp_dining_db():
+        from ..models import CrawledPlace, ParkingLot, get_dining_session
+        from ..parking_index import add_parking_lots, rebuild_nearby_parking
+
+        session = get_dining_session()
+        session.bulk_insert_mappings(ParkingLot, lots)
+        session.bulk_insert_mappings(CrawledPlace, places)
+        session.commit()
+
+        t0 = time.perf_counter()
+        rows = rebuild_nearby_parking(session)
+        print(f"  full rebuild (DB)    {time.perf_counter() - t0:8.2f} s  ({rows} rows)")
+
+        new = [ParkingLot(**lot) for lot in _lots(10, seed=99)]
+        session.add_all(new)
+        session.flush()
+        t0 = time.perf_counter()
+        refreshed = add_parking_lots(session, new)
+        session.commit()
+        print(f"  add 10 lots (incr.)  {(time.perf_counter() - t0) * 1000:8.1f} ms ({refreshed} places refreshed)")
+        session.remove()
+
+
+if __name__ == "__main__":
+    main()
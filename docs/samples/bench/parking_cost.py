@@ -0,0 +1,118 @@
+"""Parking fee estimates and cost/distance ranking: per-lot Python loop vs. the vectorized fee table.
+
+Builds 50k synthetic lots around Seoul (about two thirds with a full
+base/extra fee schedule, the rest hourly only, some free), then for a few
+viewport sizes and stay lengths ranks the lots in bounds both ways:
+
+    loop    ORM-free Python over lot tuples: calc3HourRate's rule,
+            calc_distance_m and a sort — what a straightforward version does
+    table   parking_cost.ParkingFeeTable: searchsorted bounds slice, one
+            numpy pass for fees, distances and scores, partition top-k
+
+and checks both produce the same fees and the same top lots.
+
+Usage (from repo root):
+    python -m docs.samples.bench.parking_cost --lots 50000
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG
+
+VIEWPORTS = [("street", 0.005), ("neighbourhood", 0.02), ("district", 0.05), ("city", 0.2)]
+STAYS = [30, 150, 600]
+
+
+def lot_rows(n: int, seed: int = 0) -> list[tuple]:
+    """(id, lat, lng, hourly_rate, base_time, base_rate, extra_time, extra_rate) tuples."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, n + 1):
+        lat, lng = SEOUL_LAT + rng.gauss(0, 0.06), SEOUL_LNG + rng.gauss(0, 0.08)
+        hourly = rng.choice([0, 1000, 1200, 2400, 3000, 6000])
+        if rng.random() < 0.65:
+            base_time = rng.choice([5, 10, 30, 60])
+            extra_time = rng.choice([5, 10, 30])
+            rows.append((i, lat, lng, hourly, base_time, rng.choice([0, 250, 500, 1000, 3000]),
+                         extra_time, rng.choice([100, 200, 250, 500, 1000])))
+        else:
+            rows.append((i, lat, lng, hourly, None, None, None, None))
+    return rows
+
+
+def _loop_cost(row: tuple, minutes: int) -> int:
+    _, _, _, hourly, base_time, base_rate, extra_time, extra_rate = row
+    if base_time and base_rate is not None and extra_time and extra_rate is not None:
+        if minutes <= base_time:
+            return base_rate
+        return base_rate + math.ceil((minutes - base_time) / extra_time) * extra_rate
+    return round(hourly * minutes / 60)
+
+
+def _loop_rank(rows, bounds, minutes, lat, lng, limit, won_per_walk_min):
+    from ..llm_service import calc_distance_m
+    from ..route_optimizer import walk_minutes
+
+    scored = []
+    for row in rows:
+        if bounds["swLat"] <= row[1] <= bounds["neLat"] and bounds["swLng"] <= row[2] <= bounds["neLng"]:
+            cost = _loop_cost(row, minutes)
+            dist = calc_distance_m(lat, lng, row[1], row[2])
+            scored.append((cost + won_per_walk_min * walk_minutes(dist), dist, row[0], cost))
+    scored.sort()
+    return [(pid, cost, dist) for _, dist, pid, cost in scored[:limit]]
+
+
+def _time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lots", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from ..parking_cost import WON_PER_WALK_MIN, ParkingFeeTable
+
+    rows = lot_rows(args.lots)
+    t0 = time.perf_counter()
+    table = ParkingFeeTable(rows)
+    print(f"{args.lots} lots, fee table built in {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+    for minutes in STAYS:
+        expected = {r[0]: _loop_cost(r, minutes) for r in rows}
+        assert table.costs_for(list(expected), minutes) == expected, minutes
+    all_ms = _time(lambda: table.costs(150), args.repeat)
+    loop_ms = _time(lambda: [_loop_cost(r, 150) for r in rows], args.repeat)
+    print(f"fees for every lot (150 min): loop {loop_ms:.1f}ms, table {all_ms:.2f}ms")
+
+    print(f"\n{'viewport':<14} {'stay':>5} {'lots':>6} {'loop ms':>8} {'table ms':>9} {'speedup':>8}")
+    for label, half in VIEWPORTS:
+        bounds = {"swLat": SEOUL_LAT - half, "swLng": SEOUL_LNG - half,
+                  "neLat": SEOUL_LAT + half, "neLng": SEOUL_LNG + half}
+        for minutes in STAYS:
+            loop = _loop_rank(rows, bounds, minutes, SEOUL_LAT, SEOUL_LNG, args.limit, WON_PER_WALK_MIN)
+            idx = table.in_bounds(bounds)
+            fast = table.rank(minutes, SEOUL_LAT, SEOUL_LNG, idx, args.limit)
+            assert loop == fast, (label, minutes)
+            loop_ms = _time(lambda: _loop_rank(rows, bounds, minutes, SEOUL_LAT, SEOUL_LNG, args.limit,
+                                               WON_PER_WALK_MIN), args.repeat)
+            table_ms = _time(lambda: table.rank(minutes, SEOUL_LAT, SEOUL_LNG, table.in_bounds(bounds), args.limit),
+                             args.repeat)
+            print(f"{label:<14} {minutes:>5} {len(idx):>6} {loop_ms:>8.1f} {table_ms:>9.2f} "
+                  f"{loop_ms / table_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Memory per place and serialization throughput: place dicts vs. slotted records.
+
+Pure in-memory; no database needed.
+
+Usage (from repo root):
+    python -m docs.samples.bench.place_serialization --places 100000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from .synthetic import crawled_place_rows
+
+
+def _fake_crawled(n: int) -> list[SimpleNamespace]:
+    out = []
+    for i, row in enumerate(crawled_place_rows(n)):
+        src = SimpleNamespace(source="diningcode", rating=round(3 + (i % 20) / 10, 1), review_count=i % 300,
+                              snippet=f"{row['name']} 대표 메뉴 후기")
+        out.append(SimpleNamespace(id=i, description=None, price_range=None, atmosphere="편안한",
+                                   good_for="데이트", tags="혼밥, 가성비", sources=[src], **row))
+    return out
+
+
+def _measure(build):
+    tracemalloc.start()
+    items = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return items, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from ..place_mapper import iter_crawled_records, map_crawled_to_places
+    from ..place_records import API_JSON_KWARGS, dumps_places, orjson
+
+    rows = _fake_crawled(args.places)
+    dicts, dict_bytes = _measure(lambda: map_crawled_to_places(rows))
+    records, rec_bytes = _measure(lambda: list(iter_crawled_records(rows)))
+
+    reference = json.dumps(dicts, **API_JSON_KWARGS).encode()
+    assert dumps_places(records) == reference, "record encoding is not byte-identical"
+
+    def bench(fn):
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        return args.places * args.repeat / (time.perf_counter() - t0)
+
+    print(f"places={args.places} backend={'orjson' if orjson else 'json'} payload={len(reference) / 1e6:.1f}MB")
+    print(f"memory/place  dict={dict_bytes / args.places:7.0f}B  record={rec_bytes / args.places:7.0f}B")
+    print(f"encode/s      dict+json={bench(lambda: json.dumps(dicts, **API_JSON_KWARGS).encode()):10.0f}  "
+          f"record={bench(lambda: dumps_places(records)):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Map panning session: full /api/places downloads vs. ETag/304 + ?since= deltas.
+
+A client pans around a small neighbourhood grid (revisiting viewports, as a
+map user does) while a writer updates a few crawled places and merges a
+duplicate between steps. "full" fetches every viewport in full each time;
+"delta" remembers the ETag and X-Places-Watermark per viewport and sends
+If-None-Match plus ?since= on a revisit. Reports requests by status, bytes
+on the wire and server time. Finally writes stop, the delta client resyncs
+each viewport once more, and its view is checked against a full download.
+
+Usage (from repo root):
+    python -m docs.samples.bench.places_delta --places 50000 --steps 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+STEP = 0.01  # viewport size and pan distance, ~1km
+
+
+def _query(cell: tuple[int, int]) -> str:
+    lat, lng = SEOUL_LAT + cell[0] * STEP, SEOUL_LNG + cell[1] * STEP
+    return f"/dining/api/places?swLat={lat}&swLng={lng}&neLat={lat + STEP}&neLng={lng + STEP}"
+
+
+def _write(rng: random.Random, n_places: int, updates: int) -> None:
+    from ..models import CrawledPlace, dining_write_lock, get_dining_session
+    from ..place_merge import merge_group
+
+    with dining_write_lock():
+        session = get_dining_session()
+        try:
+            now = datetime.now(timezone.utc)
+            ids = rng.sample(range(1, n_places + 1), updates + 2)
+            session.query(CrawledPlace).filter(CrawledPlace.id.in_(ids[:updates])).update(
+                {CrawledPlace.description: f"업데이트 {now:%H%M%S%f}", CrawledPlace.updated_at: now},
+                synchronize_session=False,
+            )
+            keeper, dup = ids[updates:]
+            if session.get(CrawledPlace, keeper) and session.get(CrawledPlace, dup):
+                merge_group(session, keeper, [dup])
+            session.commit()
+        finally:
+            session.remove()
+
+
+def _fetch(client, cell: tuple[int, int], mode: str, state: dict, stats: dict) -> None:
+    """One viewport request; the delta client sends its ETag and watermark and applies the answer."""
+    headers, query = {}, _query(cell)
+    if mode == "delta" and cell in state:
+        etag, watermark, _ = state[cell]
+        headers["If-None-Match"] = f'"{etag}"'
+        query += f"&since={watermark}"
+    t0 = time.perf_counter()
+    resp = client.get(query, headers=headers)
+    stats["ms"].append((time.perf_counter() - t0) * 1000)
+    stats["bytes"] += len(resp.data)
+    stats["status"][resp.status_code] = stats["status"].get(resp.status_code, 0) + 1
+    if mode != "delta" or resp.status_code == 304:
+        return
+
+    etag = resp.headers["ETag"].strip('"')
+    body = resp.get_json()
+    if "since=" not in query or body["reset"]:
+        places = body if isinstance(body, list) else body["upserts"]
+        view = {("tags" in p, p["id"]): p for p in places}
+    else:
+        view = state[cell][2]
+        for pid in body["removed"]:
+            view.pop((True, pid), None)
+        view.update({(True, p["id"]): p for p in body["upserts"]})
+        for pid, rank in (body["ranks"] or {}).items():
+            if (True, int(pid)) in view:
+                view[(True, int(pid))]["diningcodeRank"] = rank
+    state[cell] = (etag, resp.headers["X-Places-Watermark"], view)
+
+
+def _session(client, cells: list, mode: str, rng: random.Random, n_places: int, updates: int) -> dict:
+    state: dict = {}  # cell → (etag, watermark, {place key: place})
+    stats = {"status": {}, "bytes": 0, "ms": []}
+    for cell in cells:
+        _write(rng, n_places, updates)
+        _fetch(client, cell, mode, state, stats)
+    stats["state"] = state
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=50_000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--grid", type=int, default=3, help="viewports per side of the panning area")
+    parser.add_argument("--updates", type=int, default=5, help="places updated between steps (anywhere)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cells = [(0, 0)]
+    for _ in range(args.steps - 1):
+        lat, lng = cells[-1]
+        dlat, dlng = rng.choice([(0, 1), (0, -1), (1, 0), (-1, 0), (0, 0)])
+        cells.append((min(max(lat + dlat, 0), args.grid - 1), min(max(lng + dlng, 0), args.grid - 1)))
+
+    with temp_dining_db():
+        from flask import Flask
+
+        from ..models import CrawledPlace, get_dining_session
+        from ..routes import dining_bp
+
+        session = get_dining_session()
+        rows = crawled_place_rows(args.places, spread=args.grid * STEP * 3)
+        session.bulk_insert_mappings(CrawledPlace, rows)
+        session.commit()
+        session.remove()
+
+        app = Flask(__name__)
+        app.register_blueprint(dining_bp)
+        client = app.test_client()
+
+        print(f"{args.places} places, {args.steps} steps over a {args.grid}x{args.grid} grid, "
+              f"{args.updates} updates + 1 merge per step")
+        print(f"{'mode':>6} {'200':>5} {'304':>5} {'KB':>9} {'total ms':>9} {'p50 ms':>7} {'p95 ms':>7}")
+        for mode in ("full", "delta"):
+            r = _session(client, cells, mode, random.Random(1), args.places, args.updates)
+            ms = sorted(r["ms"])
+            print(f"{mode:>6} {r['status'].get(200, 0):>5} {r['status'].get(304, 0):>5} "
+                  f"{r['bytes'] / 1024:>9.0f} {sum(ms):>9.0f} {statistics.median(ms):>7.1f} "
+                  f"{ms[int(len(ms) * 0.95) - 1]:>7.1f}")
+
+        # With writes paused, one more ?since= resync per viewport must leave the
+        # delta client with exactly what a full download shows
+        state, resync = r["state"], {"status": {}, "bytes": 0, "ms": []}
+        for cell in list(state):
+            _fetch(client, cell, "delta", state, resync)
+        for cell, (_, _, view) in state.items():
+            full = {("tags" in p, p["id"]): p for p in json.loads(client.get(_query(cell)).data)}
+            assert view.keys() == full.keys(), cell
+            assert all(view[k] == full[k] for k in full), cell
+        print("delta views match full downloads")
+
+
+if __name__ == "__main__":
+    main()
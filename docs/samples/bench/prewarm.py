@@ -0,0 +1,50 @@
+"""Pre-warm crawler throughput against local DiningCode/OpenRouter stand-ins.
+
+Runs the same region × cuisine grid at a few process counts, each into a
+fresh dining.db, with the global rate limit off so the numbers show fetch +
+parse + persist capacity. Reports pages/minute, per-worker CPU utilisation
+and whole-run CPU per core.
+
+Usage (from repo root):
+    python -m docs.samples.bench.prewarm --regions 12 --latency-ms 150 --page-kb 64
+"""
+
+import argparse
+import os
+
+from .standins import Behavior, StandinServer
+from .synthetic import temp_dining_db
+
+PROCESS_COUNTS = [1, 2, 4, 8]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--page-kb", type=int, default=64, help="padding per list page, like the real markup")
+    parser.add_argument("--rate", type=float, default=0, help="global pages/s limit (0 = off)")
+    args = parser.parse_args()
+
+    behaviors = {
+        "diningcode": Behavior(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4),
+        "openrouter": Behavior(latency_ms=50),
+    }
+    with StandinServer(behaviors=behaviors, page_kb=args.page_kb) as server:
+        os.environ.update(server.env())
+        from ..geocode import LANDMARK_MAP
+        from ..prewarm import prewarm, prewarm_keywords
+
+        keywords = prewarm_keywords(list(LANDMARK_MAP)[: args.regions])
+        print(f"{len(keywords)} keywords, {os.cpu_count()} cores, list page latency {args.latency_ms:.0f}ms")
+        print(f"{'processes':>9} {'pages/min':>10} {'seconds':>8} {'saved':>6} {'cpu/core':>8}  worker cpu")
+        for processes in PROCESS_COUNTS:
+            with temp_dining_db():
+                stats = prewarm(keywords, processes=processes, rate=args.rate, restart=True)
+            workers = " ".join(f"{u:.0%}" for u in stats["workerCpu"])
+            print(f"{processes:>9} {stats['pagesPerMin']:>10} {stats['seconds']:>8} {stats['saved']:>6} "
+                  f"{stats['cpuPerCore']:>8.0%}  {workers} (parent {stats['parentCpu']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Prisma dev.db → dining.db migration throughput on a synthetic dev.db.
+
+The synthetic file copies the real dev.db schema (cuid TEXT ids, camelCase
+columns, ISO DateTime text) and is filled with --rows rows split across
+CrawledPlace, PlaceSource and Menu. A second run checks that a finished
+migration resumes as a no-op.
+
+Usage (from repo root):
+    python -m docs.samples.bench.prisma_migration --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+
+from .synthetic import crawled_place_rows, temp_dining_db
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _cuid(rng: random.Random) -> str:
+    return "c" + "".join(rng.choices(string.ascii_lowercase + string.digits, k=24))
+
+
+def build_dev_db(path: str, rows: int, seed: int = 0):
+    """Synthetic Prisma dev.db: 40% CrawledPlace, 40% PlaceSource, 20% Menu rows."""
+    rng = random.Random(seed)
+    schema_src = sqlite3.connect(os.path.join(_REPO_ROOT, "dev.db"))
+    ddl = [sql for (sql,) in schema_src.execute(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"
+    )]
+    schema_src.close()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    for sql in ddl:
+        conn.execute(sql)
+
+    n_places = rows * 2 // 5
+    n_menus = rows - 2 * n_places
+    ts = "2026-02-08T12:08:08.570+00:00"
+    place_ids: list[tuple[str, str]] = []
+    for start in range(0, n_places, 50_000):
+        batch = crawled_place_rows(min(50_000, n_places - start), seed=seed + start)
+        values = []
+        for i, p in enumerate(batch):
+            cuid, name = _cuid(rng), f"장소{start + i}"
+            place_ids.append((cuid, name))
+            values.append((cuid, name, p["category"], p.get("address"), p["lat"], p["lng"],
+                           p.get("tags"), p["place_type"], ts, ts))
+        conn.executemany(
+            'INSERT INTO "CrawledPlace" (id, name, category, address, lat, lng, tags, placeType, '
+            'createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', values)
+        conn.executemany(
+            'INSERT INTO "PlaceSource" (id, crawledPlaceId, source, sourceUrl, rating, reviewCount, crawledAt) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(_cuid(rng), cuid, "diningcode", f"https://www.diningcode.com/profile.php?rid=R{i}",
+              round(rng.uniform(3, 5), 1), rng.randrange(500), ts)
+             for i, (cuid, _) in enumerate(place_ids[start:start + len(batch)], start=start)])
+        conn.commit()
+    conn.executemany(
+        'INSERT INTO "Menu" (id, placeName, menuName, price, source, crawledAt) VALUES (?, ?, ?, ?, ?, ?)',
+        [(_cuid(rng), place_ids[i % n_places][1], f"메뉴{i}", "12,000원", "diningcode", ts)
+         for i in range(n_menus)])
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "dev.db")
+        t0 = time.perf_counter()
+        build_dev_db(source, args.rows)
+        print(f"synthetic dev.db: {args.rows} rows in {time.perf_counter() - t0:.1f}s")
+
+        with temp_dining_db():
+            from ..migrate_prisma import migrate
+
+            report = migrate(source, args.chunk_size)
+            for name, stats in report["tables"].items():
+                print(f"{name:>14} {stats['rows']:>9} rows {stats.get('rowsPerSec', '-'):>9} rows/s "
+                      f"verify={'ok' if report['verify'][name]['ok'] else 'FAILED'}")
+            print(f"load {report['loadSeconds']}s ({report['rowsPerSec']} rows/s), "
+                  f"index rebuild {report['indexSeconds']}s")
+
+            again = migrate(source, args.chunk_size, verify=False)
+            print(f"re-run after completion: {again['rows']} rows written")
+
+
+if __name__ == "__main__":
+    main()
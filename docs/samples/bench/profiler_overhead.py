@@ -0,0 +1,96 @@
+"""Request latency with the sampling profiler off, armed for slow requests, and sampling all.
+
+Serves /dining/api/places (mapping and JSON encoding of a few thousand
+places) and /dining/api/places?facets=1 through the Flask test client from
+a few threads, in three modes:
+
+    off     DINING_PROFILE_SAMPLE_RATE=0, DINING_PROFILE_SLOW_MS=0
+    slow    every request sampled, stacks kept only over a threshold none reach
+    all     every request sampled and kept
+
+then prints the heaviest frames the "all" run collected, as the admin
+endpoint would report them.
+
+Usage (from repo root):
+    python -m docs.samples.bench.profiler_overhead --places 50000 --requests 300
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+BOUNDS = f"swLat={SEOUL_LAT - 0.01}&swLng={SEOUL_LNG - 0.01}&neLat={SEOUL_LAT + 0.01}&neLng={SEOUL_LNG + 0.01}"
+PATHS = [f"/dining/api/places?{BOUNDS}", f"/dining/api/places?{BOUNDS}&facets=1"]
+MODES = {"off": (0.0, 0.0), "slow": (0.0, 60_000.0), "all": (1.0, 0.0)}
+
+
+def _run(app, n: int, clients: int) -> list[float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    counter = iter(range(n))
+
+    def client():
+        c = app.test_client()
+        for i in counter:
+            t0 = time.perf_counter()
+            c.get(PATHS[i % len(PATHS)])
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    with temp_dining_db():
+        from flask import Flask
+
+        from .. import profiler, tile_cache
+        from ..models import CrawledPlace, get_dining_session
+        from ..routes import dining_bp
+
+        session = get_dining_session()
+        session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.places, spread=0.05))
+        session.commit()
+        session.remove()
+
+        tile_cache.TILE_CACHE_ENABLED = False  # profile the mapping work, not cache hits
+        profiler.PROFILE_INTERVAL_MS = args.interval_ms
+        app = Flask(__name__)
+        app.register_blueprint(dining_bp)
+        _run(app, 20, 1)  # warm imports and the facet index
+
+        print(f"{args.requests} requests, {args.clients} clients, {args.interval_ms:g}ms sampling interval")
+        print(f"{'mode':>5} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'overhead':>8}")
+        base = None
+        for mode, (rate, slow_ms) in MODES.items():
+            profiler.PROFILE_SAMPLE_RATE, profiler.PROFILE_SLOW_MS = rate, slow_ms
+            profiler.reset_profiles()
+            lat = sorted(_run(app, args.requests, args.clients))
+            mean = statistics.fmean(lat)
+            base = base or mean
+            print(f"{mode:>5} {mean:>8.1f} {statistics.median(lat):>7.1f} {lat[int(len(lat) * 0.95) - 1]:>7.1f} "
+                  f"{(mean / base - 1) * 100:>+7.1f}%")
+
+        for endpoint, summary in profiler.profile_summary(top=8)["endpoints"].items():
+            print(f"\n{endpoint}: {summary['requests']} requests, {summary['samples']} samples")
+            for frame in summary["topFrames"]:
+                print(f"  {frame['samples']:>6}  {frame['frame']}")
+
+
+if __name__ == "__main__":
+    main()
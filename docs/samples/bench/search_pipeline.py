@@ -0,0 +1,85 @@
+"""Search latency: stages one after another vs. the concurrent task graph.
+
+Runs the /api/places/search pipeline (search_pipeline.run_search with the
+routes place loader) against the OpenRouter/Naver stand-ins on a seeded
+dining.db, from a few client threads, in both modes. Queries name a
+landmark, so the concurrent mode can load places while the location call
+is in flight; "viewport" queries name none and rely on the map bounds.
+
+Usage (from repo root):
+    python -m docs.samples.bench.search_pipeline --requests 60 --llm-latency-ms 800
+"""
+
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+
+from .standins import Behavior, StandinServer
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+QUERIES = ["이태원에서 데이트 맛집", "홍대 근처 카페", "강남역 주변 회식", "성수동에 차대고 갈만한 곳", "조용한 혼밥 맛집"]
+VIEWPORT = {"swLat": SEOUL_LAT - 0.01, "swLng": SEOUL_LNG - 0.01, "neLat": SEOUL_LAT + 0.01, "neLng": SEOUL_LNG + 0.01}
+
+
+def _run(run_search, load_places, concurrent: bool, n: int, clients: int) -> list[float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    counter = iter(range(n))
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        for _ in counter:
+            t0 = time.perf_counter()
+            status, _ = run_search(rng.choice(QUERIES), VIEWPORT, load_places, concurrent=concurrent)
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000 if status == 200 else float("nan"))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seed-places", type=int, default=20_000)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--geo-latency-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    behaviors = {
+        "openrouter": Behavior(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_latency_ms / 4),
+        "naver": Behavior(latency_ms=args.geo_latency_ms, jitter_ms=args.geo_latency_ms / 2),
+    }
+    with StandinServer(behaviors) as upstreams:
+        os.environ.update(upstreams.env())
+        with temp_dining_db():
+            from ..models import CrawledPlace, get_dining_session
+            from ..routes import _load_places
+            from ..search_pipeline import run_search
+
+            session = get_dining_session()
+            session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.seed_places))
+            session.commit()
+
+            def load_places(bounds):
+                return [p.to_dict() for p in _load_places(bounds)]
+
+            print(f"{args.requests} searches, {args.clients} clients, LLM {args.llm_latency_ms:.0f}ms")
+            print(f"{'mode':>10} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6}")
+            for concurrent in (False, True):
+                lat = _run(run_search, load_places, concurrent, args.requests, args.clients)
+                ok = sorted(x for x in lat if x == x)
+                print(f"{'graph' if concurrent else 'sequential':>10} {statistics.median(ok):>8.0f} "
+                      f"{ok[int(len(ok) * 0.95) - 1]:>8.0f} {len(lat) - len(ok):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Worker startup time and memory: DB query + mapping vs. mmap snapshot.
+
+Reports RSS and PSS (proportional set size — shared pages split between
+workers) for each worker, read from /proc.
+
+Usage (from repo root):
+    python -m docs.samples.bench.snapshot_startup --places 200000 --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+from .synthetic import crawled_place_rows, temp_dining_db
+
+WHOLE_CITY = {"swLat": 37.0, "neLat": 38.0, "swLng": 126.0, "neLng": 128.0}
+
+
+def _mem_mb() -> tuple[float, float]:
+    rss = pss = 0.0
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1]) / 1024
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1]) / 1024
+    return rss, pss
+
+
+def _worker(mode: str, db_path: str, snapshot_dir: str, ready: mp.Barrier, out: mp.Queue):
+    os.environ["DINING_DB_PATH"] = db_path
+    os.environ["DINING_SNAPSHOT_DIR"] = snapshot_dir
+    t0 = time.perf_counter()
+    if mode == "db":
+        from ..models import CrawledPlace, get_dining_read_session
+        from ..place_mapper import iter_crawled_records
+
+        session = get_dining_read_session()
+        places = list(iter_crawled_records(session.query(CrawledPlace).all()))
+        n = len(places)
+    else:
+        from ..place_snapshot import get_snapshot
+
+        snap = get_snapshot()
+        idx = snap.rank(snap.query(WHOLE_CITY))
+        snap.records(idx[:50])  # first page of an answer
+        n = len(idx)
+    elapsed = time.perf_counter() - t0
+    ready.wait()  # measure memory while every worker is alive
+    rss, pss = _mem_mb()
+    out.put((mode, elapsed, rss, pss, n))
+    ready.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with temp_dining_db() as db_path:
+        from ..models import CrawledPlace, get_dining_read_session, get_dining_session
+        from ..place_snapshot import write_snapshot
+
+        session = get_dining_session()
+        session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.places))
+        session.commit()
+
+        snapshot_dir = os.path.join(os.path.dirname(db_path), "snapshot")
+        t0 = time.perf_counter()
+        write_snapshot(get_dining_read_session(), snapshot_dir)
+        print(f"snapshot build: {time.perf_counter() - t0:.2f}s for {args.places} places")
+
+        ctx = mp.get_context("spawn")
+        print(f"{'mode':>8} {'startup_ms':>10} {'rss_mb':>8} {'pss_mb':>8} {'rows':>8}")
+        for mode in ("db", "snapshot"):
+            out = ctx.Queue()
+            ready = ctx.Barrier(args.workers)
+            procs = [ctx.Process(target=_worker, args=(mode, db_path, snapshot_dir, ready, out))
+                     for _ in range(args.workers)]
+            for p in procs:
+                p.start()
+            results = [out.get() for _ in procs]
+            for p in procs:
+                p.join()
+            for m, elapsed, rss, pss, n in results:
+                print(f"{m:>8} {elapsed * 1000:10.1f} {rss:8.1f} {pss:8.1f} {n:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""Local stand-ins for DiningCode, Naver geocode, Nominatim and OpenRouter.
+
+One threaded HTTP server answers all four upstreams by path. Latency,
+error rate and rate limit are configurable per upstream, so load tests and
+benchmarks never touch the real services.
+
+    with StandinServer(behaviors={"openrouter": Behavior(latency_ms=800)}) as s:
+        os.environ.update(s.env())   # before importing the dining modules
+"""
+
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, place_dicts
+
+UPSTREAMS = ("diningcode", "naver", "nominatim", "openrouter")
+TRICKLE_CHUNK = 8 * 1024
+
+
+@dataclass
+class Behavior:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # fraction answered with HTTP 500
+    rate_limit_rps: float = 0.0  # 0 = unlimited; excess requests get HTTP 429
+    bytes_per_sec: float = 0.0  # 0 = unlimited; otherwise the body trickles out in TRICKLE_CHUNK writes
+    gzip: bool = False  # compress when the client accepts it
+    _tokens: float = field(default=0.0, repr=False)
+    _last: float = field(default_factory=time.monotonic, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def admit(self) -> bool:
+        if not self.rate_limit_rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit_rps, self._tokens + (now - self._last) * self.rate_limit_rps)
+            self._last = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@dataclass
+class Stats:
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    bytes_out: int = 0
+
+
+# --------------- Recorded-format payloads ---------------
+
+
+def diningcode_list_page(query: str, n: int = 20, pad_kb: int = 0, card_tags_only: bool = False) -> bytes:
+    """A list.dc page in DiningCode's format: listData in localStorage + POI cards.
+
+    ``card_tags_only`` leaves the keywords out of listData, so the tags
+    come from the HTML cards.
+    """
+    seed = sum(query.encode())
+    pois = []
+    for i, p in enumerate(place_dicts(n, seed=seed, dup_rate=0)):
+        pois.append({
+            "v_rid": f"R{seed}x{i}",
+            "nm": p["name"].replace("'", ""),
+            "branch": "",
+            "road_addr": p["address"],
+            "lat": p["lat"],
+            "lng": p["lng"],
+            "score": p["rating"],
+            "keyword": [{"term": t} for t in p["tags"].split(", ")],
+        })
+    if card_tags_only:
+        inner = json.dumps({"poi_section": {"list": [{k: v for k, v in p.items() if k != "keyword"} for p in pois]}})
+    else:
+        inner = json.dumps({"poi_section": {"list": pois}})
+    list_data = json.dumps(inner)[1:-1].replace("'", "\\'")
+    cards = "".join(
+        f'<li class="PoiBlock"><div class="InfoHeader">{p["nm"]}</div>'
+        f'<div class="Hash">#{p["keyword"][0]["term"]}</div></li>'
+        for p in pois
+    )
+    padding = f"<!-- {'x' * 1024} -->\n" * pad_kb
+    html = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>다이닝코드</title></head><body>"
+        f"{padding}<script>localStorage.setItem('listData', '{list_data}');</script>"
+        f"<ul class='PoiList'>{cards}</ul>{padding}</body></html>"
+    )
+    return html.encode()
+
+
+def diningcode_profile_page(rid: str, n_menus: int = 12, pad_kb: int = 0) -> bytes:
+    """A profile.php page in DiningCode's format: menuData as an inline JS array."""
+    rng = random.Random(rid)
+    dishes = ["김치찌개", "된장찌개", "제육볶음", "불고기", "비빔밥", "냉면", "칼국수", "돈까스",
+              "파스타", "리조또", "스테이크", "아메리카노", "라떼", "크루아상", "하이볼"]
+    menu_data = [
+        {"menu": dish, "best": 1 if i < 2 and rng.random() < 0.5 else 0,
+         "price": f"{rng.randrange(6, 40) * 1000:,}원", "rank": i + 1}
+        for i, dish in enumerate(rng.sample(dishes, min(n_menus, len(dishes))))
+    ]
+    padding = f"<!-- {'x' * 1024} -->\n" * pad_kb
+    html = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>다이닝코드</title></head><body>"
+        f"{padding}<script>const menuData = {json.dumps(menu_data, ensure_ascii=False)};</script>"
+        f"<div class='menu-list'></div>{padding}</body></html>"
+    )
+    return html.encode()
+
+
+def _rng_point(rng: random.Random) -> tuple[float, float]:
+    return SEOUL_LAT + rng.uniform(-0.05, 0.05), SEOUL_LNG + rng.uniform(-0.06, 0.06)
+
+
+def _usage(prompt: str, completion: str) -> dict:
+    prompt_tokens = max(1, len(prompt) // 3)
+    completion_tokens = max(1, len(completion) // 3)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def openrouter_content(messages: list[dict]) -> str:
+    """Plausible LLM JSON for each dining prompt, chosen by the system prompt."""
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in messages if m.get("role") == "user"), "")
+    rng = random.Random(user)
+
+    if "분류하는 전문가" in system:
+        items = json.loads(user)
+        return json.dumps([
+            {"name": it["name"], "type": rng.choice(["restaurant", "restaurant", "cafe", "bar", "bakery"])}
+            for it in items
+        ], ensure_ascii=False)
+    if "지명/장소명을 추출" in system:
+        # "이태원에서", "성수동에" and "홍대 근처", "강남역 주변" (particle or a separate word)
+        m = re.search(r"(\S+?)\s*(?:에서|에|근처|앞|주변)", user)
+        return m.group(1) if m else "NONE"
+    if "공영주차장" in system:
+        return json.dumps([
+            {"name": f"공영주차장{i}", "address": "서울특별시 용산구 녹사평대로 150",
+             "lat": round(lat, 4), "lng": round(lng, 4), "capacity": 100, "hourlyRate": 1200,
+             "operatingHours": "00:00~24:00", "type": "공영"}
+            for i, (lat, lng) in enumerate(_rng_point(rng) for _ in range(3))
+        ], ensure_ascii=False)
+
+    ids = re.findall(r"^([RCP]\d+)\|", user, flags=re.M)
+    restaurants = [i for i in ids if i.startswith("R")]
+    cafes = [i for i in ids if i.startswith("C")]
+    courses = []
+    for n, rid in enumerate(restaurants[:3], start=1):
+        stops = [{"order": 1, "id": rid, "type": "restaurant", "reason": "추천"}]
+        if cafes:
+            stops.append({"order": 2, "id": cafes[(n - 1) % len(cafes)], "type": "cafe", "reason": "추천"})
+        courses.append({"courseNumber": n, "title": f"코스 {n}", "stops": stops,
+                        "routeSummary": "맛집 → 도보5분 → 카페"})
+    return json.dumps({"summary": "추천 코스입니다.", "persona": user[-40:], "courses": courses},
+                      ensure_ascii=False)
+
+
+# --------------- Server ---------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):  # keep benchmark output clean
+        pass
+
+    def _upstream(self, path: str) -> str | None:
+        if path.startswith("/list.dc") or path.startswith("/profile.php"):
+            return "diningcode"
+        if path.startswith("/map-geocode"):
+            return "naver"
+        if path.startswith("/search"):
+            return "nominatim"
+        if path.startswith("/api/v1/chat/completions"):
+            return "openrouter"
+        return None
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json",
+              behavior: Behavior | None = None) -> int:
+        """Write the response; returns body bytes actually sent (clients may hang up early)."""
+        if behavior and behavior.gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not (behavior and behavior.bytes_per_sec):
+            self.wfile.write(body)
+            return len(body)
+
+        sent = 0
+        try:
+            for i in range(0, len(body), TRICKLE_CHUNK):
+                chunk = body[i:i + TRICKLE_CHUNK]
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                sent += len(chunk)
+                time.sleep(len(chunk) / behavior.bytes_per_sec)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        return sent
+
+    def _handle(self, body: bytes | None):
+        url = urlparse(self.path)
+        upstream = self._upstream(url.path)
+        if upstream is None:
+            return self._send(404, b'{"error":"not found"}')
+
+        behavior = self.server.behaviors[upstream]
+        stats = self.server.stats[upstream]
+        with self.server.stats_lock:
+            stats.requests += 1
+
+        if not behavior.admit():
+            with self.server.stats_lock:
+                stats.throttled += 1
+            return self._send(429, b'{"error":"rate limited"}')
+        delay = behavior.latency_ms + random.uniform(0, behavior.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if random.random() < behavior.error_rate:
+            with self.server.stats_lock:
+                stats.errors += 1
+            return self._send(500, b'{"error":"injected failure"}')
+
+        payload, ctype = self.server.respond(upstream, url, body)
+        sent = self._send(200, payload, ctype, behavior)
+        with self.server.stats_lock:
+            stats.bytes_out += sent
+
+    def do_GET(self):
+        self._handle(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(self.rfile.read(length) if length else b"")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, behaviors: dict[str, Behavior], page_kb: int, card_tags_only: bool):
+        super().__init__(addr, _Handler)
+        self.card_tags_only = card_tags_only
+        self.behaviors = {u: behaviors.get(u, Behavior()) for u in UPSTREAMS}
+        self.stats = {u: Stats() for u in UPSTREAMS}
+        self.stats_lock = threading.Lock()
+        self.page_kb = page_kb
+
+    def respond(self, upstream: str, url, body: bytes | None) -> tuple[bytes, str]:
+        qs = parse_qs(url.query)
+        if upstream == "diningcode" and url.path.startswith("/profile.php"):
+            rid = qs.get("rid", ["R0"])[0]
+            return diningcode_profile_page(rid, pad_kb=self.page_kb), "text/html; charset=utf-8"
+        if upstream == "diningcode":
+            query = qs.get("query", ["맛집"])[0]
+            page = diningcode_list_page(query, pad_kb=self.page_kb, card_tags_only=self.card_tags_only)
+            return page, "text/html; charset=utf-8"
+
+        rng = random.Random(url.query)
+        lat, lng = _rng_point(rng)
+        if upstream == "naver":
+            data = {"addresses": [{"x": str(lng), "y": str(lat), "roadAddress": "서울특별시 용산구 이태원로 1"}]}
+        elif upstream == "nominatim":
+            data = [{"lat": str(lat), "lon": str(lng), "display_name": "이태원로, 용산구, 서울"}]
+        else:
+            req = json.loads(body or b"{}")
+            content = openrouter_content(req.get("messages", []))
+            prompt = "".join(m.get("content", "") for m in req.get("messages", []))
+            data = {
+                "id": f"gen-{rng.randrange(10 ** 9)}",
+                "model": req.get("model"),
+                "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": _usage(prompt, content),
+            }
+        return json.dumps(data, ensure_ascii=False).encode(), "application/json"
+
+
+class StandinServer:
+    """Context manager running all stand-ins on one ephemeral localhost port."""
+
+    def __init__(self, behaviors: dict[str, Behavior] | None = None, page_kb: int = 0, port: int = 0,
+                 card_tags_only: bool = False):
+        self._server = _Server(("127.0.0.1", port), behaviors or {}, page_kb, card_tags_only)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict[str, Stats]:
+        return self._server.stats
+
+    def env(self) -> dict[str, str]:
+        """Environment overrides that point the dining modules at this server."""
+        return {
+            "DININGCODE_BASE_URL": self.base_url,
+            "NAVER_GEOCODE_URL": f"{self.base_url}/map-geocode/v2/geocode",
+            "NOMINATIM_URL": f"{self.base_url}/search",
+            "OPENROUTER_URL": f"{self.base_url}/api/v1/chat/completions",
+            "OPENROUTER_API_KEY": "standin",
+            "NAVER_MAP_CLIENT_ID": "standin",
+            "NAVER_MAP_CLIENT_SECRET": "standin",
+        }
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
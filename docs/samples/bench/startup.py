@@ -0,0 +1,124 @@
+"""Worker startup: per-module import time and first-request latency with and without warm-up.
+
+Import times are measured in a fresh interpreter per module, so each
+includes that module's own dependencies; the heavy-deps column shows which
+of bs4 / requests / sqlalchemy / numpy the import pulled in.
+
+First-request latency mimics a preloading Gunicorn: a master process
+imports the Blueprint (and in "warm" mode runs warmup.warm_up()), then
+forks a worker that serves /dining/api/places with facets through the
+Flask test client, twice.
+
+Usage (from repo root):
+    python -m docs.samples.bench.startup --places 100000
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import subprocess
+import sys
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+MODULES = ["metrics", "models", "place_records", "place_mapper", "geocode", "place_cache", "facet_index",
+           "agents.diningcode", "crawl_pipeline", "menu_ingest", "refresh", "routes"]
+HEAVY = ["bs4", "requests", "sqlalchemy", "numpy"]
+QUERY = (f"/dining/api/places?swLat={SEOUL_LAT - 0.02}&swLng={SEOUL_LNG - 0.02}"
+         f"&neLat={SEOUL_LAT + 0.02}&neLng={SEOUL_LNG + 0.02}&facets=1")
+
+_IMPORT_PROBE = """
+import sys, time, json, importlib
+t0 = time.perf_counter()
+importlib.import_module("docs.samples." + sys.argv[1])
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({"ms": ms, "heavy": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def _import_times() -> None:
+    print(f"{'module':<20} {'import ms':>9}  heavy deps")
+    for name in MODULES:
+        proc = subprocess.run([sys.executable, "-c", _IMPORT_PROBE, name, *HEAVY],
+                              capture_output=True, text=True)
+        if proc.returncode:
+            print(f"{name:<20} {'failed':>9}  {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        r = json.loads(proc.stdout)
+        print(f"{name:<20} {r['ms']:>9.1f}  {', '.join(r['heavy']) or '-'}")
+
+
+def _master(mode: str, db_path: str, out: mp.Queue):
+    os.environ["DINING_DB_PATH"] = db_path
+    from flask import Flask
+
+    from ..routes import dining_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(dining_bp)
+    warm_ms = 0.0
+    if mode == "warm":
+        from ..warmup import warm_up
+
+        t0 = time.perf_counter()
+        warm_up()
+        warm_ms = (time.perf_counter() - t0) * 1000
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            client = app.test_client()
+            times = []
+            for _ in range(2):
+                t0 = time.perf_counter()
+                resp = client.get(QUERY)
+                times.append((time.perf_counter() - t0) * 1000)
+            out.put({"mode": mode, "warmMs": warm_ms, "first": times[0], "second": times[1],
+                     "status": resp.status_code})
+            # put() hands off to a feeder thread; flush it before _exit kills the thread
+            out.close()
+            out.join_thread()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for each worker's result")
+    args = parser.parse_args()
+
+    _import_times()
+
+    with temp_dining_db() as db_path:
+        from ..models import CrawledPlace, dispose_engines, get_dining_session
+
+        session = get_dining_session()
+        session.bulk_insert_mappings(CrawledPlace, crawled_place_rows(args.places))
+        session.commit()
+        dispose_engines()
+
+        print(f"\n{args.places} places")
+        print(f"{'mode':>5} {'warm-up ms':>10} {'1st req ms':>10} {'2nd req ms':>10} {'status':>6}")
+        ctx = mp.get_context("spawn")
+        for mode in ("cold", "warm"):
+            out = ctx.Queue()
+            proc = ctx.Process(target=_master, args=(mode, db_path, out))
+            proc.start()
+            try:
+                r = out.get(timeout=args.timeout)
+            except queue.Empty:
+                print(f"{mode:>5} no result within {args.timeout:g}s")
+                proc.kill()
+                continue
+            finally:
+                proc.join()
+            print(f"{r['mode']:>5} {r['warmMs']:>10.0f} {r['first']:>10.1f} {r['second']:>10.1f} {r['status']:>6}")
+
+
+if __name__ == "__main__":
+    main()
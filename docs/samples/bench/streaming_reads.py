@@ -0,0 +1,73 @@
+"""Peak RSS and time-to-first-byte: list-building vs. keyset streaming reads.
+
+Each mode runs in its own process so ru_maxrss is not shared.
+
+Usage (from repo root):
+    python -m docs.samples.bench.streaming_reads --rows 1000000
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import time
+
+from .synthetic import crawled_place_rows, temp_dining_db
+
+WHOLE_CITY = {"swLat": 37.0, "neLat": 38.0, "swLng": 126.0, "neLng": 128.0}
+
+
+def _run(mode: str, db_path: str, out: mp.Queue):
+    import os
+
+    os.environ["DINING_DB_PATH"] = db_path
+    from ..models import get_dining_read_session
+    from ..place_cache import find_cached_places, iter_cached_places
+
+    session = get_dining_read_session()
+    t0 = time.perf_counter()
+    ttfb = None
+    nbytes = 0
+    if mode == "list":
+        body = json.dumps(find_cached_places(session, WHOLE_CITY), ensure_ascii=False)
+        ttfb = time.perf_counter() - t0
+        nbytes = len(body)
+    else:
+        for i, place in enumerate(iter_cached_places(session, WHOLE_CITY)):
+            nbytes += len(json.dumps(place, ensure_ascii=False)) + 1
+            if i == 0:
+                ttfb = time.perf_counter() - t0
+    total = time.perf_counter() - t0
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    out.put((mode, ttfb or total, total, rss_mb, nbytes))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with temp_dining_db() as db_path:
+        from ..models import CrawledPlace, get_dining_session
+
+        session = get_dining_session()
+        for start in range(0, args.rows, 50_000):
+            batch = crawled_place_rows(min(50_000, args.rows - start), seed=start)
+            for i, row in enumerate(batch):
+                row["name"] = f"장소{start + i}"
+            session.bulk_insert_mappings(CrawledPlace, batch)
+            session.commit()
+
+        ctx = mp.get_context("spawn")
+        print(f"{'mode':>6} {'ttfb_ms':>9} {'total_s':>8} {'peak_rss_mb':>11} {'mb_out':>7}")
+        for mode in ("list", "stream"):
+            out = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(mode, db_path, out))
+            proc.start()
+            m, ttfb, total, rss, nbytes = out.get()
+            proc.join()
+            print(f"{m:>6} {ttfb * 1000:9.1f} {total:8.2f} {rss:11.1f} {nbytes / 1e6:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
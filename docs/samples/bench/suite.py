@@ -0,0 +1,253 @@
+"""Offline benchmark suite for the dining service modules.
+
+Every scenario runs against seeded synthetic data (see ``synthetic``) and a
+temporary dining.db, and records throughput (items/s) and peak Python heap.
+Results are compared with ``baseline.json``; a scenario slower than the
+baseline by more than ``--tolerance``, or one with no baseline entry, fails
+the run (exit code 1). Baselines are machine-specific, so the file is not
+committed: record one with ``--update-baseline`` on the machine that runs
+the comparison.
+
+Usage (from repo root):
+    python -m docs.samples.bench.suite                      # compare with baseline
+    python -m docs.samples.bench.suite --update-baseline    # record a new baseline
+    python -m docs.samples.bench.suite -s dedup -s mapper --max-size 10000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from . import synthetic
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+# --------------- Scenarios ---------------
+# Each scenario: (max_size, setup(n) -> state, run(state) -> None). Setup is not timed.
+
+
+def _setup_dedup(n):
+    return synthetic.place_dicts(n)
+
+
+def _run_dedup(places):
+    from ..agents.dedup import deduplicate_places
+
+    deduplicate_places(places)
+
+
+def _fake_crawled(n):
+    rows = []
+    for i, p in enumerate(synthetic.place_dicts(n, dup_rate=0)):
+        src = SimpleNamespace(source=p["source"], rating=p["rating"], review_count=p["reviewCount"],
+                              snippet=p["snippet"], metadata_=p["metadata"])
+        rows.append(SimpleNamespace(id=i, name=p["name"], category=p["category"], description=None,
+                                    lat=p["lat"], lng=p["lng"], price_range=None, atmosphere=None,
+                                    good_for=None, tags=p["tags"], place_type=p["placeType"], sources=[src]))
+    return rows
+
+
+def _run_mapper(rows):
+    from ..place_mapper import deduplicate_places, map_crawled_to_places, rank_by_diningcode
+
+    places = map_crawled_to_places(rows)
+    # Ranks come precomputed from SQL (place_cache.diningcode_ranks); any order works here
+    rank_by_diningcode(places, {r.id: i for i, r in enumerate(rows, start=1)})
+    deduplicate_places(places[: len(places) // 10], places)
+
+
+def _setup_cache_save(n):
+    ctx = synthetic.temp_dining_db()
+    ctx.__enter__()
+    from ..models import get_dining_session
+
+    # Shape of deduplicate_places output: one entry per place with its sources
+    places = [
+        {**p, "sources": [{"source": p["source"], "sourceUrl": p["sourceUrl"], "rating": p["rating"],
+                           "reviewCount": p["reviewCount"], "metadata": p["metadata"]}]}
+        for p in synthetic.place_dicts(n, dup_rate=0)
+    ]
+    return SimpleNamespace(ctx=ctx, session=get_dining_session(), places=places)
+
+
+def _run_cache_save(state):
+    from ..place_cache import save_crawled_places
+
+    save_crawled_places(state.session, state.places)
+
+
+def _setup_cache_find(n):
+    ctx = synthetic.temp_dining_db()
+    ctx.__enter__()
+    from ..models import CrawledPlace, PlaceSource, get_dining_read_session, get_dining_session
+
+    session = get_dining_session()
+    for start in range(0, n, 50_000):
+        batch = synthetic.place_dicts(min(50_000, n - start), seed=start, dup_rate=0)
+        session.bulk_insert_mappings(CrawledPlace, [
+            {"id": start + i + 1, "name": p["name"], "category": p["category"], "address": p["address"],
+             "lat": p["lat"], "lng": p["lng"], "tags": p["tags"], "place_type": p["placeType"]}
+            for i, p in enumerate(batch)
+        ])
+        session.bulk_insert_mappings(PlaceSource, [
+            {"crawled_place_id": start + i + 1, "source": "diningcode", "rating": p["rating"],
+             "metadata_": p["metadata"]}
+            for i, p in enumerate(batch)
+        ])
+        session.commit()
+    return SimpleNamespace(ctx=ctx, session=get_dining_read_session())
+
+
+def _run_cache_find(state):
+    from ..place_cache import find_cached_places
+
+    find_cached_places(state.session, {"swLat": 37.0, "neLat": 38.0, "swLng": 126.0, "neLng": 128.0})
+    state.session.rollback()
+
+
+def _setup_keyword(n):
+    return synthetic.api_places(n)
+
+
+def _run_keyword(places):
+    from ..llm_service import keyword_fallback
+
+    keyword_fallback("이태원 데이트 조용한 파스타", places)
+
+
+def _run_compress(places):
+    from ..llm_service import _compress_place
+
+    anchor = {"name": "이태원", "lat": 37.5345, "lng": 126.9945}
+    for i, p in enumerate(places):
+        _compress_place(p, i, anchor)
+
+
+def _setup_landmark(n):
+    return synthetic.landmark_queries(n)
+
+
+def _run_landmark(queries):
+    from ..geocode import _lookup_landmark
+
+    for q in queries:
+        _lookup_landmark(q)
+
+
+SCENARIOS = {
+    "dedup": (10_000, _setup_dedup, _run_dedup),
+    "mapper": (1_000_000, _fake_crawled, _run_mapper),
+    "cache_save": (10_000, _setup_cache_save, _run_cache_save),
+    "cache_find": (1_000_000, _setup_cache_find, _run_cache_find),
+    "keyword_fallback": (1_000_000, _setup_keyword, _run_keyword),
+    "compress_place": (1_000_000, _setup_keyword, _run_compress),
+    "lookup_landmark": (1_000_000, _setup_landmark, _run_landmark),
+}
+# Scenarios whose run changes their state (cache_save would update the rows
+# it inserted on the first run): set up afresh before every timed run
+FRESH_SETUP = {"cache_save"}
+
+
+# --------------- Runner ---------------
+
+
+def _teardown(state):
+    ctx = getattr(state, "ctx", None)
+    if ctx is not None:
+        ctx.__exit__(None, None, None)
+
+
+def run_scenario(name: str, n: int, repeat: int) -> dict:
+    _, setup, run = SCENARIOS[name]
+
+    state = setup(n)
+    try:
+        best = float("inf")
+        for i in range(repeat):
+            if i and name in FRESH_SETUP:
+                _teardown(state)
+                state = setup(n)
+            gc.collect()
+            t0 = time.perf_counter()
+            run(state)
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        _teardown(state)
+
+    # Separate pass for memory — tracemalloc slows the run it observes
+    state = setup(n)
+    try:
+        gc.collect()
+        tracemalloc.start()
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        _teardown(state)
+
+    return {"items_per_s": n / best, "seconds": best, "peak_mb": peak / 1e6}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--max-size", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    elif not args.update_baseline:
+        print(f"no baseline at {args.baseline}; record one with --update-baseline", file=sys.stderr)
+        return 1
+
+    results = {}
+    failures = []
+    print(f"{'scenario':<18} {'n':>9} {'items/s':>12} {'peak_mb':>9} {'vs_base':>8}")
+    for name in args.scenario or SCENARIOS:
+        max_size = SCENARIOS[name][0]
+        for n in args.sizes:
+            if n > max_size or (args.max_size and n > args.max_size):
+                continue
+            key = f"{name}@{n}"
+            r = results[key] = run_scenario(name, n, args.repeat)
+            base = baseline.get(key, {}).get("items_per_s")
+            ratio = r["items_per_s"] / base if base else None
+            flag = ""
+            if ratio is None and not args.update_baseline:
+                failures.append(key)
+                flag = "  NO BASELINE"
+            elif ratio is not None and ratio < 1 - args.tolerance:
+                failures.append(key)
+                flag = "  SLOWER"
+            print(f"{name:<18} {n:>9} {r['items_per_s']:>12.0f} {r['peak_mb']:>9.1f} "
+                  f"{(f'{ratio:.2f}x' if ratio else '-'):>8}{flag}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if failures:
+        print(f"regressions beyond {args.tolerance:.0%} or missing from the baseline: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Seeded synthetic data for the dining benchmarks."""
+
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+
+SEOUL_LAT, SEOUL_LNG = 37.55, 126.98
+PLACE_TYPES = ["restaurant", "cafe", "bar", "bakery"]
+
+_NAME_PREFIXES = ["할매", "원조", "옛날", "진짜", "서울", "명동", "을지", "성수", "연남", "한남", "우리집", "골목"]
+_CUISINES = {
+    "restaurant": [("순대국", "한식"), ("칼국수", "한식"), ("돈까스", "일식"), ("짬뽕", "중식"),
+                   ("파스타", "양식"), ("갈비", "고기"), ("초밥", "일식"), ("국밥", "한식")],
+    "cafe": [("커피", "카페"), ("로스터리", "카페"), ("찻집", "전통차"), ("디저트카페", "디저트")],
+    "bar": [("포차", "술집"), ("이자카야", "이자카야"), ("와인바", "와인"), ("호프", "맥주")],
+    "bakery": [("베이커리", "빵집"), ("베이글", "베이글"), ("소금빵", "빵집"), ("도넛", "디저트")],
+}
+_BRANCHES = ["", "", "", " 본점", " 역점", " 2호점", "점"]
+_GU_DONG = [("용산구", "이태원동"), ("용산구", "한남동"), ("마포구", "연남동"), ("마포구", "망원동"),
+            ("강남구", "역삼동"), ("강남구", "청담동"), ("성동구", "성수동"), ("중구", "을지로"),
+            ("종로구", "익선동"), ("송파구", "잠실동"), ("영등포구", "여의도동"), ("서대문구", "신촌동")]
+_SYLLABLES = "가나다라마바사아자차카타파하소담미루온빛숲솔"
+_TAGS = ["혼밥", "데이트", "가성비", "술모임", "혼카페", "차모임", "간식", "콜키지", "주차", "노포"]
+_SOURCES = ["diningcode", "naver-place", "instagram", "youtube"]
+
+
+@contextmanager
+def temp_dining_db():
+    """Point DINING_DB_PATH at a fresh temporary dining.db and create the tables."""
+    from .. import models
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prev = os.environ.get("DINING_DB_PATH")
+        os.environ["DINING_DB_PATH"] = os.path.join(tmp, "dining.db")
+        models._engine = models._read_engine = None
+        models._SessionFactory = models._ReadSessionFactory = None
+        try:
+            models.init_dining_db()
+            yield os.environ["DINING_DB_PATH"]
+        finally:
+            for engine in (models._engine, models._read_engine):
+                if engine is not None:
+                    engine.dispose()
+            models._engine = models._read_engine = None
+            models._SessionFactory = models._ReadSessionFactory = None
+            if prev is None:
+                os.environ.pop("DINING_DB_PATH", None)
+            else:
+                os.environ["DINING_DB_PATH"] = prev
+
+
+def crawled_place_rows(n: int, seed: int = 0, spread: float = 0.15) -> list[dict]:
+    """CrawledPlace column dicts scattered around central Seoul."""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"장소{i}",
+            "category": rng.choice(["한식", "일식", "중식", "양식", "카페", "술집"]),
+            "lat": SEOUL_LAT + rng.gauss(0, spread / 3),
+            "lng": SEOUL_LNG + rng.gauss(0, spread / 3),
+            "place_type": rng.choice(PLACE_TYPES),
+        }
+        for i in range(n)
+    ]
+
+
+def place_dicts(n: int, seed: int = 0, dup_rate: float = 0.2) -> list[dict]:
+    """Raw crawl dicts (the shape crawl_diningcode returns) with multi-source duplicates.
+
+    About ``dup_rate`` of the places reappear from another source with a
+    branch-suffix/spacing variant of the name and < 80m of coordinate jitter.
+    """
+    rng = random.Random(seed)
+    out: list[dict] = []
+    i = 0
+    while len(out) < n:
+        ptype = rng.choice(PLACE_TYPES)
+        dish, category = rng.choice(_CUISINES[ptype])
+        gu, dong = rng.choice(_GU_DONG)
+        # Names repeat at large n, like real chains; the branch suffix varies
+        word = "".join(rng.choice(_SYLLABLES) for _ in range(2))
+        name = f"{rng.choice(_NAME_PREFIXES)}{dish} {word}{rng.choice(_BRANCHES)}"
+        lat = SEOUL_LAT + rng.gauss(0, 0.04)
+        lng = SEOUL_LNG + rng.gauss(0, 0.05)
+        score = round(rng.uniform(60, 95), 1)
+        base = {
+            "name": name,
+            "category": category,
+            "address": f"서울특별시 {gu} {dong} {rng.randint(1, 300)}-{rng.randint(1, 40)}",
+            "lat": lat,
+            "lng": lng,
+            "source": "diningcode",
+            "sourceUrl": f"https://www.diningcode.com/profile.php?rid=R{seed}x{i}",
+            "tags": ", ".join(rng.sample(_TAGS, 3)),
+            "rating": score,
+            "reviewCount": rng.randint(0, 2000),
+            "snippet": f"{dish} 맛집, {category} 대표 메뉴가 유명한 곳",
+            "metadata": f'{{"score": {score}}}',
+            "placeType": ptype,
+        }
+        out.append(base)
+        if rng.random() < dup_rate and len(out) < n:
+            variant = name.replace(" ", "", 1) if rng.random() < 0.5 else name.rstrip("점") + " 본점"
+            out.append({
+                **base,
+                "name": variant,
+                "lat": lat + rng.uniform(-0.0007, 0.0007),
+                "lng": lng + rng.uniform(-0.0007, 0.0007),
+                "source": rng.choice(_SOURCES[1:]),
+                "sourceUrl": None,
+                "rating": round(rng.uniform(3.0, 5.0), 1),
+                "metadata": None,
+            })
+        i += 1
+    return out
+
+
+def api_places(n: int, seed: int = 0) -> list[dict]:
+    """Mapped place dicts (the API shape llm_service consumes), including parking."""
+    rng = random.Random(seed)
+    out = []
+    for i, p in enumerate(place_dicts(n, seed, dup_rate=0)):
+        ptype = "parking" if rng.random() < 0.1 else p["placeType"]
+        place = {
+            "id": i,
+            "name": p["name"],
+            "description": p["snippet"],
+            "lat": p["lat"],
+            "lng": p["lng"],
+            "type": ptype,
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "priceRange": rng.choice(["1만원대", "2~3만원", "5만원 이상"]),
+            "atmosphere": rng.choice(["조용한", "활기찬", "아늑한", "모던한"]),
+            "goodFor": rng.choice(["데이트", "가족", "혼밥", "회식"]),
+            "parkingAvailable": rng.random() < 0.3,
+        }
+        if ptype == "parking":
+            place.update({"parkingType": "공영", "hourlyRate": rng.choice([1200, 2400, 3000]),
+                          "capacity": rng.randint(20, 500), "operatingHours": "00:00-24:00"})
+        elif ptype in ("cafe", "bakery"):
+            place["specialty"] = p["category"]
+        else:
+            place["category"] = p["category"]
+        out.append(place)
+    return out
+
+
+def landmark_queries(n: int, seed: int = 0) -> list[str]:
+    """Location strings as extract_location returns them: exact, partial, addresses, misses."""
+    from ..geocode import LANDMARK_MAP
+
+    rng = random.Random(seed)
+    keys = list(LANDMARK_MAP)
+    kinds = [
+        lambda: rng.choice(keys),
+        lambda: rng.choice(keys)[:2],
+        lambda: f"{rng.choice(keys)} 근처",
+        lambda: f"서울특별시 {rng.choice(_GU_DONG)[0]} {rng.randint(1, 300)}",
+        lambda: f"{rng.choice(_NAME_PREFIXES)}마을",
+    ]
+    return [rng.choice(kinds)() for _ in range(n)]
@@ -0,0 +1,132 @@
+"""Viewport loads with and without the tile cache, replaying a panning trace.
+
+A trace is a list of viewports (JSON lines of swLat/swLng/neLat/neLng), as
+recorded from a map client; without --trace a synthetic one is generated:
+small pans with jitter, zooming in and out, drifting back over earlier
+ground. Each viewport is loaded through routes._load_places (the
+/api/places path) and place_cache.find_cached_places, with the tile cache
+off and then on; every --write-every steps a place is re-saved through
+save_crawled_places so invalidation is part of the run. Cached answers are
+checked against an uncached load of the same viewport at the same moment.
+
+Usage (from repo root):
+    python -m docs.samples.bench.tile_cache --places 100000 --steps 500
+    python -m docs.samples.bench.tile_cache --record trace.jsonl   # save the synthetic trace
+    python -m docs.samples.bench.tile_cache --trace trace.jsonl
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from .synthetic import SEOUL_LAT, SEOUL_LNG, crawled_place_rows, temp_dining_db
+
+
+def synthetic_trace(steps: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    lat, lng, half = SEOUL_LAT, SEOUL_LNG, 0.01
+    trace = []
+    for _ in range(steps):
+        r = rng.random()
+        if r < 0.1:
+            half = min(max(half * rng.choice([0.5, 2.0]), 0.0025), 0.04)  # zoom
+        elif r < 0.2:
+            lat, lng = SEOUL_LAT + rng.gauss(0, 0.02), SEOUL_LNG + rng.gauss(0, 0.02)  # jump back
+        else:
+            lat += rng.gauss(0, half / 2)
+            lng += rng.gauss(0, half / 2)
+        trace.append({"swLat": lat - half, "swLng": lng - half, "neLat": lat + half, "neLng": lng + half})
+    return trace
+
+
+def _replay(trace: list[dict], load, write_every: int, rewrite, check=None) -> tuple[list[float], int]:
+    """Per-viewport milliseconds, and how many answers differed from ``check`` (untimed)."""
+    times, mismatched = [], 0
+    for i, bounds in enumerate(trace):
+        if write_every and i and i % write_every == 0:
+            rewrite(i)
+        t0 = time.perf_counter()
+        answer = load(bounds)
+        times.append((time.perf_counter() - t0) * 1000)
+        if check is not None and check(bounds) != answer:
+            mismatched += 1
+    return times, mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--trace", help="JSON-lines viewport trace to replay")
+    parser.add_argument("--record", help="write the synthetic trace here and exit")
+    parser.add_argument("--write-every", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.trace:
+        with open(args.trace) as fh:
+            trace = [json.loads(line) for line in fh if line.strip()]
+    else:
+        trace = synthetic_trace(args.steps)
+    if args.record:
+        with open(args.record, "w") as fh:
+            fh.writelines(json.dumps(b) + "\n" for b in trace)
+        print(f"recorded {len(trace)} viewports to {args.record}")
+        return
+
+    with temp_dining_db():
+        from .. import tile_cache
+        from ..models import CrawledPlace, get_dining_read_session, get_dining_session
+        from ..place_cache import find_cached_places, save_crawled_places
+        from ..routes import _load_places
+
+        rows = crawled_place_rows(args.places, spread=0.1)
+        session = get_dining_session()
+        session.bulk_insert_mappings(CrawledPlace, rows)
+        session.commit()
+
+        def rewrite(i: int):
+            row = rows[i % len(rows)]
+            save_crawled_places(get_dining_session(), [{
+                "name": row["name"], "lat": row["lat"], "lng": row["lng"], "description": f"업데이트 {i}",
+            }])
+
+        def load_mapped(bounds):
+            return sorted(json.dumps(p.to_dict(), sort_keys=True) for p in _load_places(bounds))
+
+        def load_cached(bounds):
+            read = get_dining_read_session()
+            try:
+                return sorted(json.dumps(p, sort_keys=True) for p in find_cached_places(read, bounds, include_stale=True))
+            finally:
+                read.remove()
+
+        print(f"{args.places} places, {len(trace)} viewports, a write every {args.write_every}")
+        print(f"{'path':<22} {'cache':>5} {'hit %':>6} {'p50 ms':>7} {'p95 ms':>7} {'total s':>8}")
+        for label, load, cache_name in (("/api/places", load_mapped, "mapped"),
+                                        ("find_cached_places", load_cached, "cached")):
+            def uncached(bounds, load=load):
+                tile_cache.TILE_CACHE_ENABLED = False
+                try:
+                    return load(bounds)
+                finally:
+                    tile_cache.TILE_CACHE_ENABLED = True
+
+            for enabled in (False, True):
+                tile_cache.TILE_CACHE_ENABLED = enabled
+                for cache in tile_cache._caches.values():
+                    cache.clear()
+                cache = tile_cache.get_tile_cache(cache_name)
+                cache.hits = cache.misses = 0
+                times, mismatched = _replay(trace, load, args.write_every, rewrite, uncached if enabled else None)
+                lookups = cache.hits + cache.misses
+                hit = f"{cache.hits / lookups * 100:.0f}" if lookups else "-"
+                ms = sorted(times)
+                print(f"{label:<22} {'on' if enabled else 'off':>5} {hit:>6} {statistics.median(ms):>7.1f} "
+                      f"{ms[int(len(ms) * 0.95) - 1]:>7.1f} {sum(ms) / 1000:>8.2f}"
+                      + (f"  {mismatched} answers differ from uncached" if enabled else ""))
+
+
+if __name__ == "__main__":
+    main()
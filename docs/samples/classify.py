@@ -3,6 +3,7 @@
 import json
 import logging
 
+from .metrics import traced
 from .openrouter_client import FLASH_MODEL, chat_completion, extract_json
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,7 @@ JSON 배열로만 응답하세요:
 [{"name":"가게명","type":"restaurant|cafe|bar|bakery"}]"""
 
 
+@traced("classify")
 def classify_places(places: list[dict]) -> dict[str, str]:
     """Classify places into restaurant/cafe/bar/bakery.
 
@@ -66,6 +68,7 @@ def classify_places(places: list[dict]) -> dict[str, str]:
                 ],
                 temperature=0,
                 max_tokens=4000,
+                call_site="classify",
             )
             if not content:
                 continue
@@ -87,7 +90,8 @@ def classify_and_persist(session, records: list[dict]) -> dict[str, str]:
         session: SQLAlchemy session for dining.db
         records: list of dicts with id, name, category, tags, description
     """
-    from .models import CrawledPlace
+    from .models import CrawledPlace, dining_write_lock
+    from .place_cluster import GridDeltas, crawled_type
 
     if not records:
         return {}
@@ -105,16 +109,25 @@ def classify_and_persist(session, records: list[dict]) -> dict[str, str]:
     )
 
     updated = 0
-    for r in records:
-        pt = type_map.get(r["name"])
-        if pt:
-            cp = session.query(CrawledPlace).filter(CrawledPlace.id == r["id"]).first()
-            if cp:
-                cp.place_type = pt
-                updated += 1
-
-    if updated:
+    grid = GridDeltas()
+    with dining_write_lock():
+        for r in records:
+            pt = type_map.get(r["name"])
+            if pt:
+                cp = session.query(CrawledPlace).filter(CrawledPlace.id == r["id"]).first()
+                if cp:
+                    if cp.lat is not None and cp.lng is not None:
+                        grid.move((cp.lat, cp.lng, crawled_type(cp.place_type)), (cp.lat, cp.lng, pt))
+                    cp.place_type = pt
+                    updated += 1
+
+        grid.apply(session)
+        # Always end the transaction — the writer holds BEGIN IMMEDIATE
         session.commit()
+    if updated:
         logger.info("[classify] persisted %d placeType values", updated)
+        from .place_cache import notify_places_changed
+
+        notify_places_changed()
 
     return type_map
@@ -0,0 +1,109 @@
+"""Crawl pipeline — DiningCode + parking → dedup → geocode → classify → save.
+
+Shared by the crawl SSE route and the background refresh scheduler; yields
+progress events as dicts so each caller decides how (or whether) to emit them.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from .agents.dedup import deduplicate_places as merge_crawled_places
+from .agents.diningcode import fetch_list_page, page_fingerprint, parse_list_page
+from .classify import classify_places
+from .geocode import geocode
+from .llm_service import fetch_parking_by_keyword
+from .models import CrawlPageState, dining_write_lock, get_dining_session
+from .place_cache import save_crawled_places, save_parking_lots
+
+logger = logging.getLogger(__name__)
+
+
+def record_page_state(session, keyword: str, content_hash: str, place_count: int | None = None) -> None:
+    """Store the page hash; place_count=None means a revalidation that found no change."""
+    now = datetime.now(timezone.utc)
+    with dining_write_lock():
+        state = session.get(CrawlPageState, keyword)
+        if state is None:
+            state = CrawlPageState(keyword=keyword)
+            session.add(state)
+        state.content_hash = content_hash
+        state.checked_at = now
+        if place_count is not None:
+            state.place_count = place_count
+            state.crawled_at = now
+        session.commit()
+
+
+def _in_bounds(place: dict, bounds: dict) -> bool:
+    return (bounds["swLat"] <= place["lat"] <= bounds["neLat"]
+            and bounds["swLng"] <= place["lng"] <= bounds["neLng"])
+
+
+def run_crawl(keyword: str, bounds: dict | None = None, html: str | None = None):
+    """Run the full crawl for a keyword, yielding progress events.
+
+    ``bounds`` only narrows the count reported with the final event; every
+    place on the page is saved.
+    ``html`` lets the refresh scheduler reuse a page it already downloaded
+    for the change check.
+    """
+    yield {"step": "searching", "message": "맛집 검색 중..."}
+
+    # 1. DiningCode + parking
+    raw_places = []
+    try:
+        if html is None:
+            html = fetch_list_page(keyword)
+        raw_places = parse_list_page(html)
+    except Exception as e:
+        logger.error("[crawl] diningcode error: %s", e)
+        html = None  # don't record a hash for a page we couldn't read
+    parking_lots = fetch_parking_by_keyword(keyword)
+
+    yield {
+        "step": "fetched",
+        "message": f"맛집 {len(raw_places)}개, 주차장 {len(parking_lots)}개 발견",
+        "places": len(raw_places),
+        "parking": len(parking_lots),
+    }
+
+    session = get_dining_session()
+    try:
+        parking_added = save_parking_lots(session, parking_lots) if parking_lots else 0
+
+        # 2. Places: dedup → geocode → classify → save
+        place_count = in_view = 0
+        if raw_places:
+            merged = merge_crawled_places(raw_places)
+            needs_geocode = [p for p in merged if not (p.get("lat") and p.get("lng")) and p.get("name")]
+            for progress, place in enumerate(needs_geocode, start=1):
+                geo = geocode(place.get("address") or f"{keyword} {place['name']}")
+                if geo:
+                    place["lat"], place["lng"] = geo["lat"], geo["lng"]
+                    place["address"] = place.get("address") or geo["address"]
+                yield {"step": "geocoding", "message": "위치 확인 중...", "progress": progress, "total": len(needs_geocode)}
+
+            # Everything the page lists is kept, not just what falls inside this
+            # request's bounds: the list page depends only on the keyword, and
+            # CrawlPageState marks the keyword crawled for every later viewport.
+            results = [p for p in merged if p.get("lat") and p.get("lng")]
+
+            yield {"step": "classifying", "message": "카테고리 분류 중..."}
+            type_map = classify_places(results)
+            for r in results:
+                r["placeType"] = type_map.get(r["name"], "restaurant")
+
+            yield {"step": "saving", "message": "저장 중..."}
+            if results:
+                save_crawled_places(session, results)
+            place_count = len(results)
+            in_view = sum(1 for p in results if _in_bounds(p, bounds)) if bounds else place_count
+        else:
+            yield {"step": "saving", "message": "저장 중..."}
+
+        if html is not None:
+            record_page_state(session, keyword, page_fingerprint(html), place_count)
+    finally:
+        session.remove()
+
+    yield {"step": "done", "count": in_view, "saved": place_count, "parkingAdded": parking_added, "keyword": keyword}
@@ -0,0 +1,569 @@
+"""Facet index — compressed bitmaps per attribute value for the places API filters.
+
+Every restaurant, cafe, parking lot and crawled place with coordinates
+gets a dense slot number, and each facet value (type, priceRange,
+atmosphere, goodFor, tags) holds a Bitmap of slots. Slots are handed out
+in FACET_CELL_DEG grid-cell order, so the bounds filter is a few slot
+ranges. A filtered query is a union per facet (values are OR-ed) and an
+intersection across facets and the bounds; facet counts are
+intersections with the other facets' selections (disjunctive faceting),
+pruned by value size so long-tail tags cost little.
+
+Bitmaps are roaring-style: slots are split into 2^16-wide chunks, each
+stored as a set while sparse and as an int bitset once dense, so AND/OR
+run in C on the dense chunks.
+
+Each process holds its own index. Crawled places are picked up
+incrementally by updated_at (writes bump it); seed tables are checked by
+their seed_version write counters and a shrinking crawled_place table
+(merges) triggers a rebuild. notify_places_changed() makes the next read catch up at
+once. Catch-up mutates the index in place, so queries go through
+query_facets(), which holds the same lock.
+"""
+
+import math
+import time
+import heapq
+import logging
+import threading
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from .models import Cafe, CrawledPlace, ParkingLot, Restaurant, SeedVersion
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("type", "priceRange", "atmosphere", "goodFor", "tags")
+FACET_CELL_DEG = 0.01  # ~1.1km; bounds cover whole cells plus exact checks on the edge cells
+FACET_COUNT_LIMIT = 20  # values per facet in the response
+_COUNT_SCAN_MAX = 20_000  # below this many candidates, count by scanning their values
+_RELOAD_CHECK_SEC = 1.0
+_CATCH_UP_OVERLAP = timedelta(seconds=2)  # re-read recent rows; upserts are idempotent
+
+_ARRAY_MAX = 4096  # sparse chunk limit, as in Roaring
+_CHUNK_BITS = 16
+_LOW_MASK = (1 << _CHUNK_BITS) - 1
+
+KINDS = ("restaurant", "cafe", "parking", "crawled")
+_KIND_CODE = {k: i for i, k in enumerate(KINDS)}
+_PLACE_TYPES = {"restaurant", "cafe", "bar", "bakery"}
+
+
+# --------------- Bitmap ---------------
+
+
+def _set_to_bits(values) -> int:
+    buf = bytearray(1 << (_CHUNK_BITS - 3))
+    for v in values:
+        buf[v >> 3] |= 1 << (v & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _bits_to_list(bits: int) -> list[int]:
+    s = bin(bits)[:1:-1]  # least significant bit first
+    out = []
+    i = s.find("1")
+    while i >= 0:
+        out.append(i)
+        i = s.find("1", i + 1)
+    return out
+
+
+def _filter_by_bits(values, bits: int, buf: bytes | None = None) -> set:
+    buf = buf or bits.to_bytes(1 << (_CHUNK_BITS - 3), "little")
+    return {v for v in values if buf[v >> 3] >> (v & 7) & 1}
+
+
+def _compact(chunk):
+    if isinstance(chunk, int) and chunk.bit_count() <= _ARRAY_MAX:
+        return set(_bits_to_list(chunk))
+    return chunk
+
+
+class Bitmap:
+    """Roaring-style set of non-negative ints."""
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: dict | None = None):
+        self._chunks: dict[int, set | int] = chunks or {}
+
+    @classmethod
+    def from_ids(cls, ids) -> "Bitmap":
+        grouped: dict[int, list[int]] = defaultdict(list)
+        for i in ids:
+            grouped[i >> _CHUNK_BITS].append(i & _LOW_MASK)
+        return cls({hi: set(lows) if len(lows) <= _ARRAY_MAX else _set_to_bits(lows) for hi, lows in grouped.items()})
+
+    @classmethod
+    def from_ranges(cls, ranges) -> "Bitmap":
+        """Bitmap of the half-open [start, end) slot ranges, built with shifts instead of per-id work."""
+        chunks: dict[int, int] = defaultdict(int)
+        for start, end in ranges:
+            while start < end:
+                hi = start >> _CHUNK_BITS
+                stop = min(end, (hi + 1) << _CHUNK_BITS)
+                chunks[hi] |= ((1 << (stop - start)) - 1) << (start & _LOW_MASK)
+                start = stop
+        return cls(dict(chunks))
+
+    @classmethod
+    def union_all(cls, bitmaps) -> "Bitmap":
+        sparse: dict[int, set] = defaultdict(set)
+        dense: dict[int, int] = defaultdict(int)
+        for bm in bitmaps:
+            for hi, chunk in bm._chunks.items():
+                if isinstance(chunk, set):
+                    sparse[hi] |= chunk
+                else:
+                    dense[hi] |= chunk
+        chunks = {}
+        for hi in sparse.keys() | dense.keys():
+            s, d = sparse.get(hi), dense.get(hi)
+            if d is None:
+                chunks[hi] = s if len(s) <= _ARRAY_MAX else _set_to_bits(s)
+            else:
+                chunks[hi] = d | _set_to_bits(s) if s else d
+        return cls(chunks)
+
+    def add(self, i: int):
+        hi, lo = i >> _CHUNK_BITS, i & _LOW_MASK
+        chunk = self._chunks.get(hi)
+        if chunk is None:
+            self._chunks[hi] = {lo}
+        elif isinstance(chunk, set):
+            chunk.add(lo)
+            if len(chunk) > _ARRAY_MAX:
+                self._chunks[hi] = _set_to_bits(chunk)
+        else:
+            self._chunks[hi] = chunk | (1 << lo)
+
+    def discard(self, i: int):
+        hi, lo = i >> _CHUNK_BITS, i & _LOW_MASK
+        chunk = self._chunks.get(hi)
+        if chunk is None:
+            return
+        if isinstance(chunk, set):
+            chunk.discard(lo)
+            if not chunk:
+                del self._chunks[hi]
+        else:
+            rest = _compact(chunk & ~(1 << lo))
+            if rest:
+                self._chunks[hi] = rest
+            else:
+                del self._chunks[hi]
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = (self, other) if len(self._chunks) <= len(other._chunks) else (other, self)
+        chunks = {}
+        for hi, a in small._chunks.items():
+            b = large._chunks.get(hi)
+            if b is None:
+                continue
+            if isinstance(a, set):
+                c = a & b if isinstance(b, set) else _filter_by_bits(a, b)
+            elif isinstance(b, set):
+                c = _filter_by_bits(b, a)
+            else:
+                c = _compact(a & b)
+            if c:
+                chunks[hi] = c
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap.union_all((self, other))
+
+    def __len__(self) -> int:
+        return sum(len(c) if isinstance(c, set) else c.bit_count() for c in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __iter__(self):
+        for hi in sorted(self._chunks):
+            chunk = self._chunks[hi]
+            base = hi << _CHUNK_BITS
+            for lo in (sorted(chunk) if isinstance(chunk, set) else _bits_to_list(chunk)):
+                yield base + lo
+
+    def and_len(self, other: "Bitmap", cache: dict | None = None) -> int:
+        """len(self & other) without building the result.
+
+        ``cache`` keeps the byte form of other's dense chunks across calls
+        that count many bitmaps against the same ``other``.
+        """
+        total = 0
+        for hi, a in self._chunks.items():
+            b = other._chunks.get(hi)
+            if b is None:
+                continue
+            if isinstance(a, set):
+                if isinstance(b, set):
+                    total += len(a & b)
+                    continue
+                buf = cache.get(hi) if cache is not None else None
+                if buf is None:
+                    buf = b.to_bytes(1 << (_CHUNK_BITS - 3), "little")
+                    if cache is not None:
+                        cache[hi] = buf
+                total += len(_filter_by_bits(a, b, buf))
+            elif isinstance(b, set):
+                total += len(_filter_by_bits(b, a))
+            else:
+                total += (a & b).bit_count()
+        return total
+
+
+# --------------- Facet values ---------------
+
+
+def _split(text: str | None) -> set[str]:
+    return {v.strip() for v in (text or "").split(",") if v.strip()}
+
+
+def _values(place_type: str, price_range=None, atmosphere=None, good_for=None, tags=None) -> list[tuple[str, str]]:
+    values = [("type", place_type)]
+    if price_range and price_range.strip():
+        values.append(("priceRange", price_range.strip()))
+    if atmosphere and atmosphere.strip():
+        values.append(("atmosphere", atmosphere.strip()))
+    values += [("goodFor", v) for v in sorted(_split(good_for))]
+    values += [("tags", v) for v in sorted(_split(tags))]
+    return values
+
+
+def crawled_facet_type(place_type: str | None) -> str:
+    """The API type of a crawled place (same default as iter_crawled_records)."""
+    return place_type if place_type in _PLACE_TYPES else "restaurant"
+
+
+# --------------- Index ---------------
+
+
+class FacetIndex:
+    """Slots → (kind, id, lat, lng, values), with a Bitmap per facet value.
+
+    build() hands out slots in grid-cell order, so each cell is one slot
+    range and a bounds query ORs a few ranges instead of many small sets.
+    Places added or moved later get a fresh slot at the end (a moved
+    place's old slot is tombstoned) and are kept in per-cell bitmaps.
+    """
+
+    def __init__(self):
+        self.kinds = array("b")
+        self.ids = array("q")
+        self.lats = array("d")
+        self.lngs = array("d")
+        self.doc_values: list[tuple[int, ...]] = []  # value ids per slot; () once removed
+        self.slot_of: dict[tuple[int, int], int] = {}
+        self.value_ids: dict[tuple[str, str], int] = {}
+        self.value_names: list[tuple[str, str]] = []
+        self.bitmaps: list[Bitmap] = []  # by value id
+        self.cell_ranges: dict[tuple[int, int], tuple[int, int]] = {}  # built slots
+        self.cell_extra: dict[tuple[int, int], Bitmap] = {}  # slots added since
+        self.alive = Bitmap()
+        self.kind_counts = Counter()
+        self._version = 0
+        self._order_cache: dict[str, tuple[int, list[tuple[int, int]]]] = {}
+
+    @classmethod
+    def build(cls, docs) -> "FacetIndex":
+        """Bulk build from (kind, id, lat, lng, [(facet, value), ...]) tuples."""
+        index = cls()
+        located = sorted(((cls._cell(d[2], d[3]), d) for d in docs if d[2] is not None and d[3] is not None),
+                         key=lambda cd: cd[0])
+        by_value: dict[int, list[int]] = defaultdict(list)
+        for cell, (kind, pid, lat, lng, values) in located:
+            slot = index._new_slot(kind, pid, lat, lng)
+            vids = tuple(index._value_id(v) for v in values)
+            index.doc_values.append(vids)
+            for vid in vids:
+                by_value[vid].append(slot)
+            start, _ = index.cell_ranges.get(cell, (slot, slot))
+            index.cell_ranges[cell] = (start, slot + 1)
+        index.bitmaps = [Bitmap.from_ids(by_value.get(vid, ())) for vid in range(len(index.value_names))]
+        index.alive = Bitmap.from_ranges([(0, len(index.ids))])
+        return index
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / FACET_CELL_DEG), math.floor(lng / FACET_CELL_DEG)
+
+    def _value_id(self, value: tuple[str, str]) -> int:
+        vid = self.value_ids.get(value)
+        if vid is None:
+            vid = self.value_ids[value] = len(self.value_names)
+            self.value_names.append(value)
+            self.bitmaps.append(Bitmap())
+        return vid
+
+    def _new_slot(self, kind: str, pid: int, lat: float, lng: float) -> int:
+        slot = len(self.ids)
+        self.kinds.append(_KIND_CODE[kind])
+        self.ids.append(pid)
+        self.lats.append(lat)
+        self.lngs.append(lng)
+        self.slot_of[(_KIND_CODE[kind], pid)] = slot
+        self.kind_counts[kind] += 1
+        return slot
+
+    def __len__(self) -> int:
+        return sum(self.kind_counts.values())
+
+    def upsert(self, kind: str, pid: int, lat: float | None, lng: float | None, values: list[tuple[str, str]]):
+        if lat is None or lng is None:
+            self.remove(kind, pid)
+            return
+        self._version += 1
+        new_vids = tuple(self._value_id(v) for v in values)
+        slot = self.slot_of.get((_KIND_CODE[kind], pid))
+        if slot is not None and self.doc_values[slot] and self._cell(self.lats[slot], self.lngs[slot]) == self._cell(lat, lng):
+            old_vids = self.doc_values[slot]
+            for vid in set(old_vids) - set(new_vids):
+                self.bitmaps[vid].discard(slot)
+            for vid in set(new_vids) - set(old_vids):
+                self.bitmaps[vid].add(slot)
+            self.doc_values[slot] = new_vids
+            self.lats[slot], self.lngs[slot] = lat, lng
+            return
+
+        self.remove(kind, pid)
+        slot = self._new_slot(kind, pid, lat, lng)
+        self.doc_values.append(new_vids)
+        for vid in new_vids:
+            self.bitmaps[vid].add(slot)
+        self.cell_extra.setdefault(self._cell(lat, lng), Bitmap()).add(slot)
+        self.alive.add(slot)
+
+    def remove(self, kind: str, pid: int):
+        slot = self.slot_of.get((_KIND_CODE[kind], pid))
+        if slot is None or not self.doc_values[slot]:
+            return
+        self._version += 1
+        for vid in self.doc_values[slot]:
+            self.bitmaps[vid].discard(slot)
+        extra = self.cell_extra.get(self._cell(self.lats[slot], self.lngs[slot]))
+        if extra is not None:
+            extra.discard(slot)
+        self.alive.discard(slot)
+        self.doc_values[slot] = ()
+        self.kind_counts[kind] -= 1
+
+    def bounds_bitmap(self, bounds: dict) -> Bitmap:
+        """Live slots inside the bounds: whole interior cells plus exact checks on the edge cells."""
+        sw_lat, sw_lng, ne_lat, ne_lng = bounds["swLat"], bounds["swLng"], bounds["neLat"], bounds["neLng"]
+        lo_r, lo_c = self._cell(sw_lat, sw_lng)
+        hi_r, hi_c = self._cell(ne_lat, ne_lng)
+        known = self.cell_ranges.keys() | self.cell_extra.keys()
+        if (hi_r - lo_r + 1) * (hi_c - lo_c + 1) <= len(known):
+            cells = [(r, c) for r in range(lo_r, hi_r + 1) for c in range(lo_c, hi_c + 1)]
+        else:
+            cells = [cell for cell in known if lo_r <= cell[0] <= hi_r and lo_c <= cell[1] <= hi_c]
+
+        ranges, extras, exact = [], [], []
+        lats, lngs = self.lats, self.lngs
+        for cell in cells:
+            rng = self.cell_ranges.get(cell)
+            extra = self.cell_extra.get(cell)
+            if cell[0] in (lo_r, hi_r) or cell[1] in (lo_c, hi_c):
+                slots = list(range(*rng)) if rng else []
+                slots += list(extra) if extra else []
+                exact += [s for s in slots if sw_lat <= lats[s] <= ne_lat and sw_lng <= lngs[s] <= ne_lng]
+            else:
+                if rng:
+                    ranges.append(rng)
+                if extra:
+                    extras.append(extra)
+        return Bitmap.union_all([Bitmap.from_ranges(ranges), Bitmap.from_ids(exact)] + extras) & self.alive
+
+    def _selection(self, facet: str, values: list[str]) -> Bitmap:
+        return Bitmap.union_all(
+            self.bitmaps[self.value_ids[(facet, v)]] for v in values if (facet, v) in self.value_ids
+        )
+
+    def _facet_order(self, facet: str) -> list[tuple[int, int]]:
+        """(size, value id) of a facet's values, largest first; cached until the next write."""
+        cached = self._order_cache.get(facet)
+        if cached is None or cached[0] != self._version:
+            order = sorted(
+                ((len(self.bitmaps[vid]), vid) for vid, (f, _) in enumerate(self.value_names) if f == facet),
+                reverse=True,
+            )
+            cached = self._order_cache[facet] = (self._version, order)
+        return cached[1]
+
+    def _top_counts(self, facet: str, within: Bitmap, limit: int) -> list[tuple[int, int]]:
+        # A value can't count more than its size: stop once the next size can't beat the k-th best
+        top: list[tuple[int, int]] = []
+        cache: dict = {}
+        for size, vid in self._facet_order(facet):
+            if len(top) >= limit and size <= top[0][0]:
+                break
+            n = self.bitmaps[vid].and_len(within, cache)
+            if n:
+                if len(top) < limit:
+                    heapq.heappush(top, (n, vid))
+                elif n > top[0][0]:
+                    heapq.heapreplace(top, (n, vid))
+        return sorted(top, reverse=True)
+
+    def _counts(self, facets: list[str], within: Bitmap, limit: int) -> dict[str, list[dict]]:
+        if len(within) <= _COUNT_SCAN_MAX:
+            counted = Counter(chain.from_iterable(map(self.doc_values.__getitem__, within)))
+            per_facet: dict[str, list[tuple[int, int]]] = defaultdict(list)
+            for vid, n in counted.items():
+                per_facet[self.value_names[vid][0]].append((n, vid))
+            ranked = {f: heapq.nlargest(limit, per_facet.get(f, ())) for f in facets}
+        else:
+            ranked = {f: self._top_counts(f, within, limit) for f in facets}
+        return {f: [{"value": self.value_names[vid][1], "count": n} for n, vid in ranked[f]] for f in facets}
+
+    def query(self, bounds: dict | None, filters: dict[str, list[str]],
+              count_limit: int = FACET_COUNT_LIMIT) -> tuple[list[tuple[str, int]], dict[str, list[dict]]]:
+        """(kind, id) of matching places and per-facet value counts.
+
+        Counts for a facet ignore that facet's own selection, so the
+        client can show how many places each alternative value would add.
+        """
+        base = self.bounds_bitmap(bounds) if bounds else self.alive
+        selections = {f: self._selection(f, vals) for f, vals in filters.items() if f in FACETS and vals}
+        result = base
+        for bm in selections.values():
+            result = result & bm
+
+        # Unselected facets all count within the result; each selected one drops its own filter
+        counts = self._counts([f for f in FACETS if f not in selections], result, count_limit)
+        for facet in selections:
+            within = base
+            for other, bm in selections.items():
+                if other != facet:
+                    within = within & bm
+            counts.update(self._counts([facet], within, count_limit))
+        kinds, ids = self.kinds, self.ids
+        return [(KINDS[kinds[slot]], ids[slot]) for slot in result], {f: counts[f] for f in FACETS}
+
+
+# --------------- Loading from dining.db ---------------
+
+
+def _seed_docs(session):
+    for r in session.query(Restaurant.id, Restaurant.lat, Restaurant.lng, Restaurant.price_range,
+                           Restaurant.atmosphere, Restaurant.good_for):
+        yield "restaurant", r.id, r.lat, r.lng, _values("restaurant", r.price_range, r.atmosphere, r.good_for)
+    for c in session.query(Cafe.id, Cafe.lat, Cafe.lng, Cafe.price_range, Cafe.atmosphere, Cafe.good_for):
+        yield "cafe", c.id, c.lat, c.lng, _values("cafe", c.price_range, c.atmosphere, c.good_for)
+    for p in session.query(ParkingLot.id, ParkingLot.lat, ParkingLot.lng):
+        yield "parking", p.id, p.lat, p.lng, _values("parking")
+
+
+_CRAWLED_COLUMNS = (CrawledPlace.id, CrawledPlace.lat, CrawledPlace.lng, CrawledPlace.place_type,
+                    CrawledPlace.price_range, CrawledPlace.atmosphere, CrawledPlace.good_for, CrawledPlace.tags)
+
+
+def _crawled_values(row) -> list[tuple[str, str]]:
+    return _values(crawled_facet_type(row.place_type), row.price_range, row.atmosphere, row.good_for, row.tags)
+
+
+def seed_signature(session) -> tuple:
+    """(table, version) per seed table — write counters kept by triggers.
+
+    Changes on every insert, update and delete, in-place edits included;
+    reading it is one lookup of three rows however large the tables grow.
+    """
+    return tuple(tuple(r) for r in session.query(SeedVersion.table_name, SeedVersion.version).order_by(
+        SeedVersion.table_name
+    ))
+
+
+_index: FacetIndex | None = None
+_index_sig: tuple | None = None
+_watermark = None  # max crawled_place.updated_at applied
+_recent: dict[int, datetime] = {}  # id → updated_at applied, for rows inside the catch-up overlap
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _rebuild(session):
+    global _index, _index_sig, _watermark, _recent
+    started = time.perf_counter()
+    crawled = session.query(*_CRAWLED_COLUMNS, CrawledPlace.updated_at).filter(
+        CrawledPlace.lat.isnot(None), CrawledPlace.lng.isnot(None)
+    ).all()
+    docs = list(_seed_docs(session))
+    docs += [("crawled", r.id, r.lat, r.lng, _crawled_values(r)) for r in crawled]
+    _index = FacetIndex.build(docs)
+    _index_sig = seed_signature(session)
+    _watermark = max((r.updated_at for r in crawled if r.updated_at), default=None)
+    _recent = {}
+    if _watermark is not None:
+        edge = _watermark - _CATCH_UP_OVERLAP
+        _recent = {r.id: r.updated_at for r in crawled if r.updated_at and r.updated_at >= edge}
+    logger.info("[facets] indexed %d places, %d values in %.2fs",
+                len(_index), len(_index.value_names), time.perf_counter() - started)
+
+
+def _catch_up(session) -> bool:
+    """Apply crawled rows written since the watermark; False when a rebuild is needed."""
+    global _watermark, _recent
+    if seed_signature(session) != _index_sig:
+        return False
+    stamps = session.query(CrawledPlace.id, CrawledPlace.updated_at)
+    if _watermark is not None:
+        stamps = stamps.filter(CrawledPlace.updated_at >= _watermark - _CATCH_UP_OVERLAP)
+    # The overlap re-reads rows already applied — after a bulk write, every
+    # row — so only fetch the ones whose stamp changed since
+    changed = [pid for pid, at in stamps if pid not in _recent or _recent[pid] != at]
+    for i in range(0, len(changed), 500):
+        for r in session.query(*_CRAWLED_COLUMNS, CrawledPlace.updated_at).filter(
+            CrawledPlace.id.in_(changed[i:i + 500])
+        ):
+            _index.upsert("crawled", r.id, r.lat, r.lng, _crawled_values(r))
+            _recent[r.id] = r.updated_at
+            if r.updated_at and (_watermark is None or r.updated_at > _watermark):
+                _watermark = r.updated_at
+    if changed and _watermark is not None:
+        edge = _watermark - _CATCH_UP_OVERLAP
+        _recent = {pid: at for pid, at in _recent.items() if at and at >= edge}
+    located = session.query(func.count(CrawledPlace.id)).filter(
+        CrawledPlace.lat.isnot(None), CrawledPlace.lng.isnot(None)
+    ).scalar()
+    return located == _index.kind_counts["crawled"]
+
+
+def _current_index(session) -> FacetIndex:
+    # Called with _index_lock held
+    global _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < _RELOAD_CHECK_SEC:
+        return _index
+    _checked_at = now
+    if _index is None or not _catch_up(session):
+        _rebuild(session)
+    return _index
+
+
+def get_facet_index(session) -> FacetIndex:
+    """This process's index, caught up with writes from any worker.
+
+    The index is updated in place, so query it through query_facets().
+    """
+    with _index_lock:
+        return _current_index(session)
+
+
+def query_facets(session, bounds: dict | None, filters: dict[str, list[str]],
+                 count_limit: int = FACET_COUNT_LIMIT) -> tuple[list[tuple[str, int]], dict[str, list[dict]]]:
+    """FacetIndex.query on this process's index, under the lock that catch-up writes take."""
+    with _index_lock:
+        return _current_index(session).query(bounds, filters, count_limit)
+
+
+def mark_facet_index_stale():
+    """Post-write hook: the next get_facet_index() catches up instead of waiting for the check interval."""
+    global _checked_at
+    _checked_at = 0.0
@@ -2,12 +2,16 @@
 
 import os
 import re
+import math
 import logging
 
-import requests
+from .metrics import traced
 
 logger = logging.getLogger(__name__)
 
+NAVER_GEOCODE_URL = os.getenv("NAVER_GEOCODE_URL", "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode")
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+
 LANDMARK_MAP = {
     "용산구청": {"lat": 37.5324, "lng": 126.9906, "address": "서울특별시 용산구 녹사평대로 150"},
     "이태원": {"lat": 37.5345, "lng": 126.9945, "address": "서울특별시 용산구 이태원동"},
@@ -44,13 +48,16 @@ LANDMARK_MAP = {
     "한강진역": {"lat": 37.5398, "lng": 126.9975, "address": "서울특별시 용산구 한남동"},
 }
 
+_DIGIT_RE = re.compile(r"\d")
+
 
+@traced("geocode.landmark")
 def _lookup_landmark(query: str):
     """Try local landmark map first (only for short landmark queries)."""
     if query in LANDMARK_MAP:
         return LANDMARK_MAP[query]
     # Skip partial match for full addresses (contain digits)
-    if re.search(r"\d", query):
+    if _DIGIT_RE.search(query):
         return None
     for key, val in LANDMARK_MAP.items():
         if query in key or key in query:
@@ -58,6 +65,19 @@ def _lookup_landmark(query: str):
     return None
 
 
+# Longest first, so "이태원역" wins over "이태원" in free text
+_LANDMARKS_BY_LENGTH = sorted(LANDMARK_MAP, key=len, reverse=True)
+
+
+def landmark_in_text(text: str):
+    """First LANDMARK_MAP entry named anywhere in free text — local only, no API call."""
+    for key in _LANDMARKS_BY_LENGTH:
+        if key in text:
+            return LANDMARK_MAP[key]
+    return None
+
+
+@traced("geocode.naver")
 def _naver_geocode(query: str):
     """Naver Cloud Platform Geocoding API."""
     client_id = os.getenv("NEXT_PUBLIC_NAVER_MAP_CLIENT_ID") or os.getenv("NAVER_MAP_CLIENT_ID")
@@ -66,9 +86,11 @@ def _naver_geocode(query: str):
     if not client_id or not client_secret:
         return None
 
+    import requests  # loaded on first use; warmup.py preloads it in the Gunicorn master
+
     try:
         resp = requests.get(
-            "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode",
+            NAVER_GEOCODE_URL,
             params={"query": query},
             headers={
                 "X-NCP-APIGW-API-KEY-ID": client_id,
@@ -92,11 +114,14 @@ def _naver_geocode(query: str):
         return None
 
 
+@traced("geocode.nominatim")
 def _nominatim_geocode(query: str):
     """Nominatim (OpenStreetMap) free geocoder fallback."""
+    import requests
+
     try:
         resp = requests.get(
-            "https://nominatim.openstreetmap.org/search",
+            NOMINATIM_URL,
             params={"q": f"{query} 서울", "format": "json", "limit": "1", "countrycodes": "kr"},
             headers={"User-Agent": "DiningDiscoveryApp/1.0"},
             timeout=10,
@@ -131,3 +156,15 @@ def geocode(query: str):
 
     logger.error("Geocode failed for: %s", query)
     return None
+
+
+def bounds_from_center(lat: float, lng: float, radius_km: float) -> dict:
+    """Calculate lat/lng bounds from a center point and radius."""
+    lat_delta = radius_km / 111.32
+    lng_delta = radius_km / (111.32 * math.cos(math.radians(lat)))
+    return {
+        "swLat": lat - lat_delta,
+        "neLat": lat + lat_delta,
+        "swLng": lng - lng_delta,
+        "neLng": lng + lng_delta,
+    }
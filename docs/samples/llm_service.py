@@ -4,7 +4,15 @@ import json
 import math
 import logging
 
-from .openrouter_client import MODEL, chat_completion, extract_json
+from .metrics import traced
+from .openrouter_client import (
+    FLASH_MODEL,
+    MODEL,
+    REQUEST_TIMEOUT_SEC,
+    LLMBudgetExceeded,
+    chat_completion,
+    extract_json,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +53,11 @@ def _compress_place(place: dict, index: int, anchor: dict | None = None) -> str:
             f"★{place.get('rating', 0)}|주차{'O' if place.get('parkingAvailable') else 'X'}{dist_str}"
         )
     # parking
+    cost_str = ""
+    if place.get("estimatedCost") is not None:
+        cost_str = f"|예상{place['estimatedCost']}원({place['stayMinutes']}분)"
     return (
-        f"{pid}|{place['name']}|{place.get('parkingType', '')}|{place.get('hourlyRate', 0)}원/시|"
+        f"{pid}|{place['name']}|{place.get('parkingType', '')}|{place.get('hourlyRate', 0)}원/시{cost_str}|"
         f"{place.get('capacity', 0)}대|{place.get('operatingHours', '')}{dist_str}"
     )
 
@@ -93,6 +104,7 @@ def _build_system_prompt(anchor: dict | None = None) -> str:
 - 각 코스의 기본 구성: 맛집 1개 + 카페/디저트 1개
 - 디저트 전문점, 테이크아웃, 베이커리 등이 있으면 추가 stop으로 넣어도 됨
 - 차로 이동하는 경우("차대고", "주차") 각 코스에 주차장 1개를 첫 번째로 배치 (같은 주차장 공유 가능)
+- 주차장의 "예상N원(M분)"은 M분 주차 시 예상 요금 — 요금이 싸고 가까운 주차장을 우선
 - 각 코스는 서로 다른 특색 (예: 고기코스, 해산물코스, 이탈리안코스 등)
 - title은 핵심 장소명 조합 (예: "육몽 + 콩카페", "바토스 + 오띠젤리")
 - 같은 카페가 다른 맛집과 조합되어도 OK
@@ -117,7 +129,8 @@ summary는 사용자에게 직접 보여주는 메인 텍스트입니다:
 - 조건에 맞는 장소가 부족하면 가장 가까운 대안을 추천하되, 이유에 "대안" 명시"""
 
 
-def extract_location(query: str) -> dict:
+@traced("llm.extract_location")
+def extract_location(query: str, timeout: float = REQUEST_TIMEOUT_SEC) -> dict:
     """Extract location name from natural language query.
 
     Returns: {"location": str|None, "error": str|None}
@@ -144,6 +157,9 @@ def extract_location(query: str) -> dict:
             ],
             temperature=0,
             max_tokens=2000,
+            call_site="extract_location",
+            fallback_model=FLASH_MODEL,
+            timeout=timeout,
         )
         if not content:
             return {"location": None}
@@ -156,7 +172,65 @@ def extract_location(query: str) -> dict:
         return {"location": None, "error": str(e)}
 
 
-def get_recommendations(query: str, places: list[dict], anchor: dict | None = None) -> dict:
+PARKING_SYSTEM_PROMPT = """당신은 서울시 공영주차장 정보를 정확하게 제공하는 전문가입니다.
+반드시 JSON 배열로만 응답하세요. 다른 텍스트 없이 JSON만 응답하세요.
+
+[
+  {
+    "name": "주차장 이름",
+    "address": "서울특별시 OO구 OO로 123",
+    "lat": 37.xxxx,
+    "lng": 126.xxxx 또는 127.xxxx,
+    "capacity": 주차면수(숫자, 모르면 50),
+    "hourlyRate": 시간당요금(원, 숫자, 모르면 1000),
+    "operatingHours": "HH:MM~HH:MM",
+    "type": "공영" 또는 "노상" 또는 "노외"
+  }
+]
+
+규칙:
+- 해당 지역의 공영주차장, 공공주차장을 최대한 많이 알려주세요
+- 구청 주차장, 공원 주차장, 주민센터 주차장, 체육관 주차장, 역 근처 공영주차장 등 포함
+- address는 도로명주소 "서울특별시 OO구 OO로 123" 형식
+- lat, lng는 실제 위치의 정확한 좌표 (소수점 4자리)
+- 서울 위도 범위: 37.45~37.70, 경도 범위: 126.76~127.18
+- 반경 1km 이내에 있는 주차장을 우선적으로 알려주세요"""
+
+
+@traced("llm.parking")
+def fetch_parking_by_keyword(keyword: str) -> list[dict]:
+    """Ask the LLM for public parking lots near a keyword (crawl route)."""
+    try:
+        content = chat_completion(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": PARKING_SYSTEM_PROMPT},
+                {"role": "user", "content": f'"{keyword}" 근방 1km 이내에 있는 공영주차장 목록을 모두 알려주세요.'},
+            ],
+            temperature=0,
+            max_tokens=8000,
+            call_site="parking",
+            fallback_model=FLASH_MODEL,
+        )
+        if not content:
+            return []
+        parsed = json.loads(extract_json(content))
+        # Validate coordinates
+        return [
+            p for p in parsed
+            if p.get("name")
+            and 37.45 <= (p.get("lat") or 0) <= 37.7
+            and 126.76 <= (p.get("lng") or 0) <= 127.18
+        ]
+    except Exception as e:
+        logger.error("[crawl] parking LLM error: %s", e)
+        return []
+
+
+@traced("llm.recommendations")
+def get_recommendations(
+    query: str, places: list[dict], anchor: dict | None = None, timeout: float = REQUEST_TIMEOUT_SEC
+) -> dict:
     """Get course-based recommendations from LLM.
 
     Returns: {"summary": str, "persona": str, "courses": list, "warning": str?}
@@ -181,6 +255,9 @@ def get_recommendations(query: str, places: list[dict], anchor: dict | None = No
             ],
             temperature=0.5,
             max_tokens=16000,
+            call_site="recommendations",
+            fallback_model=FLASH_MODEL,
+            timeout=timeout,
         )
         if not content:
             raise ValueError("No response from LLM")
@@ -210,23 +287,36 @@ def get_recommendations(query: str, places: list[dict], anchor: dict | None = No
         return {
             "summary": parsed.get("summary", ""),
             "persona": parsed.get("persona", ""),
-            "courses": courses,
+            "courses": _optimize_routes(courses, places, anchor),
         }
     except Exception as e:
         logger.error("LLM error, falling back to keyword search: %s", e)
         err_msg = str(e)
-        if "401" in err_msg or "403" in err_msg or "API key" in err_msg:
+        if isinstance(e, LLMBudgetExceeded):
+            warning = "AI 추천 요청이 많아 잠시 키워드 기반 검색 결과를 대신 표시합니다."
+        elif "401" in err_msg or "403" in err_msg or "API key" in err_msg:
             warning = "AI 추천 서비스에 연결할 수 없습니다 (API 키 오류). 키워드 기반 검색 결과를 대신 표시합니다."
         elif "404" in err_msg or "No allowed providers" in err_msg:
             warning = "AI 모델에 연결할 수 없습니다 (모델 설정 오류). 키워드 기반 검색 결과를 대신 표시합니다."
         else:
             warning = "AI 추천 서비스에 일시적 오류가 발생했습니다. 키워드 기반 검색 결과를 대신 표시합니다."
-        result = _keyword_fallback(query, places)
+        result = keyword_fallback(query, places, anchor)
         result["warning"] = warning
         return result
 
 
-def _keyword_fallback(query: str, places: list[dict]) -> dict:
+def _optimize_routes(courses: list[dict], places: list[dict], anchor: dict | None) -> list[dict]:
+    """Stop order and walking times from coordinates rather than the LLM's guess."""
+    from .route_optimizer import optimize_courses  # imports calc_distance_m from here
+
+    try:
+        return optimize_courses(courses, places, anchor)
+    except Exception as e:
+        logger.error("Route optimization failed, keeping LLM order: %s", e)
+        return courses
+
+
+def keyword_fallback(query: str, places: list[dict], anchor: dict | None = None) -> dict:
     """Simple keyword-based fallback when LLM is unavailable."""
     keywords = query.lower().split()
 
@@ -289,5 +379,5 @@ def _keyword_fallback(query: str, places: list[dict]) -> dict:
     return {
         "summary": f'"{query}" 검색 결과입니다. {", ".join(all_names)} 등을 조합한 코스를 추천드려요!',
         "persona": query,
-        "courses": courses,
+        "courses": _optimize_routes(courses, places, anchor),
     }
@@ -0,0 +1,213 @@
+"""Menu ingestion — DiningCode profile pages → Menu rows linked to crawled places.
+
+Profile links come from place_source.source_url. Pages are fetched on a
+thread pool with a per-host concurrency cap and minimum request spacing,
+parsed off the response, and upserted in batches against uq_menu
+(crawled_place_id, menu_name, source).
+
+    python -m docs.samples.menu_ingest [--all] [--limit N]
+"""
+
+import os
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .agents.diningcode import _fetch_html, parse_profile_menus, profile_url
+from .metrics import counter, span, traced
+from .models import (
+    CrawledPlace,
+    Menu,
+    PlaceSource,
+    dining_write_lock,
+    get_dining_read_session,
+    get_dining_session,
+    init_dining_db,
+)
+
+logger = logging.getLogger(__name__)
+
+MENU_CONCURRENCY = int(os.getenv("DINING_MENU_CONCURRENCY", "8"))
+MENU_PER_HOST = int(os.getenv("DINING_MENU_PER_HOST", "2"))
+MENU_HOST_DELAY_MS = float(os.getenv("DINING_MENU_HOST_DELAY_MS", "500"))
+MENU_BATCH_SIZE = int(os.getenv("DINING_MENU_BATCH_SIZE", "50"))  # places per write transaction
+
+MENU_PAGES = counter("dining_menu_pages_total", "Profile pages fetched for menus by outcome")
+
+
+class HostLimiter:
+    """Per-host politeness: at most ``per_host`` requests in flight, ``delay_ms`` apart."""
+
+    def __init__(self, per_host: int = MENU_PER_HOST, delay_ms: float = MENU_HOST_DELAY_MS):
+        self.per_host = max(1, per_host)
+        self.delay = delay_ms / 1000
+        self._lock = threading.Lock()
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_at: dict[str, float] = {}
+
+    def fetch(self, url: str) -> str:
+        host = urlparse(url).netloc
+        with self._lock:
+            sem = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with sem:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_at.get(host, now))
+                self._next_at[host] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            return _fetch_html(url)
+
+
+def iter_menu_targets(session, only_missing: bool = True, limit: int | None = None):
+    """(crawled_place_id, name, source_url) for places with a DiningCode profile link."""
+    query = (
+        session.query(CrawledPlace.id, CrawledPlace.name, PlaceSource.source_url)
+        .join(PlaceSource, PlaceSource.crawled_place_id == CrawledPlace.id)
+        .filter(
+            PlaceSource.source == "diningcode",
+            PlaceSource.source_url.isnot(None),
+            or_(CrawledPlace.category.is_(None), ~CrawledPlace.category.contains("주차")),
+        )
+        .order_by(CrawledPlace.id)
+    )
+    if only_missing:
+        has_menu = session.query(Menu.id).filter(Menu.crawled_place_id == CrawledPlace.id).exists()
+        query = query.filter(~has_menu)
+    if limit:
+        query = query.limit(limit)
+    return query.yield_per(500)
+
+
+def upsert_menus(session, parsed: list[tuple[int, str, list[dict], str | None]]) -> int:
+    """Bulk upsert one batch of (place_id, name, menus, tags); returns menu rows written."""
+    now = datetime.now(timezone.utc)
+    rows = {}
+    for place_id, name, menus, _ in parsed:
+        for m in menus:
+            # uq_menu is (crawled_place_id, menu_name, source); a repeated name keeps the first price
+            rows.setdefault((place_id, m["menuName"]), {
+                "place_name": name,
+                "crawled_place_id": place_id,
+                "menu_name": m["menuName"],
+                "price": m["price"],
+                "source": "diningcode",
+                "crawled_at": now,
+            })
+    tags = [{"id": place_id, "tags": t} for place_id, _, _, t in parsed if t]
+    if not rows and not tags:
+        return 0
+
+    with dining_write_lock():
+        try:
+            if rows:
+                stmt = sqlite_insert(Menu).values(list(rows.values()))
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=["crawled_place_id", "menu_name", "source"],
+                    set_={
+                        "place_name": stmt.excluded.place_name,
+                        "price": stmt.excluded.price,
+                        "crawled_at": stmt.excluded.crawled_at,
+                    },
+                ))
+            if tags:
+                session.bulk_update_mappings(CrawledPlace, tags)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    return len(rows)
+
+
+@traced("menu_ingest")
+def ingest_menus(
+    only_missing: bool = True,
+    limit: int | None = None,
+    concurrency: int = MENU_CONCURRENCY,
+    limiter: HostLimiter | None = None,
+) -> dict:
+    """Fetch, parse and store menus for every crawled place with a profile link."""
+    read_session = get_dining_read_session()
+    try:
+        targets = list(iter_menu_targets(read_session, only_missing, limit))
+    finally:
+        read_session.remove()
+
+    limiter = limiter or HostLimiter()
+    stats = {"places": len(targets), "withMenus": 0, "empty": 0, "failed": 0, "menus": 0}
+
+    def work(target):
+        place_id, name, source_url = target
+        html = limiter.fetch(profile_url(source_url))
+        menus, tags = parse_profile_menus(html)
+        return place_id, name, menus, tags
+
+    session = get_dining_session()
+    started = time.perf_counter()
+    batch: list = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(work, t): t for t in targets}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning("[menu] %s: %s", futures[future][1], e)
+                    stats["failed"] += 1
+                    MENU_PAGES.inc(outcome="error")
+                    continue
+                if not result[2]:
+                    stats["empty"] += 1
+                    MENU_PAGES.inc(outcome="empty")
+                    continue
+                stats["withMenus"] += 1
+                MENU_PAGES.inc(outcome="ok")
+                batch.append(result)
+                if len(batch) >= MENU_BATCH_SIZE:
+                    with span("menu_ingest.upsert", places=len(batch)):
+                        stats["menus"] += upsert_menus(session, batch)
+                    batch = []
+        if batch:
+            with span("menu_ingest.upsert", places=len(batch)):
+                stats["menus"] += upsert_menus(session, batch)
+    finally:
+        session.remove()
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["pagesPerSec"] = round(len(targets) / elapsed, 2) if elapsed else None
+    logger.info("[menu] %s", stats)
+    return stats
+
+
+def find_menus(session, place_id: int | None = None, place_name: str | None = None) -> list[dict]:
+    """Menus of a crawled place by id (indexed), or of a seed place by name."""
+    query = session.query(Menu.menu_name, Menu.price)
+    if place_id is not None:
+        query = query.filter(Menu.crawled_place_id == place_id)
+    else:
+        query = query.filter(Menu.place_name == place_name)
+    return [{"menuName": name, "price": price} for name, price in query]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest DiningCode menus for crawled places")
+    parser.add_argument("--all", action="store_true", help="re-fetch places that already have menus")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--concurrency", type=int, default=MENU_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_dining_db()
+    print(ingest_menus(only_missing=not args.all, limit=args.limit, concurrency=args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
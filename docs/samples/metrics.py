@@ -0,0 +1,273 @@
+"""Lightweight in-process metrics and per-request stage tracing.
+
+Histograms and counters are always on (a perf_counter pair and a bisect per
+stage). Span trees are only kept for sampled requests — a fraction set by
+DINING_TRACE_SAMPLE_RATE, plus any request slower than DINING_TRACE_SLOW_MS
+when that is set — and are served from a ring buffer. Both are off by
+default. Nothing here talks to an external service; /dining/api/metrics
+renders Prometheus text. Traces also start and finish the request's
+sampling profile (profiler.py).
+
+Everything is per process. Under Gunicorn each scrape is answered by
+whichever worker takes it, so every series carries a worker="<pid>" label
+and starts from zero in each forked worker: sum by the other labels
+(sum without (worker) ...) for service-wide rates and ratios, and expect a
+worker's series to end when it is recycled.
+"""
+
+import os
+import random
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from itertools import count
+
+from .profiler import finish_profile, start_profile
+
+TRACE_SAMPLE_RATE = float(os.getenv("DINING_TRACE_SAMPLE_RATE", "0"))
+TRACE_SLOW_MS = float(os.getenv("DINING_TRACE_SLOW_MS", "0"))  # 0 = off; see start_trace
+TRACE_BUFFER_SIZE = int(os.getenv("DINING_TRACE_BUFFER_SIZE", "200"))
+
+# seconds; covers a 1ms regex pass up to a 60s Pro-model call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(labels: tuple) -> str:
+    labels = (("worker", os.getpid()),) + labels  # series are per process, see the module docstring
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help = name, help_text
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_label_str(k)} {v:g}" for k, v in items]
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name, self.help, self.buckets = name, help_text, buckets
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            s[idx] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(k, list(v)) for k, v in self._series.items()]
+        for key, s in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), s):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_label_str(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(key)} {s[-2]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(key)} {s[-1]}")
+        return lines
+
+
+_registry: list = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def counter(name: str, help_text: str) -> Counter:
+    return _register(Counter(name, help_text))
+
+
+def gauge(name: str, help_text: str) -> Gauge:
+    return _register(Gauge(name, help_text))
+
+
+def histogram(name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, buckets))
+
+
+def render_prometheus() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for m in metrics:
+        lines += m.render()
+    return "\n".join(lines) + "\n"
+
+
+def _reset_after_fork():
+    # A forked worker starts its own series: values copied from the parent
+    # would be reported again under every worker's pid. Locks may have been
+    # held at fork time.
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for m in _registry:
+        m._lock = threading.Lock()
+        if isinstance(m, Histogram):
+            m._series = {}
+        else:
+            m._values = {}
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+STAGE_SECONDS = histogram("dining_stage_seconds", "Latency of pipeline stages")
+STAGE_ERRORS = counter("dining_stage_errors_total", "Pipeline stages that raised")
+REQUEST_SECONDS = histogram("dining_request_seconds", "End-to-end request latency by endpoint")
+
+
+# --------------- Tracing ---------------
+
+
+class _Trace:
+    __slots__ = ("trace_id", "endpoint", "head_sampled", "sampled", "started", "spans", "_span_ids", "profile")
+
+    def __init__(self, endpoint: str, head_sampled: bool, sampled: bool):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.endpoint = endpoint
+        self.head_sampled = head_sampled
+        self.sampled = sampled  # collect spans
+        self.started = time.perf_counter()
+        self.spans: list[dict] = []
+        # Search stages open spans from pool threads: next() on a count is atomic
+        self._span_ids = count()
+        self.profile = start_profile(endpoint)
+
+
+_current: ContextVar["_Trace | None"] = ContextVar("dining_trace", default=None)
+# Innermost open span. A context variable rather than a stack on the trace:
+# a task run in a copied context (search stages) keeps the parent it was
+# started under, whatever other stages open meanwhile
+_current_span: ContextVar["int | None"] = ContextVar("dining_span", default=None)
+_recent_traces: deque = deque(maxlen=TRACE_BUFFER_SIZE)
+
+
+def start_trace(endpoint: str):
+    """Begin a request trace; returns a token for finish_trace."""
+    head = TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+    # With a slow threshold (opt-in), spans are collected for every request so
+    # a slow one can still be kept once its duration is known
+    return _current.set(_Trace(endpoint, head, head or TRACE_SLOW_MS > 0))
+
+
+def finish_trace(token, status: int | None = None) -> dict | None:
+    """End the current trace, record request latency and keep the span tree if sampled or slow."""
+    trace = _current.get()
+    _current.reset(token)
+    if trace is None:
+        return None
+    elapsed = time.perf_counter() - trace.started
+    REQUEST_SECONDS.observe(elapsed, endpoint=trace.endpoint)
+    profiled = finish_profile(trace.profile, elapsed)
+    keep = trace.head_sampled or (TRACE_SLOW_MS > 0 and elapsed * 1000 >= TRACE_SLOW_MS)
+    if not keep:
+        return None
+    record = {
+        "traceId": trace.trace_id,
+        "endpoint": trace.endpoint,
+        "status": status,
+        "durationMs": round(elapsed * 1000, 2),
+        "spans": trace.spans,
+    }
+    if profiled:
+        record["profiled"] = True
+    _recent_traces.append(record)
+    return record
+
+
+def current_trace_id() -> str | None:
+    trace = _current.get()
+    return trace.trace_id if trace else None
+
+
+def recent_traces(limit: int = 50) -> list[dict]:
+    return list(_recent_traces)[-limit:]
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Time a pipeline stage: always feeds the histogram, adds a span when tracing."""
+    trace = _current.get()
+    record = span_token = None
+    if trace is not None and trace.sampled:
+        record = {"id": next(trace._span_ids), "parent": _current_span.get(),
+                  "stage": stage, "startMs": round((time.perf_counter() - trace.started) * 1000, 2)}
+        if attrs:
+            record["attrs"] = attrs
+        trace.spans.append(record)
+        span_token = _current_span.set(record["id"])
+    t0 = time.perf_counter()
+    try:
+        yield record
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        if record is not None:
+            record["error"] = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if record is not None:
+            record["durationMs"] = round(elapsed * 1000, 2)
+            _current_span.reset(span_token)
+
+
+def traced(stage: str):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,290 @@
+"""Prisma dev.db → dining.db migration (cuid → integer IDs, camelCase → snake_case).
+
+Rows are streamed in rowid order, CHUNK_SIZE at a time, and written with
+executemany. Each chunk commits together with its progress marker, so a
+crashed run resumes at the next unwritten chunk. The new integer ID of a
+row is its rowid in dev.db, which keeps the cuid → int mapping deterministic
+across restarts; the map is held in memory to rewrite place_source and menu
+foreign keys. Secondary indexes are dropped for the load and rebuilt at the
+end, followed by row-count and checksum verification.
+
+    python -m docs.samples.migrate_prisma --source dev.db [--target dining.db]
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.schema import CreateIndex
+
+from . import models
+from .models import DiningBase, dining_write_lock, init_dining_db
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = int(os.getenv("DINING_MIGRATE_CHUNK_SIZE", "5000"))
+
+# Load order follows the foreign keys: place_source and menu reference crawled_place
+TABLES = (
+    ("Restaurant", "restaurant"),
+    ("Cafe", "cafe"),
+    ("ParkingLot", "parking_lot"),
+    ("CrawledPlace", "crawled_place"),
+    ("PlaceSource", "place_source"),
+    ("Menu", "menu"),
+)
+
+_PROGRESS_DDL = """
+CREATE TABLE IF NOT EXISTS _prisma_migration (
+    source_table TEXT PRIMARY KEY,
+    last_rowid INTEGER NOT NULL DEFAULT 0,
+    rows INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def _to_datetime(value) -> str | None:
+    """Prisma DateTime (ISO text or epoch ms) → SQLAlchemy's naive-UTC text format."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        dt = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    else:
+        dt = datetime.fromisoformat(re.sub(r"Z$", "+00:00", value))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(tzinfo=None).isoformat(sep=" ", timespec="microseconds")
+
+
+class _TablePlan:
+    """Column mapping for one Prisma table → SQLAlchemy table."""
+
+    def __init__(self, src: sqlite3.Connection, source_table: str, target_table: str):
+        self.source_table = source_table
+        self.table = DiningBase.metadata.tables[target_table]
+        source_cols = {row[1] for row in src.execute(f'PRAGMA table_info("{source_table}")')}
+
+        self.target_cols = [c.name for c in self.table.columns if c.name != "id"]
+        self.select_cols = []
+        self.converters = []
+        for col in self.table.columns:
+            if col.name == "id":
+                continue
+            camel = _camel(col.name)
+            self.select_cols.append(camel if camel in source_cols else None)
+            self.converters.append(_to_datetime if isinstance(col.type, DateTime) else None)
+
+        select = ", ".join(f'"{c}"' if c else "NULL" for c in self.select_cols)
+        self.select_sql = (
+            f'SELECT rowid, id, {select} FROM "{source_table}" WHERE rowid > ? ORDER BY rowid LIMIT ?'
+        )
+        cols = ", ".join(["id", *self.target_cols])
+        marks = ", ".join("?" * (len(self.target_cols) + 1))
+        self.insert_sql = f"INSERT INTO {target_table} ({cols}) VALUES ({marks})"
+
+    def convert(self, row: tuple, id_map: dict, name_map: dict) -> tuple | None:
+        """Source row → target row, or None when its parent place is missing."""
+        rowid, _cuid, *values = row
+        out = [rowid]
+        for value, conv in zip(values, self.converters):
+            if conv is not None:
+                value = conv(value)
+            out.append(value)
+        if self.table.name == "place_source":
+            fk = self.target_cols.index("crawled_place_id") + 1
+            out[fk] = id_map.get(out[fk])
+            if out[fk] is None:
+                return None
+        elif self.table.name == "menu":
+            # dev.db menus only know the place name; link it when the name is unambiguous
+            fk = self.target_cols.index("crawled_place_id") + 1
+            out[fk] = name_map.get(out[self.target_cols.index("place_name") + 1])
+        return tuple(out)
+
+
+def _load_id_maps(src: sqlite3.Connection) -> tuple[dict[str, int], dict[str, int]]:
+    id_map: dict[str, int] = {}
+    names: dict[str, int | None] = {}
+    for rowid, cuid, name in src.execute('SELECT rowid, id, name FROM "CrawledPlace"'):
+        id_map[cuid] = rowid
+        names[name] = None if name in names else rowid
+    return id_map, {n: i for n, i in names.items() if i is not None}
+
+
+def _drop_indexes(conn: sqlite3.Connection):
+    for _, target in TABLES:
+        for index in DiningBase.metadata.tables[target].indexes:
+            conn.execute(f"DROP INDEX IF EXISTS {index.name}")
+
+
+def _rebuild_indexes(conn: sqlite3.Connection):
+    # conn is the writer engine's only pooled connection, so no index.create(engine) here
+    dialect = models._get_engine().dialect
+    for _, target in TABLES:
+        for index in DiningBase.metadata.tables[target].indexes:
+            conn.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)))
+
+
+def migrate_table(src, dst, plan: _TablePlan, id_map, name_map, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Copy one table in rowid-ordered chunks, resuming after the last committed one."""
+    dst.execute("INSERT OR IGNORE INTO _prisma_migration (source_table) VALUES (?)", (plan.source_table,))
+    last_rowid, done = dst.execute(
+        "SELECT last_rowid, done FROM _prisma_migration WHERE source_table = ?", (plan.source_table,)
+    ).fetchone()
+    if done:
+        return {"rows": 0, "skipped": 0, "seconds": 0.0, "resumed": True}
+
+    written = skipped = 0
+    started = time.perf_counter()
+    while True:
+        chunk = src.execute(plan.select_sql, (last_rowid, chunk_size)).fetchall()
+        if not chunk:
+            break
+        rows = [r for r in (plan.convert(row, id_map, name_map) for row in chunk) if r is not None]
+        last_rowid = chunk[-1][0]
+        dst.execute("BEGIN IMMEDIATE")
+        try:
+            dst.executemany(plan.insert_sql, rows)
+            dst.execute(
+                "UPDATE _prisma_migration SET last_rowid = ?, rows = rows + ?, skipped = skipped + ? "
+                "WHERE source_table = ?",
+                (last_rowid, len(rows), len(chunk) - len(rows), plan.source_table),
+            )
+            dst.execute("COMMIT")
+        except Exception:
+            dst.execute("ROLLBACK")
+            raise
+        written += len(rows)
+        skipped += len(chunk) - len(rows)
+
+    dst.execute("UPDATE _prisma_migration SET done = 1 WHERE source_table = ?", (plan.source_table,))
+    return {"rows": written, "skipped": skipped, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def _checksum(rows) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def verify_table(src, dst, plan: _TablePlan, id_map, name_map) -> dict:
+    """Compare the converted source rows with the target rows: count and SHA-256."""
+    def source_rows():
+        after = 0
+        while True:
+            chunk = src.execute(plan.select_sql, (after, CHUNK_SIZE)).fetchall()
+            if not chunk:
+                return
+            after = chunk[-1][0]
+            for row in chunk:
+                converted = plan.convert(row, id_map, name_map)
+                if converted is not None:
+                    yield converted
+
+    cols = ", ".join(["id", *plan.target_cols])
+    target_rows = dst.execute(f"SELECT {cols} FROM {plan.table.name} ORDER BY id")
+    expected = sum(1 for _ in source_rows())
+    actual = dst.execute(f"SELECT COUNT(*) FROM {plan.table.name}").fetchone()[0]
+    src_sum, dst_sum = _checksum(source_rows()), _checksum(target_rows)
+    return {
+        "expected": expected,
+        "actual": actual,
+        "checksumOk": src_sum == dst_sum,
+        "ok": expected == actual and src_sum == dst_sum,
+    }
+
+
+def migrate(source_path: str, chunk_size: int = CHUNK_SIZE, verify: bool = True) -> dict:
+    """Migrate every Prisma table into dining.db; safe to re-run after a crash."""
+    init_dining_db()
+    src = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    dst = models._get_engine().raw_connection()
+    report: dict = {"tables": {}}
+    try:
+        with dining_write_lock():
+            dst.execute(_PROGRESS_DDL)
+            _drop_indexes(dst)
+
+            id_map, name_map = _load_id_maps(src)
+            plans = [_TablePlan(src, s, t) for s, t in TABLES]
+            started = time.perf_counter()
+            total = 0
+            for plan in plans:
+                stats = migrate_table(src, dst, plan, id_map, name_map, chunk_size)
+                total += stats["rows"]
+                if stats["seconds"]:
+                    stats["rowsPerSec"] = round(stats["rows"] / stats["seconds"])
+                report["tables"][plan.table.name] = stats
+                logger.info("[migrate] %s: %s", plan.table.name, stats)
+            load_seconds = time.perf_counter() - started
+
+            t0 = time.perf_counter()
+            _rebuild_indexes(dst)
+            report["indexSeconds"] = round(time.perf_counter() - t0, 3)
+            report["rows"] = total
+            report["loadSeconds"] = round(load_seconds, 3)
+            report["rowsPerSec"] = round(total / load_seconds) if load_seconds else None
+
+        if verify:
+            report["verify"] = {p.table.name: verify_table(src, dst, p, id_map, name_map) for p in plans}
+            report["ok"] = all(v["ok"] for v in report["verify"].values())
+    finally:
+        dst.close()
+        src.close()
+
+    # Derived data: DiningCode scores, cluster grid aggregates, nearest parking and the shared snapshot
+    from .parking_index import rebuild_nearby_parking
+    from .place_cache import notify_places_changed
+    from .place_cluster import rebuild_place_grid
+
+    session = models.get_dining_session()
+    try:
+        with dining_write_lock():
+            models._backfill_dc_scores(models._get_engine())
+            rebuild_place_grid(session)
+            rebuild_nearby_parking(session)
+    finally:
+        session.remove()
+    notify_places_changed()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate Prisma dev.db into dining.db")
+    parser.add_argument("--source", default="dev.db", help="Prisma SQLite file")
+    parser.add_argument("--target", help="dining.db path (default: DINING_DB_PATH)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--no-verify", action="store_true")
+    args = parser.parse_args()
+
+    if args.target:
+        os.environ["DINING_DB_PATH"] = args.target
+    logging.basicConfig(level=logging.INFO)
+    report = migrate(args.source, args.chunk_size, verify=not args.no_verify)
+    for name, stats in report["tables"].items():
+        check = report.get("verify", {}).get(name)
+        print(f"{name:>14} {stats['rows']:>9} rows  {stats.get('rowsPerSec', '-'):>8} rows/s"
+              + (f"  skipped {stats['skipped']}" if stats["skipped"] else "")
+              + (f"  verify {'ok' if check['ok'] else 'FAILED'}" if check else ""))
+    print(f"total {report['rows']} rows in {report['loadSeconds']}s ({report['rowsPerSec']} rows/s), "
+          f"indexes {report['indexSeconds']}s")
+    if report.get("ok") is False:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
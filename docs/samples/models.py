@@ -1,6 +1,9 @@
 """Dining SQLAlchemy models — separate dining.db binding."""
 
 import os
+import threading
+import fcntl
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 from sqlalchemy import (
@@ -14,6 +17,9 @@ from sqlalchemy import (
     Boolean,
     UniqueConstraint,
     create_engine,
+    event,
+    inspect,
+    text,
 )
 from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
 
@@ -23,24 +29,104 @@ DiningBase = declarative_base()
 
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 _DINING_DB_PATH = os.path.join(_PROJECT_ROOT, "dining.db")
+
+# SQLite tuning — override per deployment via env
+MMAP_SIZE = int(os.getenv("DINING_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE = int(os.getenv("DINING_DB_CACHE_SIZE", "-65536"))  # negative = KiB
+BUSY_TIMEOUT_MS = int(os.getenv("DINING_DB_BUSY_TIMEOUT_MS", "5000"))
+READ_POOL_SIZE = int(os.getenv("DINING_DB_READ_POOL_SIZE", "8"))
+
 _engine = None
+_read_engine = None
 _SessionFactory = None
+_ReadSessionFactory = None
+
+
+def _get_db_path() -> str:
+    return os.getenv("DINING_DB_PATH", _DINING_DB_PATH)
+
+
+def _apply_pragmas(dbapi_conn, readonly: bool):
+    cur = dbapi_conn.cursor()
+    if not readonly:
+        # journal_mode is persistent in the file; only the writer sets it
+        cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cur.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    cur.execute(f"PRAGMA cache_size={CACHE_SIZE}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA foreign_keys=ON")
+    if readonly:
+        cur.execute("PRAGMA query_only=ON")
+    cur.close()
+
+
+def _create_engine(readonly: bool):
+    engine = create_engine(
+        f"sqlite:///{_get_db_path()}",
+        connect_args={
+            "check_same_thread": False,
+            "timeout": BUSY_TIMEOUT_MS / 1000,
+            # Let SQLAlchemy emit BEGIN itself (see _on_begin)
+            "isolation_level": None,
+        },
+        pool_pre_ping=True,
+        # One connection per process for the writer, a small pool for readers
+        pool_size=READ_POOL_SIZE if readonly else 1,
+        max_overflow=0,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        _apply_pragmas(dbapi_conn, readonly)
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        # Writers take the RESERVED lock up front so a read→write upgrade
+        # can never deadlock against another writer (SQLITE_BUSY mid-txn).
+        conn.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    if not readonly:
+        # The writer's single connection is only handed out under the write
+        # lock: a thread that touches the write session without taking
+        # dining_write_lock() first then queues on the lock instead of
+        # holding the connection while another thread waits for it.
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(_dbapi_conn, record, _proxy):
+            record.record_info["write_lock"] = _acquire_write_lock()
+
+        @event.listens_for(engine, "checkin")
+        def _on_checkin(_dbapi_conn, record):
+            state = record.record_info.pop("write_lock", None)
+            if state is not None:
+                _release_write_lock(state)
+
+    return engine
 
 
 def _get_engine():
+    """Return the write engine (WAL, single connection per process)."""
     global _engine
     if _engine is None:
-        db_path = os.getenv("DINING_DB_PATH", _DINING_DB_PATH)
-        _engine = create_engine(
-            f"sqlite:///{db_path}",
-            connect_args={"check_same_thread": False},
-            pool_pre_ping=True,
-        )
+        _engine = _create_engine(readonly=False)
     return _engine
 
 
+def _get_read_engine():
+    """Return the read-only engine; readers never block behind the writer in WAL."""
+    global _read_engine
+    if _read_engine is None:
+        if _write_lock.owner != threading.get_ident():
+            # Make sure the file is in WAL mode first (a thread holding the
+            # writer's connection has already set it, and would wait on itself)
+            _get_engine().connect().close()
+        _read_engine = _create_engine(readonly=True)
+    return _read_engine
+
+
 def get_dining_session():
-    """Return a scoped session for dining.db."""
+    """Return a scoped session for dining.db (write engine)."""
     global _SessionFactory
     if _SessionFactory is None:
         engine = _get_engine()
@@ -48,10 +134,192 @@ def get_dining_session():
     return _SessionFactory
 
 
+def get_dining_read_session():
+    """Return a scoped read-only session for dining.db."""
+    global _ReadSessionFactory
+    if _ReadSessionFactory is None:
+        engine = _get_read_engine()
+        _ReadSessionFactory = scoped_session(sessionmaker(bind=engine, autoflush=False))
+    return _ReadSessionFactory
+
+
+def dispose_engines():
+    """Close pooled connections and forget the engines; the next session call rebuilds them.
+
+    Call in the Gunicorn master before forking (see warmup.py) so no SQLite
+    connection is inherited by the workers.
+    """
+    global _engine, _read_engine, _SessionFactory, _ReadSessionFactory
+    for factory in (_SessionFactory, _ReadSessionFactory):
+        if factory is not None:
+            factory.remove()
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose()
+    _engine = _read_engine = None
+    _SessionFactory = _ReadSessionFactory = None
+
+
+class _WriteLockState:
+    """Thread mutex + flock, re-entrant for the thread that holds them."""
+
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.owner: int | None = None
+        self.depth = 0
+        self.fh = None
+
+
+_write_lock = _WriteLockState()
+
+
+def _reset_after_fork():
+    # A forked child must not touch the parent's pooled connections: drop them
+    # without closing (close=False) and rebuild lazily. The write lock may have
+    # been held by another thread at fork time.
+    global _engine, _read_engine, _SessionFactory, _ReadSessionFactory, _write_lock
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose(close=False)
+    _engine = _read_engine = None
+    _SessionFactory = _ReadSessionFactory = None
+    _write_lock = _WriteLockState()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _acquire_write_lock() -> _WriteLockState:
+    state = _write_lock
+    if state.owner == threading.get_ident():
+        state.depth += 1
+        return state
+    state.mutex.acquire()
+    try:
+        fh = open(_get_db_path() + ".write-lock", "a")
+        fcntl.flock(fh, fcntl.LOCK_EX)
+    except BaseException:
+        state.mutex.release()
+        raise
+    state.fh, state.owner, state.depth = fh, threading.get_ident(), 1
+    return state
+
+
+def _release_write_lock(state: _WriteLockState) -> None:
+    # May run on another thread (a connection checked in by GC); the mutex is
+    # a plain Lock, so releasing it from there is fine
+    state.depth -= 1
+    if state.depth:
+        return
+    fh, state.fh, state.owner = state.fh, None, None
+    try:
+        fcntl.flock(fh, fcntl.LOCK_UN)
+        fh.close()
+    finally:
+        state.mutex.release()
+
+
+@contextmanager
+def dining_write_lock():
+    """Serialize writers across threads and Gunicorn workers.
+
+    A thread mutex covers this process; an flock on a sidecar file covers
+    the other workers, so only one transaction ever waits on SQLite's lock.
+    Take it before the first use of the write session — the writer's only
+    connection is checked out under this lock too, and re-entering it from
+    the holding thread is a no-op. Reads belong on get_dining_read_session().
+    """
+    state = _acquire_write_lock()
+    try:
+        yield
+    finally:
+        _release_write_lock(state)
+
+
+# Columns added after a table first shipped; create_all() only creates missing tables
+_ADDED_COLUMNS = {
+    "menu": {
+        "crawled_place_id": "INTEGER REFERENCES crawled_place(id) ON DELETE CASCADE",
+    },
+    "place_source": {
+        "dc_score": "FLOAT",
+    },
+}
+
+
+def _add_missing_columns(engine):
+    with engine.begin() as conn:
+        inspector = inspect(conn)  # the writer has one connection: inspect through the open one
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _rekey_menu_table(engine):
+    """Rebuild a menu table whose uq_menu is still (place_name, menu_name, source).
+
+    Same-name branches of a chain collided on that key; SQLite cannot swap a
+    table constraint in place, so the rows are copied into a fresh table.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if not any(u["column_names"][:1] == ["place_name"] for u in inspector.get_unique_constraints("menu")):
+            return
+        for index in inspector.get_indexes("menu"):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+        conn.execute(text("ALTER TABLE menu RENAME TO _menu_old"))
+        Menu.__table__.create(conn)
+        cols = ", ".join(c.name for c in Menu.__table__.columns)
+        conn.execute(text(f"INSERT OR IGNORE INTO menu ({cols}) SELECT {cols} FROM _menu_old ORDER BY id"))
+        conn.execute(text("DROP TABLE _menu_old"))
+
+
+def _backfill_dc_scores(engine):
+    """Copy DiningCode scores out of the metadata JSON for rows written before dc_score existed."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE place_source SET dc_score = CAST(json_extract(metadata, '$.score') AS REAL) "
+            "WHERE source = 'diningcode' AND dc_score IS NULL AND json_valid(metadata) "
+            "AND json_extract(metadata, '$.score') IS NOT NULL"
+        ))
+
+
+# Tables whose every row change bumps seed_version (facet_index.seed_signature)
+SEED_TABLES = ("restaurant", "cafe", "parking_lot")
+
+
+def _install_seed_triggers(engine):
+    """Count writes to the seed tables in seed_version, whoever makes them.
+
+    Triggers rather than ORM events, so raw SQL, the Prisma migration and
+    other processes are counted too; readers compare one small row per table
+    instead of scanning the tables.
+    """
+    with engine.begin() as conn:
+        for table in SEED_TABLES:
+            conn.execute(text("INSERT OR IGNORE INTO seed_version (table_name, version) VALUES (:t, 0)"), {"t": table})
+            for op in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_version AFTER {op} ON {table} "
+                    f"BEGIN UPDATE seed_version SET version = version + 1 WHERE table_name = '{table}'; END"
+                ))
+
+
 def init_dining_db():
     """Create all dining tables if they don't exist."""
     engine = _get_engine()
     DiningBase.metadata.create_all(engine)
+    _add_missing_columns(engine)
+    _rekey_menu_table(engine)
+    _install_seed_triggers(engine)
+    # Indexes on added columns: create_all skipped them if the table predates the column
+    for table in DiningBase.metadata.sorted_tables:
+        if table.name in _ADDED_COLUMNS:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+    _backfill_dc_scores(engine)
 
 
 def _utcnow():
@@ -85,7 +353,10 @@ class CrawledPlace(DiningBase):
         "PlaceSource", back_populates="crawled_place", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (Index("ix_crawled_place_lat_lng", "lat", "lng"),)
+    __table_args__ = (
+        Index("ix_crawled_place_lat_lng", "lat", "lng"),
+        Index("ix_crawled_place_updated_at_id", "updated_at", "id"),
+    )
 
 
 class PlaceSource(DiningBase):
@@ -99,6 +370,7 @@ class PlaceSource(DiningBase):
     review_count = Column(Integer)
     snippet = Column(String(500))
     metadata_ = Column("metadata", String(1000))
+    dc_score = Column(Float)  # DiningCode score, copied out of metadata on write for SQL ranking
     crawled_at = Column(DateTime, default=_utcnow)
 
     crawled_place = relationship("CrawledPlace", back_populates="sources")
@@ -106,6 +378,7 @@ class PlaceSource(DiningBase):
     __table_args__ = (
         UniqueConstraint("crawled_place_id", "source", name="uq_place_source"),
         Index("ix_place_source_source", "source"),
+        Index("ix_place_source_source_dc_score", "source", "dc_score"),
     )
 
 
@@ -114,13 +387,21 @@ class Menu(DiningBase):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     place_name = Column(String(200), nullable=False, index=True)
+    # Set for menus ingested from a crawled place's profile; seed places only have the name
+    crawled_place_id = Column(Integer, ForeignKey("crawled_place.id", ondelete="CASCADE"))
     menu_name = Column(String(200), nullable=False)
     price = Column(String(50))
     source = Column(String(50), default="diningcode")
     crawled_at = Column(DateTime, default=_utcnow)
 
     __table_args__ = (
-        UniqueConstraint("place_name", "menu_name", "source", name="uq_menu"),
+        # Keyed on the place id: branches of a chain share a name but not their menus
+        UniqueConstraint("crawled_place_id", "menu_name", "source", name="uq_menu"),
+        Index(
+            "uq_menu_seed", "place_name", "menu_name", "source",
+            unique=True, sqlite_where=text("crawled_place_id IS NULL"),
+        ),
+        Index("ix_menu_crawled_place_id", "crawled_place_id"),
     )
 
 
@@ -184,3 +465,81 @@ class ParkingLot(DiningBase):
     operating_hours = Column(String(100), nullable=False)
 
     __table_args__ = (Index("ix_parking_lot_lat_lng", "lat", "lng"),)
+
+
+class PlaceGridCell(DiningBase):
+    """Precomputed per-zoom grid aggregate used for server-side marker clustering."""
+
+    __tablename__ = "place_grid_cell"
+
+    zoom = Column(Integer, primary_key=True)
+    gx = Column(Integer, primary_key=True)
+    gy = Column(Integer, primary_key=True)
+    place_type = Column(String(20), primary_key=True)  # restaurant | cafe | bar | bakery | parking
+    count = Column(Integer, nullable=False, default=0)
+    sum_lat = Column(Float, nullable=False, default=0.0)
+    sum_lng = Column(Float, nullable=False, default=0.0)
+
+
+class CrawlPageState(DiningBase):
+    """Last crawl of a DiningCode keyword — drives stale-while-revalidate."""
+
+    __tablename__ = "crawl_page_state"
+
+    keyword = Column(String(200), primary_key=True)
+    content_hash = Column(String(64))
+    place_count = Column(Integer, default=0)
+    crawled_at = Column(DateTime, default=_utcnow)  # last full pipeline run
+    checked_at = Column(DateTime, default=_utcnow)  # last revalidation (changed or not)
+
+
+class PrewarmJob(DiningBase):
+    """Progress of the bulk pre-warm crawl — one row per region × cuisine keyword."""
+
+    __tablename__ = "prewarm_job"
+
+    keyword = Column(String(200), primary_key=True)
+    status = Column(String(10), nullable=False, default="pending")  # pending | done | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    place_count = Column(Integer)
+    error = Column(String(300))
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+
+
+class SeedVersion(DiningBase):
+    """Write counter per seed table, bumped by triggers (see _install_seed_triggers)."""
+
+    __tablename__ = "seed_version"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class PlaceTombstone(DiningBase):
+    """A deleted place, kept so delta syncs (GET /api/places?since=) can report the removal."""
+
+    __tablename__ = "place_tombstone"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    place_kind = Column(String(20), nullable=False)  # crawled
+    place_id = Column(Integer, nullable=False)
+    lat = Column(Float)
+    lng = Column(Float)
+    deleted_at = Column(DateTime, default=_utcnow, nullable=False)
+
+    __table_args__ = (Index("ix_place_tombstone_deleted_at", "deleted_at"),)
+
+
+class NearbyParking(DiningBase):
+    """K nearest parking lots per place, precomputed by parking_index."""
+
+    __tablename__ = "nearby_parking"
+
+    place_kind = Column(String(20), primary_key=True)  # restaurant | cafe | crawled
+    place_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 1 = nearest
+    parking_lot_id = Column(Integer, ForeignKey("parking_lot.id", ondelete="CASCADE"), nullable=False)
+    distance_m = Column(Integer, nullable=False)
+    walk_min = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_nearby_parking_lot", "parking_lot_id"),)
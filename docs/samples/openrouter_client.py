@@ -2,36 +2,245 @@
 
 import os
 import re
+import json
+import time
 import logging
+import threading
+from collections import deque
 
-import requests
+from .metrics import counter, gauge, traced
 
 logger = logging.getLogger(__name__)
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
 MODEL = os.getenv("OPENROUTER_MODEL", "google/gemini-3-pro-preview")
 FLASH_MODEL = os.getenv("OPENROUTER_FLASH_MODEL", "google/gemini-2.5-flash")
 
 
+# Budgets — 0 disables the limit. They are kept per process: with N Gunicorn
+# workers the service as a whole can spend N times these values.
+TOKENS_PER_MINUTE = int(os.getenv("OPENROUTER_TOKENS_PER_MINUTE", "0"))
+MODEL_TOKENS_PER_MINUTE = json.loads(os.getenv("OPENROUTER_MODEL_TOKENS_PER_MINUTE", "{}"))
+MAX_CONCURRENT = json.loads(os.getenv("OPENROUTER_MAX_CONCURRENT", "{}"))  # {"model": n, "*": n}
+QUEUE_TIMEOUT_SEC = float(os.getenv("OPENROUTER_QUEUE_TIMEOUT_SEC", "2"))
+REQUEST_TIMEOUT_SEC = float(os.getenv("OPENROUTER_TIMEOUT_SEC", "60"))
+HTTP_POOL_SIZE = int(os.getenv("OPENROUTER_HTTP_POOL_SIZE", "32"))  # kept-alive connections per process
+# USD per 1M tokens, used when the response has no usage.cost: {"model": [prompt, completion]}
+PRICES = json.loads(os.getenv("OPENROUTER_PRICES", "{}"))
+
+LLM_CALLS = counter("dining_llm_calls_total", "OpenRouter calls by call site, model and outcome")
+LLM_TOKENS = counter("dining_llm_tokens_total", "OpenRouter tokens by call site, model and kind")
+LLM_COST = counter("dining_llm_cost_usd_total", "OpenRouter cost in USD by call site and model")
+LLM_IN_FLIGHT = gauge("dining_llm_in_flight", "OpenRouter calls currently in flight by model")
+
+
+class LLMBudgetExceeded(Exception):
+    """Raised instead of calling OpenRouter when a token or concurrency budget is spent."""
+
+
+class _Budget:
+    """Sliding 60s token window plus per-model concurrency slots (this process only).
+
+    A call reserves its worst case (prompt estimate + max_tokens) before it
+    is sent and settles to the reported usage afterwards, so a burst of
+    concurrent calls cannot all pass the check before any of them is counted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._window: deque = deque()  # [timestamp, model, tokens]
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def _tokens_last_minute(self, model: str | None = None) -> int:
+        cutoff = time.monotonic() - 60
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+        return sum(t for _, m, t in self._window if model is None or m == model)
+
+    def reserve(self, model: str, tokens: int) -> list | None:
+        """Hold ``tokens`` in the window if they fit both budgets; None when they do not.
+
+        A call larger than a whole budget still goes through when nothing else
+        has been spent in the last minute.
+        """
+        with self._lock:
+            for limit, scope in ((TOKENS_PER_MINUTE, None), (MODEL_TOKENS_PER_MINUTE.get(model, 0), model)):
+                if limit:
+                    used = self._tokens_last_minute(scope)
+                    if used and used + tokens > limit:
+                        return None
+            entry = [time.monotonic(), model, tokens]
+            self._window.append(entry)
+            return entry
+
+    def settle(self, entry: list, tokens: int):
+        """Replace a reservation with the tokens the call actually used."""
+        with self._lock:
+            entry[2] = tokens
+
+    def acquire(self, model: str, timeout: float) -> bool:
+        limit = MAX_CONCURRENT.get(model, MAX_CONCURRENT.get("*", 0))
+        if limit:
+            with self._lock:
+                sem = self._slots.setdefault(model, threading.BoundedSemaphore(limit))
+            if not sem.acquire(timeout=timeout):
+                return False
+        with self._lock:
+            self._in_flight[model] = self._in_flight.get(model, 0) + 1
+            LLM_IN_FLIGHT.set(self._in_flight[model], model=model)
+        return True
+
+    def release(self, model: str):
+        with self._lock:
+            self._in_flight[model] -= 1
+            LLM_IN_FLIGHT.set(self._in_flight[model], model=model)
+            sem = self._slots.get(model)
+        if sem is not None:
+            sem.release()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "tokensLastMinute": self._tokens_last_minute(),
+                "tokensPerMinute": TOKENS_PER_MINUTE,
+                "inFlight": dict(self._in_flight),
+                "maxConcurrent": MAX_CONCURRENT,
+            }
+
+
+_budget = _Budget()
+
+
+def budget_status() -> dict:
+    """Current token window and in-flight calls (for the usage endpoint)."""
+    return _budget.status()
+
+
+# --------------- HTTP session ---------------
+
+_http = None
+_http_lock = threading.Lock()
+
+
+def _http_session():
+    """Process-wide requests.Session so calls reuse kept-alive TLS connections."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            import requests  # deferred to keep imports light; preloaded by warmup.py
+            from requests.adapters import HTTPAdapter
+
+            _http = requests.Session()
+            _http.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+            _http.mount("http://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        return _http
+
+
+def _reset_after_fork():
+    # Sockets inherited from the parent must not be shared; start a fresh pool
+    global _http, _http_lock
+    _http = None
+    _http_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _record_usage(call_site: str, model: str, usage: dict, reservation: list):
+    prompt = int(usage.get("prompt_tokens") or 0)
+    completion = int(usage.get("completion_tokens") or 0)
+    if prompt or completion:  # no usage reported: the worst-case reservation stands
+        _budget.settle(reservation, prompt + completion)
+    LLM_TOKENS.inc(prompt, site=call_site, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion, site=call_site, model=model, kind="completion")
+    cost = usage.get("cost")
+    if cost is None and model in PRICES:
+        cost = (prompt * PRICES[model][0] + completion * PRICES[model][1]) / 1_000_000
+    if cost:
+        LLM_COST.inc(float(cost), site=call_site, model=model)
+
+
+def _estimate_tokens(messages: list) -> int:
+    # Rough prompt size for the reservation (about 3 characters per token); settled to usage after
+    return sum(len(str(m.get("content") or "")) for m in messages) // 3
+
+
+def _read_body(resp, deadline: float) -> bytes:
+    """The response body, given up on once ``deadline`` passes.
+
+    requests' timeout applies to each socket read, so a body that keeps
+    trickling in would otherwise never time out.
+    """
+    chunks = []
+    # read1() returns what has arrived; iter_content() would wait for a full chunk
+    while chunk := resp.raw.read1(8192, decode_content=True):
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            raise TimeoutError("OpenRouter response still arriving at the deadline")
+    return b"".join(chunks)
+
+
 def _get_api_key():
     return os.getenv("OPENROUTER_API_KEY", "")
 
 
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+
 def extract_json(text: str) -> str:
     """Strip markdown code fences that Gemini sometimes wraps around JSON."""
-    m = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+    m = _CODE_FENCE_RE.search(text)
     return m.group(1).strip() if m else text.strip()
 
 
-def chat_completion(model: str, messages: list, temperature: float = 0, max_tokens: int = 4000) -> str | None:
-    """Call OpenRouter chat completion and return content string."""
+@traced("openrouter.chat")
+def chat_completion(
+    model: str,
+    messages: list,
+    temperature: float = 0,
+    max_tokens: int = 4000,
+    call_site: str = "other",
+    fallback_model: str | None = None,
+    timeout: float = REQUEST_TIMEOUT_SEC,
+) -> str | None:
+    """Call OpenRouter chat completion and return content string.
+
+    Usage is accounted per call site and model. When the model's token or
+    concurrency budget is spent the call moves to ``fallback_model`` if given,
+    otherwise LLMBudgetExceeded is raised so the caller can degrade.
+    ``timeout`` bounds the whole HTTP call, body included; callers with a
+    deadline pass what is left.
+    """
     api_key = _get_api_key()
     if not api_key:
         logger.warning("OPENROUTER_API_KEY not set")
         return None
 
+    estimate = _estimate_tokens(messages) + max_tokens
+    for candidate in (model, fallback_model):
+        if candidate is None:
+            continue
+        reservation = _budget.reserve(candidate, estimate)
+        if reservation is None:
+            continue
+        if not _budget.acquire(candidate, QUEUE_TIMEOUT_SEC):
+            _budget.settle(reservation, 0)
+            continue
+        if candidate != model:
+            LLM_CALLS.inc(site=call_site, model=model, outcome="degraded")
+            logger.warning("[openrouter] %s budget spent, degrading %s to %s", call_site, model, candidate)
+        model = candidate
+        break
+    else:
+        LLM_CALLS.inc(site=call_site, model=model, outcome="shed")
+        raise LLMBudgetExceeded(f"LLM budget exhausted for {model} ({call_site})")
+
+    deadline = time.monotonic() + timeout
     try:
-        resp = requests.post(
+        # stream=True holds the pooled connection until the response is closed:
+        # the with block closes it on every path, error statuses included
+        with _http_session().post(
             OPENROUTER_URL,
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -42,12 +251,20 @@ def chat_completion(model: str, messages: list, temperature: float = 0, max_toke
                 "messages": messages,
                 "temperature": temperature,
                 "max_tokens": max_tokens,
+                "usage": {"include": True},
             },
-            timeout=60,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+            timeout=timeout,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            data = json.loads(_read_body(resp, deadline))
+        _record_usage(call_site, model, data.get("usage") or {}, reservation)
+        LLM_CALLS.inc(site=call_site, model=model, outcome="ok")
         return data.get("choices", [{}])[0].get("message", {}).get("content")
     except Exception as e:
+        _budget.settle(reservation, 0)
+        LLM_CALLS.inc(site=call_site, model=model, outcome="error")
         logger.error("OpenRouter API error: %s", e)
         raise
+    finally:
+        _budget.release(model)
@@ -0,0 +1,191 @@
+"""Parking cost — estimated fee of a stay at every lot, in one vectorized pass.
+
+A lot with a full fee schedule charges base_rate for the first base_time
+minutes and extra_rate per started extra_time minutes after that; other
+lots are charged hourly_rate pro rata. That is the rule PlaceDetail's
+calc3HourRate applies on the client, so estimates match what the detail
+panel shows.
+
+Each process keeps every lot's schedule as parallel numpy arrays sorted by
+latitude (a bounds query is a searchsorted slice plus a longitude mask),
+reloaded when parking_lot's (count, max id, fee totals) signature changes.
+Ranking trades money against walking: a lot's score is its cost plus
+DINING_PARKING_WON_PER_WALK_MIN for every minute of walk to the
+destination.
+"""
+
+import math
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import func
+
+from .models import ParkingLot
+from .route_optimizer import WALK_DETOUR, WALK_M_PER_MIN, walk_minutes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAY_MIN = int(os.getenv("DINING_PARKING_STAY_MIN", "120"))
+MAX_STAY_MIN = 24 * 60
+WON_PER_WALK_MIN = float(os.getenv("DINING_PARKING_WON_PER_WALK_MIN", "200"))
+_RELOAD_CHECK_SEC = 1.0
+_EARTH_R = 6371000
+
+
+class ParkingFeeTable:
+    """Fee schedules of all lots as latitude-sorted arrays."""
+
+    def __init__(self, rows: list[tuple]):
+        # rows: (id, lat, lng, hourly_rate, base_time, base_rate, extra_time, extra_rate), None for unknown
+        data = np.array([[np.nan if v is None else v for v in r] for r in rows], dtype=np.float64).reshape(-1, 8)
+        data = data[np.argsort(data[:, 1], kind="stable")]
+        self.ids = data[:, 0].astype(np.int64)
+        self.lat, self.lng = data[:, 1].copy(), data[:, 2].copy()
+        self.hourly_rate = np.nan_to_num(data[:, 3])
+        self.base_time, self.base_rate = data[:, 4].copy(), data[:, 5].copy()
+        self.extra_time, self.extra_rate = data[:, 6].copy(), data[:, 7].copy()
+        # Same test as calc3HourRate: baseTime and extraTime non-zero, both rates present
+        with np.errstate(invalid="ignore"):
+            self.scheduled = ((self.base_time > 0) & ~np.isnan(self.base_rate)
+                              & (self.extra_time > 0) & ~np.isnan(self.extra_rate))
+        self._pos = {int(pid): i for i, pid in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def in_bounds(self, bounds: dict) -> np.ndarray:
+        """Indexes of the lots inside ``bounds``."""
+        lo = np.searchsorted(self.lat, bounds["swLat"], side="left")
+        hi = np.searchsorted(self.lat, bounds["neLat"], side="right")
+        lng = self.lng[lo:hi]
+        return lo + np.flatnonzero((lng >= bounds["swLng"]) & (lng <= bounds["neLng"]))
+
+    def costs(self, minutes: float, idx: np.ndarray | None = None) -> np.ndarray:
+        """Estimated fee in won of a ``minutes`` stay at the lots ``idx`` (all lots by default)."""
+        sel = slice(None) if idx is None else idx
+        base_time, extra_time = self.base_time[sel], self.extra_time[sel]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            units = np.ceil(np.maximum(minutes - base_time, 0) / extra_time)
+            scheduled = self.base_rate[sel] + units * self.extra_rate[sel]
+        hourly = self.hourly_rate[sel] * minutes / 60
+        return np.rint(np.where(self.scheduled[sel], scheduled, hourly)).astype(np.int64)
+
+    def distances_m(self, lat: float, lng: float, idx: np.ndarray) -> np.ndarray:
+        """Haversine metres from (lat, lng) to the lots ``idx``, rounded like calc_distance_m."""
+        phi1, phi2 = math.radians(lat), np.radians(self.lat[idx])
+        dphi = np.radians(self.lat[idx] - lat)
+        dlmb = np.radians(self.lng[idx] - lng)
+        a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+        return np.rint(2 * _EARTH_R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).astype(np.int64)
+
+    def rank(
+        self, minutes: float, lat: float, lng: float, idx: np.ndarray, limit: int = 20,
+        won_per_walk_min: float = WON_PER_WALK_MIN,
+    ) -> list[tuple[int, int, int]]:
+        """Best ``limit`` lots of ``idx`` for a stay, as (lot_id, cost_won, distance_m).
+
+        Ordered by cost plus walking time priced at ``won_per_walk_min``,
+        then by distance and id.
+        """
+        if not len(idx):
+            return []
+        cost = self.costs(minutes, idx)
+        dist = self.distances_m(lat, lng, idx)
+        walk = np.maximum(1, np.ceil(dist * WALK_DETOUR / WALK_M_PER_MIN))
+        score = cost + won_per_walk_min * walk
+        if len(idx) > limit:
+            # Keep every lot tied with the limit-th score; distance and id decide among them
+            cutoff = np.partition(score, limit - 1)[limit - 1]
+            top = np.flatnonzero(score <= cutoff)
+        else:
+            top = np.arange(len(idx))
+        top = top[np.lexsort((self.ids[idx[top]], dist[top], score[top]))][:limit]
+        return [(int(self.ids[idx[i]]), int(cost[i]), int(dist[i])) for i in top]
+
+    def costs_for(self, lot_ids: list[int], minutes: float) -> dict[int, int]:
+        """{lot_id: estimated fee} for known lots (unknown ids are left out)."""
+        known = [pid for pid in lot_ids if pid in self._pos]
+        if not known:
+            return {}
+        idx = np.fromiter((self._pos[pid] for pid in known), dtype=np.int64, count=len(known))
+        return dict(zip(known, self.costs(minutes, idx).tolist()))
+
+
+# --------------- Process-wide table ---------------
+
+_table: ParkingFeeTable | None = None
+_table_sig: tuple | None = None
+_checked_at = 0.0
+_table_lock = threading.Lock()
+
+_FEE_COLUMNS = (ParkingLot.hourly_rate, ParkingLot.base_time, ParkingLot.base_rate,
+                ParkingLot.extra_time, ParkingLot.extra_rate)
+
+
+def _signature(session) -> tuple:
+    # Fee totals catch in-place schedule edits (enrichment scripts) that keep count and max id
+    return tuple(session.query(func.count(ParkingLot.id), func.max(ParkingLot.id),
+                               *(func.total(c) for c in _FEE_COLUMNS)).one())
+
+
+def get_fee_table(session) -> ParkingFeeTable:
+    """This process's fee table, reloaded when another worker changed parking_lot."""
+    global _table, _table_sig, _checked_at
+    with _table_lock:
+        now = time.monotonic()
+        if _table is not None and now - _checked_at < _RELOAD_CHECK_SEC:
+            return _table
+        _checked_at = now
+        sig = _signature(session)
+        if _table is None or sig != _table_sig:
+            started = time.perf_counter()
+            rows = session.query(ParkingLot.id, ParkingLot.lat, ParkingLot.lng, *_FEE_COLUMNS).all()
+            _table = ParkingFeeTable([tuple(r) for r in rows])
+            _table_sig = sig
+            logger.info("[parking] fee table for %d lots in %.0fms", len(rows), (time.perf_counter() - started) * 1000)
+        return _table
+
+
+def clamp_stay(minutes) -> int:
+    """Stay length from user input, defaulting to DEFAULT_STAY_MIN and capped at a day."""
+    try:
+        minutes = int(minutes)
+    except (TypeError, ValueError):
+        return DEFAULT_STAY_MIN
+    return max(1, min(minutes, MAX_STAY_MIN))
+
+
+def rank_parking(
+    session, bounds: dict, minutes: int = DEFAULT_STAY_MIN, lat: float | None = None, lng: float | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Lots in ``bounds`` ranked by the cost of a ``minutes`` stay and the walk to (lat, lng).
+
+    The destination defaults to the centre of the bounds.
+    """
+    if lat is None or lng is None:
+        lat, lng = (bounds["swLat"] + bounds["neLat"]) / 2, (bounds["swLng"] + bounds["neLng"]) / 2
+    table = get_fee_table(session)
+    ranked = table.rank(minutes, lat, lng, table.in_bounds(bounds), limit)
+    lots = {lot.id: lot for lot in session.query(ParkingLot).filter(ParkingLot.id.in_([i for i, _, _ in ranked]))}
+    return [
+        {
+            "id": lot.id,
+            "name": lot.name,
+            "lat": lot.lat,
+            "lng": lot.lng,
+            "address": lot.address,
+            "parkingType": lot.type,
+            "hourlyRate": lot.hourly_rate,
+            "freeNote": lot.free_note,
+            "stayMinutes": minutes,
+            "estimatedCost": cost,
+            "distanceM": dist,
+            "walkMin": walk_minutes(dist),
+        }
+        for lot_id, cost, dist in ranked
+        if (lot := lots.get(lot_id)) is not None
+    ]
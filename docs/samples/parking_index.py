@@ -0,0 +1,312 @@
+"""Nearest-parking index — KD-tree over ParkingLot coordinates.
+
+Lots are projected to local metres (equirectangular around their mean
+latitude, well under 0.1% error across Seoul) and stored in a 2-d tree.
+The K nearest lots of every restaurant, cafe and crawled place are kept in
+the nearby_parking table and updated incrementally:
+
+- a place that is inserted or moves gets its own rows recomputed;
+- a new lot only recomputes places within PARKING_MAX_M whose current K-th
+  lot is farther away than the new one.
+
+Lots are only ever added (save_parking_lots). Each process holds its own
+tree, rebuilt from the DB when the parking_lot table's (count, max id)
+signature changes; add_parking_lots moves the signature along with the lots
+it folds in, so the writing process keeps its tree.
+"""
+
+import os
+import math
+import heapq
+import time
+import logging
+import threading
+from operator import itemgetter
+
+from sqlalchemy import func
+
+from .llm_service import calc_distance_m
+from .models import Cafe, CrawledPlace, NearbyParking, ParkingLot, Restaurant
+from .route_optimizer import walk_minutes
+
+logger = logging.getLogger(__name__)
+
+PARKING_K = int(os.getenv("DINING_PARKING_K", "3"))
+PARKING_MAX_M = int(os.getenv("DINING_PARKING_MAX_M", "1500"))
+_RELOAD_CHECK_SEC = 1.0
+_CHUNK = 2000
+
+M_PER_DEG = 111_320.0
+PLACE_KINDS = {"restaurant": Restaurant, "cafe": Cafe, "crawled": CrawledPlace}
+
+
+class KDTree:
+    """Static 2-d tree; built once, queried many times."""
+
+    def __init__(self, points: list[tuple[float, float, int]]):
+        self._x: list[float] = []
+        self._y: list[float] = []
+        self._id: list[int] = []
+        self._left: list[int] = []
+        self._right: list[int] = []
+        self._root = self._build(list(points), 0)
+
+    def __len__(self) -> int:
+        return len(self._id)
+
+    def _build(self, pts: list, depth: int) -> int:
+        if not pts:
+            return -1
+        pts.sort(key=itemgetter(depth % 2))
+        mid = len(pts) // 2
+        x, y, pid = pts[mid]
+        node = len(self._id)
+        self._x.append(x)
+        self._y.append(y)
+        self._id.append(pid)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._left[node] = self._build(pts[:mid], depth + 1)
+        self._right[node] = self._build(pts[mid + 1:], depth + 1)
+        return node
+
+    def nearest(self, x: float, y: float, k: int, max_d2: float = math.inf) -> list[tuple[float, int]]:
+        """Up to k (squared distance, id) pairs within max_d2, nearest first."""
+        heap: list[tuple[float, int]] = []  # max-heap on -d2
+        xs, ys, ids, left, right = self._x, self._y, self._id, self._left, self._right
+        stack = [(self._root, 0, 0.0)]
+        while stack:
+            node, depth, bound = stack.pop()
+            if node < 0:
+                continue
+            worst = -heap[0][0] if len(heap) == k else max_d2
+            if bound >= worst:
+                continue
+            dx, dy = x - xs[node], y - ys[node]
+            d2 = dx * dx + dy * dy
+            if d2 < worst:
+                if len(heap) == k:
+                    heapq.heapreplace(heap, (-d2, ids[node]))
+                else:
+                    heapq.heappush(heap, (-d2, ids[node]))
+            diff = dx if depth % 2 == 0 else dy
+            near, far = (left[node], right[node]) if diff < 0 else (right[node], left[node])
+            stack.append((far, depth + 1, diff * diff))
+            stack.append((near, depth + 1, bound))
+        return sorted((-d2, pid) for d2, pid in heap)
+
+
+class ParkingIndex:
+    """KD-tree over lots plus a small unindexed buffer for lots added since the build."""
+
+    def __init__(self, lots: list[tuple[int, float, float]]):
+        self.lat0 = sum(lat for _, lat, _ in lots) / len(lots) if lots else 37.55
+        self._kx = M_PER_DEG * math.cos(math.radians(self.lat0))
+        self.coords: dict[int, tuple[float, float]] = {pid: (lat, lng) for pid, lat, lng in lots}
+        self._tree = KDTree([(*self._project(lat, lng), pid) for pid, lat, lng in lots])
+        self._extra: dict[int, tuple[float, float]] = {}
+
+    def _project(self, lat: float, lng: float) -> tuple[float, float]:
+        return lng * self._kx, lat * M_PER_DEG
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def add(self, lot_id: int, lat: float, lng: float):
+        self.coords[lot_id] = (lat, lng)
+        self._extra[lot_id] = self._project(lat, lng)
+        if len(self._extra) > max(64, int(math.sqrt(len(self.coords)))):
+            self._rebuild()
+
+    def _rebuild(self):
+        self._tree = KDTree([(*self._project(lat, lng), pid) for pid, (lat, lng) in self.coords.items()])
+        self._extra = {}
+
+    def nearest(self, lat: float, lng: float, k: int = PARKING_K, max_m: float = PARKING_MAX_M) -> list[tuple[int, int]]:
+        """Up to k (lot_id, distance_m) pairs within max_m, nearest first."""
+        x, y = self._project(lat, lng)
+        # Small slack so projection error never drops a lot right at the edge
+        max_d2 = (max_m * 1.01) ** 2
+        hits = self._tree.nearest(x, y, k, max_d2)
+        if self._extra:
+            hits += [((x - ex) ** 2 + (y - ey) ** 2, pid) for pid, (ex, ey) in self._extra.items()]
+            hits = sorted(h for h in hits if h[0] <= max_d2)[:k]
+        out = []
+        for _, pid in hits:
+            plat, plng = self.coords[pid]
+            d = calc_distance_m(lat, lng, plat, plng)
+            if d <= max_m:
+                out.append((pid, d))
+        return out
+
+
+# --------------- Process-wide index ---------------
+
+_index: ParkingIndex | None = None
+_index_sig: tuple | None = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _signature(session) -> tuple:
+    return tuple(session.query(func.count(ParkingLot.id), func.max(ParkingLot.id)).one())
+
+
+def get_parking_index(session) -> ParkingIndex:
+    """This process's index, reloaded when another worker changed parking_lot."""
+    global _index, _index_sig, _checked_at
+    with _index_lock:
+        now = time.monotonic()
+        if _index is not None and now - _checked_at < _RELOAD_CHECK_SEC:
+            return _index
+        _checked_at = now
+        sig = _signature(session)
+        if _index is None or sig != _index_sig:
+            lots = session.query(ParkingLot.id, ParkingLot.lat, ParkingLot.lng).all()
+            _index = ParkingIndex([tuple(r) for r in lots])
+            _index_sig = sig
+            logger.info("[parking] indexed %d lots", len(lots))
+        return _index
+
+
+def invalidate_parking_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+# --------------- Precomputed nearby_parking rows ---------------
+
+
+def _rows(index: ParkingIndex, kind: str, places) -> list[dict]:
+    rows = []
+    for pid, lat, lng in places:
+        for rank, (lot_id, d) in enumerate(index.nearest(lat, lng), start=1):
+            rows.append({"place_kind": kind, "place_id": pid, "rank": rank,
+                         "parking_lot_id": lot_id, "distance_m": d, "walk_min": walk_minutes(d)})
+    return rows
+
+
+def update_nearby_parking(session, kind: str, places: list[tuple[int, float | None, float | None]]) -> int:
+    """Recompute rows for (id, lat, lng) places. Runs in the caller's transaction."""
+    if not places:
+        return 0
+    index = get_parking_index(session)
+    ids = [pid for pid, _, _ in places]
+    session.query(NearbyParking).filter(
+        NearbyParking.place_kind == kind, NearbyParking.place_id.in_(ids)
+    ).delete(synchronize_session=False)
+    rows = _rows(index, kind, [(pid, lat, lng) for pid, lat, lng in places if lat is not None and lng is not None])
+    session.bulk_insert_mappings(NearbyParking, rows)
+    return len(rows)
+
+
+def add_parking_lots(session, lots: list[ParkingLot]) -> int:
+    """Fold new (flushed) lots into the index and refresh the places they now rank for.
+
+    Runs in the caller's transaction; call invalidate_parking_index() if it rolls back.
+    """
+    global _index_sig
+    if not lots:
+        return 0
+    index = get_parking_index(session)
+    with _index_lock:
+        for lot in lots:
+            if lot.id not in index.coords:
+                index.add(lot.id, lot.lat, lot.lng)
+        # The session already sees the new rows: record the signature they
+        # give so the next check doesn't discard this tree and rebuild
+        if _index is index:
+            _index_sig = _signature(session)
+
+    lat_pad = PARKING_MAX_M / M_PER_DEG
+    refreshed = 0
+    for kind, model in PLACE_KINDS.items():
+        affected: dict[int, tuple] = {}
+        for lot in lots:
+            lng_pad = lat_pad / math.cos(math.radians(lot.lat))
+            candidates = session.query(model.id, model.lat, model.lng).filter(
+                model.lat.between(lot.lat - lat_pad, lot.lat + lat_pad),
+                model.lng.between(lot.lng - lng_pad, lot.lng + lng_pad),
+            ).all()
+            if not candidates:
+                continue
+            # K-th distance (or "not full yet") per candidate
+            kth: dict[int, tuple[int, int]] = {}
+            cand_ids = [c.id for c in candidates]
+            for i in range(0, len(cand_ids), 500):
+                for pid, n, far in session.query(
+                    NearbyParking.place_id, func.count(), func.max(NearbyParking.distance_m)
+                ).filter(
+                    NearbyParking.place_kind == kind, NearbyParking.place_id.in_(cand_ids[i:i + 500])
+                ).group_by(NearbyParking.place_id):
+                    kth[pid] = (n, far)
+            for pid, lat, lng in candidates:
+                d = calc_distance_m(lat, lng, lot.lat, lot.lng)
+                n, far = kth.get(pid, (0, 0))
+                if d <= PARKING_MAX_M and (n < PARKING_K or d < far):
+                    affected[pid] = (pid, lat, lng)
+        refreshed += len(affected)
+        update_nearby_parking(session, kind, list(affected.values()))
+    return refreshed
+
+
+def rebuild_nearby_parking(session) -> int:
+    """Recompute every place's rows from scratch (after seeding or bulk imports)."""
+    invalidate_parking_index()
+    index = get_parking_index(session)
+    session.query(NearbyParking).delete()
+    total = 0
+    for kind, model in PLACE_KINDS.items():
+        after = 0
+        while True:
+            chunk = session.query(model.id, model.lat, model.lng).filter(
+                model.id > after, model.lat.isnot(None), model.lng.isnot(None)
+            ).order_by(model.id).limit(_CHUNK).all()
+            if not chunk:
+                break
+            after = chunk[-1].id
+            rows = _rows(index, kind, chunk)
+            session.bulk_insert_mappings(NearbyParking, rows)
+            total += len(rows)
+    session.commit()
+    logger.info("[parking] rebuilt %d nearby_parking rows from %d lots", total, len(index))
+    return total
+
+
+# --------------- Queries ---------------
+
+
+def _lot_dict(lot: ParkingLot, distance_m: int) -> dict:
+    return {
+        "id": lot.id,
+        "name": lot.name,
+        "lat": lot.lat,
+        "lng": lot.lng,
+        "address": lot.address,
+        "parkingType": lot.type,
+        "hourlyRate": lot.hourly_rate,
+        "distanceM": distance_m,
+        "walkMin": walk_minutes(distance_m),
+    }
+
+
+def nearest_parking(session, lat: float, lng: float, k: int = PARKING_K, max_m: float = PARKING_MAX_M) -> list[dict]:
+    """The k nearest lots to an arbitrary point, nearest first."""
+    hits = get_parking_index(session).nearest(lat, lng, k, max_m)
+    lots = {lot.id: lot for lot in session.query(ParkingLot).filter(ParkingLot.id.in_([i for i, _ in hits]))}
+    return [_lot_dict(lots[i], d) for i, d in hits if i in lots]
+
+
+def nearby_parking_for(session, kind: str, place_ids: list[int]) -> dict[int, list[dict]]:
+    """Precomputed nearest lots for many places of one kind: {place_id: [lot, ...]}."""
+    out: dict[int, list[dict]] = {pid: [] for pid in place_ids}
+    rows = (
+        session.query(NearbyParking, ParkingLot)
+        .join(ParkingLot, ParkingLot.id == NearbyParking.parking_lot_id)
+        .filter(NearbyParking.place_kind == kind, NearbyParking.place_id.in_(place_ids))
+        .order_by(NearbyParking.place_id, NearbyParking.rank)
+    )
+    for near, lot in rows:
+        out[near.place_id].append(_lot_dict(lot, near.distance_m))
+    return out
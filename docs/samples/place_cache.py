@@ -1,23 +1,124 @@
 """Place cache — find and save crawled places in dining.db."""
 
+import base64
+import hashlib
+import json
 import logging
+import math
+import os
 from datetime import datetime, timezone, timedelta
+from typing import Iterator
 
-from .models import CrawledPlace, PlaceSource, get_dining_session
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.expression import UnaryExpression
+
+from .agents.fuzzy_match import MATCH_DISTANCE_M, is_fuzzy_match
+from .facet_index import mark_facet_index_stale, seed_signature
+from .metrics import traced
+from .models import CrawledPlace, ParkingLot, PlaceSource, PlaceTombstone, dining_write_lock, get_dining_session
+from .parking_index import add_parking_lots, invalidate_parking_index, update_nearby_parking
+from .place_cluster import GridDeltas, crawled_type
+from .tile_cache import in_bounds, in_tile, invalidate_tiles, mark_tiles_stale, tile_bounds, tiled
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 500
+TOMBSTONE_TTL_DAYS = float(os.getenv("DINING_TOMBSTONE_TTL_DAYS", "30"))
+DELTA_MAX_ROWS = int(os.getenv("DINING_DELTA_MAX_ROWS", "5000"))
+DELTA_OVERLAP = timedelta(seconds=2)  # re-send the edge so a clock step between writers cannot hide a row
+
+
+def encode_cursor(updated_at: datetime, place_id: int) -> str:
+    """Opaque keyset cursor for (updated_at, id)."""
+    raw = f"{updated_at.isoformat()}|{place_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError on malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts, place_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(place_id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {token!r}") from e
+
 
-def find_cached_places(session, bounds: dict | None = None, max_age_hours: int = 24) -> list[dict]:
-    """Find cached crawled places within bounds and within maxAge hours."""
-    since = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+def iter_crawled_chunks(
+    session,
+    bounds: dict | None = None,
+    since: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[list[CrawledPlace]]:
+    """Yield CrawledPlace chunks (sources preloaded) in (updated_at, id) order.
 
+    Keyset pagination — each chunk is a fresh indexed range scan that starts
+    after the last row of the previous one, so memory stays at one chunk.
+    """
     query = session.query(CrawledPlace).filter(
-        CrawledPlace.updated_at >= since,
         CrawledPlace.lat.isnot(None),
         CrawledPlace.lng.isnot(None),
     )
+    if since is not None:
+        query = query.filter(CrawledPlace.updated_at >= since)
+    if bounds:
+        query = query.filter(
+            CrawledPlace.lat >= bounds["swLat"],
+            CrawledPlace.lat <= bounds["neLat"],
+            CrawledPlace.lng >= bounds["swLng"],
+            CrawledPlace.lng <= bounds["neLng"],
+        )
+    query = query.options(selectinload(CrawledPlace.sources)).order_by(
+        CrawledPlace.updated_at, CrawledPlace.id
+    )
+
+    while True:
+        page = query
+        if after is not None:
+            page = page.filter(or_(
+                CrawledPlace.updated_at > after[0],
+                and_(CrawledPlace.updated_at == after[0], CrawledPlace.id > after[1]),
+            ))
+        held = set(session.identity_map.keys())
+        chunk = page.limit(chunk_size).all()
+        if not chunk:
+            return
+        yield chunk
+        after = (chunk[-1].updated_at, chunk[-1].id)
+        # Detach what this chunk loaded (sources cascade) so it can be freed;
+        # objects the caller already had in the session stay attached
+        for cp in chunk:
+            if session.identity_key(instance=cp) not in held:
+                session.expunge(cp)
+        if len(chunk) < chunk_size:
+            return
+
 
+def diningcode_ranks(session, bounds: dict | None = None) -> dict[int, int]:
+    """DiningCode rank per crawled place id (1 = best score), computed in SQL.
+
+    ROW_NUMBER over the indexed dc_score column, ties broken by id — the
+    order rank_by_diningcode always used — so reads never touch the JSON.
+    """
+    source = PlaceSource.source
+    if bounds:
+        # Left alone, SQLite walks (source, dc_score) over every DiningCode row
+        # and filters by bounds afterwards. A unary + on source disqualifies that
+        # index, so the scan starts from the lat/lng range instead (street
+        # viewport over 100k places: 177ms → 7ms in bench/diningcode_rank.py).
+        source = UnaryExpression(source, operator=operators.custom_op("+"))
+    rank = func.row_number().over(order_by=(PlaceSource.dc_score.desc(), CrawledPlace.id))
+    query = session.query(CrawledPlace.id, rank).join(
+        PlaceSource, PlaceSource.crawled_place_id == CrawledPlace.id
+    ).filter(
+        source == "diningcode",
+        PlaceSource.dc_score.isnot(None),
+        CrawledPlace.lat.isnot(None),
+        CrawledPlace.lng.isnot(None),
+    )
     if bounds:
         query = query.filter(
             CrawledPlace.lat >= bounds["swLat"],
@@ -25,111 +126,403 @@ def find_cached_places(session, bounds: dict | None = None, max_age_hours: int =
             CrawledPlace.lng >= bounds["swLng"],
             CrawledPlace.lng <= bounds["neLng"],
         )
+    return dict(query.all())
 
-    cached = query.all()
-
-    results = []
-    for cp in cached:
-        dc_source = next((s for s in cp.sources if s.source == "diningcode"), None)
-        primary = dc_source or (cp.sources[0] if cp.sources else None)
-        results.append({
-            "name": cp.name,
-            "category": cp.category,
-            "description": cp.description,
-            "address": cp.address,
-            "lat": cp.lat,
-            "lng": cp.lng,
-            "rating": primary.rating if primary else None,
-            "reviewCount": primary.review_count if primary else None,
-            "source": primary.source if primary else "cache",
-            "sourceUrl": primary.source_url if primary else None,
-            "snippet": primary.snippet if primary else None,
-            "tags": cp.tags,
-            "metadata": dc_source.metadata_ if dc_source else None,
-        })
-
-    return results
 
+def _dc_score(src: dict) -> float | None:
+    """Numeric DiningCode score from a source dict's metadata JSON (None for other sources)."""
+    if src.get("source") != "diningcode" or not src.get("metadata"):
+        return None
+    try:
+        score = json.loads(src["metadata"]).get("score")
+        return None if score is None else float(score)
+    except (ValueError, TypeError, AttributeError):
+        return None
 
-def save_crawled_places(session, places: list[dict]) -> None:
-    """Save merged crawled places to DB (upsert by name)."""
-    for place in places:
-        try:
-            existing = session.query(CrawledPlace).filter(
-                CrawledPlace.name == place["name"]
+
+def _cached_dict(cp: CrawledPlace) -> dict:
+    dc_source = next((s for s in cp.sources if s.source == "diningcode"), None)
+    primary = dc_source or (cp.sources[0] if cp.sources else None)
+    return {
+        "name": cp.name,
+        "category": cp.category,
+        "description": cp.description,
+        "address": cp.address,
+        "lat": cp.lat,
+        "lng": cp.lng,
+        "rating": primary.rating if primary else None,
+        "reviewCount": primary.review_count if primary else None,
+        "source": primary.source if primary else "cache",
+        "sourceUrl": primary.source_url if primary else None,
+        "snippet": primary.snippet if primary else None,
+        "tags": cp.tags,
+        "metadata": dc_source.metadata_ if dc_source else None,
+    }
+
+
+def _since(max_age_hours: float | None) -> datetime | None:
+    # None = stale-while-revalidate: keep old rows, the refresh scheduler updates them
+    if max_age_hours is None:
+        return None
+    return datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+
+
+def iter_cached_places(
+    session, bounds: dict | None = None, max_age_hours: float | None = 24, chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict]:
+    """Streaming variant of find_cached_places."""
+    for chunk in iter_crawled_chunks(session, bounds, since=_since(max_age_hours), chunk_size=chunk_size):
+        for cp in chunk:
+            yield _cached_dict(cp)
+
+
+def _load_cached_tile(session, tile: tuple[int, int]) -> tuple[list, list[int]]:
+    rows = [
+        (cp.updated_at, cp.id, _cached_dict(cp))
+        for chunk in iter_crawled_chunks(session, tile_bounds(tile))
+        for cp in chunk
+        if in_tile(cp.lat, cp.lng, tile)
+    ]
+    return rows, [pid for _, pid, _ in rows]
+
+
+@traced("place_cache.find")
+def find_cached_places(
+    session, bounds: dict | None = None, max_age_hours: float = 24, include_stale: bool = False
+) -> list[dict]:
+    """Find cached crawled places within bounds and within maxAge hours.
+
+    include_stale serves rows past maxAge as well (see refresh.py). Bounded
+    lookups are answered from the tile cache, which holds every row of a
+    tile; the maxAge window is applied per call, so a cached tile never
+    serves a row older than the caller allows.
+    """
+    since = None if include_stale else _since(max_age_hours)
+    rows = tiled(session, "cached", bounds, lambda tile: _load_cached_tile(session, tile)) if bounds else None
+    if rows is None:
+        return list(iter_cached_places(session, bounds, None if include_stale else max_age_hours))
+    if since is not None:
+        since = since.replace(tzinfo=None)
+    rows = sorted(
+        (r for r in rows if (since is None or (r[0] is not None and r[0] >= since))
+         and in_bounds(r[2]["lat"], r[2]["lng"], bounds)),
+        key=lambda r: (r[0] is not None, r[0], r[1]),
+    )
+    return [dict(d) for _, _, d in rows]
+
+
+def find_cached_places_page(
+    session,
+    bounds: dict | None = None,
+    max_age_hours: float | None = 24,
+    cursor: str | None = None,
+    limit: int = CHUNK_SIZE,
+) -> tuple[list[dict], str | None]:
+    """One page of cached places plus the cursor for the next page (None when done)."""
+    after = decode_cursor(cursor) if cursor else None
+    chunk = next(iter_crawled_chunks(session, bounds, since=_since(max_age_hours), after=after, chunk_size=limit), [])
+    next_cursor = encode_cursor(chunk[-1].updated_at, chunk[-1].id) if len(chunk) == limit else None
+    return [_cached_dict(cp) for cp in chunk], next_cursor
+
+
+# --------------- Delta sync ---------------
+
+
+def _sig_hash(signature: tuple) -> str:
+    return hashlib.sha1(repr(signature).encode()).hexdigest()[:12]
+
+
+def encode_watermark(ts: datetime, seed_sig: tuple) -> str:
+    """Opaque delta-sync watermark: last write seen plus the seed tables it was taken against."""
+    raw = f"{ts.replace(tzinfo=None).isoformat()}|{_sig_hash(seed_sig)}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_watermark(token: str) -> tuple[datetime, str]:
+    """Inverse of encode_watermark (naive UTC, seed hash). Raises ValueError on malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts, sig = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), sig
+    except Exception as e:
+        raise ValueError(f"invalid watermark: {token!r}") from e
+
+
+def watermark_matches_seed(sig_hash: str, seed_sig: tuple) -> bool:
+    return sig_hash == _sig_hash(seed_sig)
+
+
+def data_watermark(session) -> datetime:
+    """Latest crawled write or deletion (naive UTC; the epoch for an empty db)."""
+    updated = session.query(func.max(CrawledPlace.updated_at)).scalar()
+    deleted = session.query(func.max(PlaceTombstone.deleted_at)).scalar()
+    return max((t.replace(tzinfo=None) for t in (updated, deleted) if t), default=datetime(1970, 1, 1))
+
+
+def places_version(session, bounds: dict) -> tuple:
+    """Cheap fingerprint of what /api/places returns for ``bounds`` (ETag input).
+
+    Every crawled write bumps updated_at (merges bump the keeper), deletions
+    drop the count and seed reloads change the seed signature.
+    """
+    crawled = session.query(
+        func.count(CrawledPlace.id), func.max(CrawledPlace.updated_at), func.max(CrawledPlace.id)
+    ).filter(
+        CrawledPlace.lat >= bounds["swLat"],
+        CrawledPlace.lat <= bounds["neLat"],
+        CrawledPlace.lng >= bounds["swLng"],
+        CrawledPlace.lng <= bounds["neLng"],
+    ).one()
+    return tuple(crawled), seed_signature(session)
+
+
+def crawled_changes(
+    session, since: datetime, limit: int = DELTA_MAX_ROWS
+) -> tuple[list[CrawledPlace], list[PlaceTombstone]] | None:
+    """Crawled places written and tombstones recorded since ``since`` (everywhere, sources preloaded).
+
+    None when more than ``limit`` places changed or the tombstones no longer
+    reach back that far — the caller sends a full reset instead.
+    """
+    if since < datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=TOMBSTONE_TTL_DAYS):
+        return None
+    edge = since - DELTA_OVERLAP
+    changed = session.query(CrawledPlace).options(selectinload(CrawledPlace.sources)).filter(
+        CrawledPlace.updated_at > edge
+    ).order_by(CrawledPlace.updated_at, CrawledPlace.id).limit(limit + 1).all()
+    removed = session.query(PlaceTombstone).filter(
+        PlaceTombstone.place_kind == "crawled", PlaceTombstone.deleted_at > edge
+    ).limit(limit + 1).all()
+    if len(changed) > limit or len(removed) > limit:
+        return None
+    return changed, removed
+
+
+def record_tombstones(session, kind: str, places: list[tuple[int, float | None, float | None]]) -> None:
+    """Remember deleted (id, lat, lng) places in the caller's transaction; prunes ones past the TTL."""
+    if not places:
+        return
+    now = datetime.now(timezone.utc)
+    session.add_all([
+        PlaceTombstone(place_kind=kind, place_id=pid, lat=lat, lng=lng, deleted_at=now) for pid, lat, lng in places
+    ])
+    session.query(PlaceTombstone).filter(
+        PlaceTombstone.deleted_at < now - timedelta(days=TOMBSTONE_TTL_DAYS)
+    ).delete(synchronize_session=False)
+
+
+def notify_places_changed() -> None:
+    """Post-write hook: nudge the facet index and republish the shared place snapshot when enabled."""
+    mark_facet_index_stale()
+    mark_tiles_stale()
+    if os.getenv("DINING_SNAPSHOT_DIR"):
+        from .place_snapshot import request_snapshot_rebuild
+
+        request_snapshot_rebuild()
+
+
+def find_matching_place(session, place: dict) -> CrawledPlace | None:
+    """Stored place that fuzzy-matches ``place``: exact name first, then nearby similar names."""
+    existing = session.query(CrawledPlace).filter(CrawledPlace.name == place["name"]).first()
+    if existing or place.get("lat") is None or place.get("lng") is None:
+        return existing
+
+    # Candidates within a ±MATCH_DISTANCE_M box; is_fuzzy_match applies the exact distance
+    dlat = MATCH_DISTANCE_M / 111_320
+    dlng = dlat / math.cos(math.radians(place["lat"]))
+    candidates = session.query(CrawledPlace).filter(
+        CrawledPlace.lat.between(place["lat"] - dlat, place["lat"] + dlat),
+        CrawledPlace.lng.between(place["lng"] - dlng, place["lng"] + dlng),
+    ).all()
+    for cp in candidates:
+        if is_fuzzy_match(place, {"name": cp.name, "lat": cp.lat, "lng": cp.lng}):
+            return cp
+    return None
+
+
+def _upsert_crawled_place(session, place: dict, grid: GridDeltas) -> list[tuple[float | None, float | None]]:
+    """Insert or update one crawled place in the caller's transaction (no commit).
+
+    Grid cell changes go into ``grid``; the caller applies it before committing.
+    Returns the coordinates it was and is now at, for tile invalidation.
+    """
+    existing = find_matching_place(session, place)
+
+    if existing:
+        old_cell = (existing.lat, existing.lng, crawled_type(existing.place_type))
+
+        # Update main record
+        if place.get("category"):
+            existing.category = place["category"]
+        if place.get("description"):
+            existing.description = place["description"]
+        if place.get("address"):
+            existing.address = place["address"]
+        if place.get("lat"):
+            existing.lat = place["lat"]
+        if place.get("lng"):
+            existing.lng = place["lng"]
+        if place.get("tags"):
+            existing.tags = place["tags"]
+        if place.get("placeType"):
+            existing.place_type = place["placeType"]
+        existing.updated_at = datetime.now(timezone.utc)
+        grid.move(old_cell, (existing.lat, existing.lng, crawled_type(existing.place_type)))
+        if old_cell[:2] != (existing.lat, existing.lng):
+            update_nearby_parking(session, "crawled", [(existing.id, existing.lat, existing.lng)])
+
+        # Upsert sources
+        for src in place.get("sources", []):
+            existing_src = session.query(PlaceSource).filter(
+                PlaceSource.crawled_place_id == existing.id,
+                PlaceSource.source == src["source"],
             ).first()
 
-            if existing:
-                # Update main record
-                if place.get("category"):
-                    existing.category = place["category"]
-                if place.get("description"):
-                    existing.description = place["description"]
-                if place.get("address"):
-                    existing.address = place["address"]
-                if place.get("lat"):
-                    existing.lat = place["lat"]
-                if place.get("lng"):
-                    existing.lng = place["lng"]
-                if place.get("tags"):
-                    existing.tags = place["tags"]
-                if place.get("placeType"):
-                    existing.place_type = place["placeType"]
-                existing.updated_at = datetime.now(timezone.utc)
-
-                # Upsert sources
-                for src in place.get("sources", []):
-                    existing_src = session.query(PlaceSource).filter(
-                        PlaceSource.crawled_place_id == existing.id,
-                        PlaceSource.source == src["source"],
-                    ).first()
-
-                    if existing_src:
-                        existing_src.source_url = src.get("sourceUrl")
-                        existing_src.rating = src.get("rating")
-                        existing_src.review_count = src.get("reviewCount")
-                        existing_src.snippet = src.get("snippet")
-                        existing_src.metadata_ = src.get("metadata")
-                        existing_src.crawled_at = datetime.now(timezone.utc)
-                    else:
-                        new_src = PlaceSource(
-                            crawled_place_id=existing.id,
-                            source=src["source"],
-                            source_url=src.get("sourceUrl"),
-                            rating=src.get("rating"),
-                            review_count=src.get("reviewCount"),
-                            snippet=src.get("snippet"),
-                            metadata_=src.get("metadata"),
-                        )
-                        session.add(new_src)
+            if existing_src:
+                existing_src.source_url = src.get("sourceUrl")
+                existing_src.rating = src.get("rating")
+                existing_src.review_count = src.get("reviewCount")
+                existing_src.snippet = src.get("snippet")
+                existing_src.metadata_ = src.get("metadata")
+                existing_src.dc_score = _dc_score(src)
+                existing_src.crawled_at = datetime.now(timezone.utc)
             else:
-                # Create new
-                cp = CrawledPlace(
-                    name=place["name"],
-                    category=place.get("category"),
-                    description=place.get("description"),
-                    address=place.get("address"),
-                    lat=place.get("lat"),
-                    lng=place.get("lng"),
-                    tags=place.get("tags"),
-                    place_type=place.get("placeType"),
+                new_src = PlaceSource(
+                    crawled_place_id=existing.id,
+                    source=src["source"],
+                    source_url=src.get("sourceUrl"),
+                    rating=src.get("rating"),
+                    review_count=src.get("reviewCount"),
+                    snippet=src.get("snippet"),
+                    metadata_=src.get("metadata"),
+                    dc_score=_dc_score(src),
                 )
-                session.add(cp)
-                session.flush()  # Get the ID
-
-                for src in place.get("sources", []):
-                    ps = PlaceSource(
-                        crawled_place_id=cp.id,
-                        source=src["source"],
-                        source_url=src.get("sourceUrl"),
-                        rating=src.get("rating"),
-                        review_count=src.get("reviewCount"),
-                        snippet=src.get("snippet"),
-                        metadata_=src.get("metadata"),
-                    )
-                    session.add(ps)
+                session.add(new_src)
+        return [old_cell[:2], (existing.lat, existing.lng)]
+    else:
+        # Create new
+        cp = CrawledPlace(
+            name=place["name"],
+            category=place.get("category"),
+            description=place.get("description"),
+            address=place.get("address"),
+            lat=place.get("lat"),
+            lng=place.get("lng"),
+            tags=place.get("tags"),
+            place_type=place.get("placeType"),
+        )
+        session.add(cp)
+        session.flush()  # Get the ID
+        grid.add(cp.lat, cp.lng, crawled_type(cp.place_type), 1)
+        update_nearby_parking(session, "crawled", [(cp.id, cp.lat, cp.lng)])
+
+        for src in place.get("sources", []):
+            ps = PlaceSource(
+                crawled_place_id=cp.id,
+                source=src["source"],
+                source_url=src.get("sourceUrl"),
+                rating=src.get("rating"),
+                review_count=src.get("reviewCount"),
+                snippet=src.get("snippet"),
+                metadata_=src.get("metadata"),
+                dc_score=_dc_score(src),
+            )
+            session.add(ps)
+        return [(cp.lat, cp.lng)]
+
 
+@traced("place_cache.save")
+def save_crawled_places(session, places: list[dict]) -> None:
+    """Save merged crawled places to DB (upsert by name, or a fuzzy match within 200m)."""
+    for place in places:
+        with dining_write_lock():
+            try:
+                grid = GridDeltas()
+                touched = _upsert_crawled_place(session, place, grid)
+                grid.apply(session)
+                session.commit()
+                invalidate_tiles(touched)
+            except Exception as e:
+                session.rollback()
+                logger.error('Failed to save place "%s": %s', place.get("name"), e)
+
+    notify_places_changed()
+
+
+@traced("place_cache.save_bulk")
+def save_crawled_places_bulk(session, places: list[dict], chunk_size: int = CHUNK_SIZE) -> int:
+    """save_crawled_places for batch jobs: one write transaction per chunk instead of per place.
+
+    A failing chunk is retried place by place so one bad row doesn't drop
+    its neighbours. Returns the number of places saved.
+    """
+    saved = 0
+    for i in range(0, len(places), chunk_size):
+        chunk = places[i:i + chunk_size]
+        with dining_write_lock():
+            try:
+                grid = GridDeltas()
+                touched = [pt for place in chunk for pt in _upsert_crawled_place(session, place, grid)]
+                grid.apply(session)
+                session.commit()
+                invalidate_tiles(touched)
+                saved += len(chunk)
+                continue
+            except Exception as e:
+                session.rollback()
+                logger.warning("Bulk save of %d places failed (%s); retrying one by one", len(chunk), e)
+        for place in chunk:
+            with dining_write_lock():
+                try:
+                    grid = GridDeltas()
+                    touched = _upsert_crawled_place(session, place, grid)
+                    grid.apply(session)
+                    session.commit()
+                    invalidate_tiles(touched)
+                    saved += 1
+                except Exception as e:
+                    session.rollback()
+                    logger.error('Failed to save place "%s": %s', place.get("name"), e)
+
+    if saved:
+        notify_places_changed()
+    return saved
+
+
+def save_parking_lots(session, lots: list[dict]) -> int:
+    """Insert LLM-suggested parking lots that aren't stored yet (by name). Returns count added."""
+    added = []
+    with dining_write_lock():
+        try:
+            grid = GridDeltas()
+            for p in lots:
+                name = p["name"].strip()
+                if session.query(ParkingLot.id).filter(ParkingLot.name == name).first():
+                    continue
+                lot = ParkingLot(
+                    name=name,
+                    type=p.get("type") or "공영",
+                    address=p.get("address"),
+                    lat=p["lat"],
+                    lng=p["lng"],
+                    capacity=p.get("capacity") or 50,
+                    hourly_rate=p.get("hourlyRate") or 1000,
+                    description=p.get("address") or name,
+                    operating_hours=p.get("operatingHours") or "00:00~24:00",
+                )
+                session.add(lot)
+                session.flush()
+                grid.add(lot.lat, lot.lng, "parking", 1)
+                added.append(lot)
+            grid.apply(session)
+            add_parking_lots(session, added)
             session.commit()
         except Exception as e:
             session.rollback()
-            logger.error('Failed to save place "%s": %s', place.get("name"), e)
+            invalidate_parking_index()
+            logger.error("Failed to save parking lots: %s", e)
+            return 0
+
+    if added:
+        notify_places_changed()
+    return len(added)
@@ -0,0 +1,219 @@
+"""Zoom-aware marker clustering over precomputed grid aggregates."""
+
+import math
+import logging
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm.attributes import get_history
+
+from .models import Cafe, CrawledPlace, ParkingLot, PlaceGridCell, Restaurant
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_MIN_ZOOM = 6
+CLUSTER_MAX_ZOOM = 15  # above this, clients get individual places
+CELLS_PER_TILE = 4  # grid cells per map tile edge
+
+
+def _cell_size(zoom: int) -> float:
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def cell_of(lat: float, lng: float, zoom: int) -> tuple[int, int]:
+    """Return the (gx, gy) grid cell containing a coordinate at a zoom level."""
+    size = _cell_size(zoom)
+    return math.floor(lng / size), math.floor(lat / size)
+
+
+def crawled_type(place_type: str | None) -> str:
+    """Grid bucket for a crawled place (same default as map_crawled_to_places)."""
+    return place_type or "restaurant"
+
+
+def _grid_upsert():
+    table = PlaceGridCell.__table__
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["zoom", "gx", "gy", "place_type"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            "sum_lat": table.c.sum_lat + stmt.excluded.sum_lat,
+            "sum_lng": table.c.sum_lng + stmt.excluded.sum_lng,
+        },
+    )
+
+
+_GRID_UPSERT = _grid_upsert()  # built once; executed with one parameter row per cell
+
+
+class GridDeltas:
+    """Grid changes collected over a write transaction, applied in one executemany.
+
+    Deltas to the same cell are summed, so a place that moves within a cell
+    at the coarse zooms costs nothing there.
+    """
+
+    def __init__(self):
+        self._cells: dict[tuple, list] = {}  # (zoom, gx, gy, type) → [count, sum_lat, sum_lng]
+
+    def add(self, lat: float | None, lng: float | None, place_type: str, delta: int) -> None:
+        """Add (delta=1) or remove (delta=-1) one place at every zoom level."""
+        if lat is None or lng is None:
+            return
+        for zoom in range(CLUSTER_MIN_ZOOM, CLUSTER_MAX_ZOOM + 1):
+            acc = self._cells.setdefault((zoom, *cell_of(lat, lng, zoom), place_type), [0, 0.0, 0.0])
+            acc[0] += delta
+            acc[1] += lat * delta
+            acc[2] += lng * delta
+
+    def move(self, old: tuple | None, new: tuple | None) -> None:
+        """Move a place between grid buckets. old/new are (lat, lng, place_type) or None."""
+        if old == new:
+            return
+        if old:
+            self.add(*old, delta=-1)
+        if new:
+            self.add(*new, delta=1)
+
+    def apply(self, session) -> None:
+        """Write the collected deltas in the caller's transaction (a session, or
+        the connection of a flush in the seed-table hooks below) and reset."""
+        rows = [
+            {"zoom": zoom, "gx": gx, "gy": gy, "place_type": ptype,
+             "count": count, "sum_lat": sum_lat, "sum_lng": sum_lng}
+            for (zoom, gx, gy, ptype), (count, sum_lat, sum_lng) in self._cells.items()
+            if count or sum_lat or sum_lng
+        ]
+        self._cells = {}
+        if rows:
+            session.execute(_GRID_UPSERT, rows)
+
+
+def update_place_grid(session, lat: float | None, lng: float | None, place_type: str, delta: int) -> None:
+    """Add (delta=1) or remove (delta=-1) one place from every zoom level.
+
+    Runs inside the caller's transaction; the caller commits. Batch writers
+    collect into a GridDeltas instead.
+    """
+    grid = GridDeltas()
+    grid.add(lat, lng, place_type, delta)
+    grid.apply(session)
+
+
+def move_in_place_grid(session, old: tuple | None, new: tuple | None) -> None:
+    """Move a place between grid buckets. old/new are (lat, lng, place_type) or None."""
+    grid = GridDeltas()
+    grid.move(old, new)
+    grid.apply(session)
+
+
+# --------------- Seed table hooks ---------------
+# Restaurant and Cafe rows have no write path in this package; ORM writes to
+# them (admin edits, seed scripts) keep the grid current through these mapper
+# events, within the flush's transaction. Bulk writes bypass them
+# (bulk_insert_mappings, Query.update, migrate_prisma): follow those with
+# rebuild_place_grid().
+
+_SEED_TYPES = {Restaurant: "restaurant", Cafe: "cafe"}
+
+
+def _previous(target, attr: str):
+    history = get_history(target, attr)
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    # Registered with active_history so an expired coordinate is loaded before
+    # it is overwritten, leaving the old cell in the history for _seed_updated
+    return value
+
+
+def _seed_inserted(mapper, connection, target):
+    update_place_grid(connection, target.lat, target.lng, _SEED_TYPES[mapper.class_], 1)
+
+
+def _seed_updated(mapper, connection, target):
+    place_type = _SEED_TYPES[mapper.class_]
+    old = (_previous(target, "lat"), _previous(target, "lng"), place_type)
+    move_in_place_grid(connection, old, (target.lat, target.lng, place_type))
+
+
+def _seed_deleted(mapper, connection, target):
+    # before_delete: the row (and its coordinates) can still be loaded
+    update_place_grid(connection, target.lat, target.lng, _SEED_TYPES[mapper.class_], -1)
+
+
+for _model in _SEED_TYPES:
+    event.listen(_model, "after_insert", _seed_inserted)
+    event.listen(_model, "after_update", _seed_updated)
+    event.listen(_model, "before_delete", _seed_deleted)
+    for _attr in (_model.lat, _model.lng):
+        event.listen(_attr, "set", _keep_old_value, active_history=True)
+
+
+def rebuild_place_grid(session) -> int:
+    """Recompute all grid aggregates from scratch (after seeding or bulk imports)."""
+    points: list[tuple[float, float, str]] = []
+    points += [(r.lat, r.lng, "restaurant") for r in session.query(Restaurant.lat, Restaurant.lng)]
+    points += [(c.lat, c.lng, "cafe") for c in session.query(Cafe.lat, Cafe.lng)]
+    points += [(p.lat, p.lng, "parking") for p in session.query(ParkingLot.lat, ParkingLot.lng)]
+    points += [
+        (cp.lat, cp.lng, crawled_type(cp.place_type))
+        for cp in session.query(CrawledPlace.lat, CrawledPlace.lng, CrawledPlace.place_type).filter(
+            CrawledPlace.lat.isnot(None), CrawledPlace.lng.isnot(None)
+        )
+    ]
+
+    session.query(PlaceGridCell).delete()
+    for zoom in range(CLUSTER_MIN_ZOOM, CLUSTER_MAX_ZOOM + 1):
+        counts: Counter = Counter()
+        sums: dict[tuple, list[float]] = {}
+        for lat, lng, ptype in points:
+            key = (*cell_of(lat, lng, zoom), ptype)
+            counts[key] += 1
+            acc = sums.setdefault(key, [0.0, 0.0])
+            acc[0] += lat
+            acc[1] += lng
+        session.bulk_insert_mappings(PlaceGridCell, [
+            {"zoom": zoom, "gx": k[0], "gy": k[1], "place_type": k[2],
+             "count": n, "sum_lat": sums[k][0], "sum_lng": sums[k][1]}
+            for k, n in counts.items()
+        ])
+    session.commit()
+    logger.info("[cluster] rebuilt grid from %d places", len(points))
+    return len(points)
+
+
+def cluster_places(session, bounds: dict, zoom: int) -> list[dict]:
+    """Return clusters (count, centroid, type breakdown) for the viewport at a zoom level."""
+    zoom = max(CLUSTER_MIN_ZOOM, min(CLUSTER_MAX_ZOOM, int(zoom)))
+    min_gx, min_gy = cell_of(bounds["swLat"], bounds["swLng"], zoom)
+    max_gx, max_gy = cell_of(bounds["neLat"], bounds["neLng"], zoom)
+
+    rows = session.query(PlaceGridCell).filter(
+        PlaceGridCell.zoom == zoom,
+        PlaceGridCell.gx.between(min_gx, max_gx),
+        PlaceGridCell.gy.between(min_gy, max_gy),
+        PlaceGridCell.count > 0,
+    )
+
+    cells: dict[tuple[int, int], dict] = {}
+    for row in rows:
+        c = cells.setdefault((row.gx, row.gy), {"count": 0, "sumLat": 0.0, "sumLng": 0.0, "types": {}})
+        c["count"] += row.count
+        c["sumLat"] += row.sum_lat
+        c["sumLng"] += row.sum_lng
+        c["types"][row.place_type] = row.count
+
+    return [
+        {
+            "id": f"{zoom}:{gx}:{gy}",
+            "lat": round(c["sumLat"] / c["count"], 6),
+            "lng": round(c["sumLng"] / c["count"], 6),
+            "count": c["count"],
+            "types": c["types"],
+        }
+        for (gx, gy), c in cells.items()
+    ]
@@ -1,15 +1,16 @@
 """Place mapper — convert DB models to API response dicts."""
 
-import json
 import re
+from typing import Iterable, Iterator
 
+from .agents.fuzzy_match import SeedMatcher
+from .place_records import RECORD_TYPES, CafePlace, ParkingPlace, PlaceRecord, RestaurantPlace
 
-def map_seed_places(restaurants, cafes, parking_lots) -> list[dict]:
-    """Map seed data (ORM objects) to Place dicts."""
-    result = []
 
+def iter_seed_places(restaurants, cafes, parking_lots) -> Iterator[dict]:
+    """Map seed data (ORM objects) to Place dicts, one at a time."""
     for r in restaurants:
-        result.append({
+        yield {
             "id": r.id,
             "name": r.name,
             "description": r.description,
@@ -24,10 +25,10 @@ def map_seed_places(restaurants, cafes, parking_lots) -> list[dict]:
             "reviewCount": r.review_count,
             "parkingAvailable": r.parking_available,
             "nearbyParking": r.nearby_parking,
-        })
+        }
 
     for c in cafes:
-        result.append({
+        yield {
             "id": c.id,
             "name": c.name,
             "description": c.description,
@@ -42,10 +43,10 @@ def map_seed_places(restaurants, cafes, parking_lots) -> list[dict]:
             "reviewCount": c.review_count,
             "parkingAvailable": c.parking_available,
             "nearbyParking": c.nearby_parking,
-        })
+        }
 
     for p in parking_lots:
-        result.append({
+        yield {
             "id": p.id,
             "name": p.name,
             "description": p.description,
@@ -62,17 +63,19 @@ def map_seed_places(restaurants, cafes, parking_lots) -> list[dict]:
             "extraRate": p.extra_rate,
             "freeNote": p.free_note,
             "operatingHours": p.operating_hours,
-        })
+        }
 
-    return result
 
+def map_seed_places(restaurants, cafes, parking_lots) -> list[dict]:
+    """Map seed data (ORM objects) to Place dicts."""
+    return list(iter_seed_places(restaurants, cafes, parking_lots))
 
-def map_crawled_to_places(crawled_places, llm_type_map: dict | None = None) -> list[dict]:
-    """Map crawled place ORM objects to Place dicts."""
+
+def iter_crawled_places(crawled_places, llm_type_map: dict | None = None) -> Iterator[dict]:
+    """Map crawled place ORM objects to Place dicts, one at a time."""
     if llm_type_map is None:
         llm_type_map = {}
 
-    result = []
     for cp in crawled_places:
         if cp.lat is None or cp.lng is None:
             continue
@@ -109,42 +112,111 @@ def map_crawled_to_places(crawled_places, llm_type_map: dict | None = None) -> l
             base["type"] = "restaurant"
             base["category"] = cp.category or "맛집"
 
-        result.append(base)
+        yield base
+
+
+def map_crawled_to_places(crawled_places, llm_type_map: dict | None = None) -> list[dict]:
+    """Map crawled place ORM objects to Place dicts."""
+    return list(iter_crawled_places(crawled_places, llm_type_map))
+
+
+def iter_seed_records(restaurants, cafes, parking_lots) -> Iterator[PlaceRecord]:
+    """Slotted-record counterpart of iter_seed_places."""
+    for r in restaurants:
+        yield RestaurantPlace(
+            id=r.id, name=r.name, description=r.description, lat=r.lat, lng=r.lng,
+            category=r.category, price_range=r.price_range, atmosphere=r.atmosphere,
+            good_for=r.good_for, rating=r.rating, review_count=r.review_count,
+            parking_available=r.parking_available, nearby_parking=r.nearby_parking,
+        )
+
+    for c in cafes:
+        yield CafePlace(
+            id=c.id, name=c.name, description=c.description, lat=c.lat, lng=c.lng,
+            specialty=c.specialty, price_range=c.price_range, atmosphere=c.atmosphere,
+            good_for=c.good_for, rating=c.rating, review_count=c.review_count,
+            parking_available=c.parking_available, nearby_parking=c.nearby_parking,
+        )
+
+    for p in parking_lots:
+        yield ParkingPlace(
+            id=p.id, name=p.name, description=p.description, lat=p.lat, lng=p.lng,
+            parking_type=p.type, address=p.address, capacity=p.capacity, hourly_rate=p.hourly_rate,
+            base_time=p.base_time, base_rate=p.base_rate, extra_time=p.extra_time,
+            extra_rate=p.extra_rate, free_note=p.free_note, operating_hours=p.operating_hours,
+        )
 
-    return result
 
+_DEFAULT_LABELS = {"restaurant": "맛집", "cafe": "카페", "bar": "술집", "bakery": "빵집"}
 
-def rank_by_diningcode(crawled_as_places: list[dict], crawled_places) -> None:
-    """Add diningcodeRank to places based on DiningCode score."""
-    valid_crawled = [cp for cp in crawled_places if cp.lat is not None and cp.lng is not None]
 
-    with_scores = []
-    for i, p in enumerate(crawled_as_places):
-        if i >= len(valid_crawled):
-            break
-        dc_source = next((s for s in valid_crawled[i].sources if s.source == "diningcode"), None)
-        meta = dc_source.metadata_ if dc_source else None
-        score = None
-        if meta:
-            try:
-                score = json.loads(meta).get("score")
-            except Exception:
-                pass
-        if score is not None:
-            with_scores.append({"place": p, "score": score})
+def iter_crawled_records(crawled_places, llm_type_map: dict | None = None) -> Iterator[PlaceRecord]:
+    """Slotted-record counterpart of iter_crawled_places."""
+    if llm_type_map is None:
+        llm_type_map = {}
 
-    with_scores.sort(key=lambda x: x["score"], reverse=True)
+    for cp in crawled_places:
+        if cp.lat is None or cp.lng is None:
+            continue
 
-    for i, x in enumerate(with_scores):
-        if x["place"].get("type") != "parking":
-            x["place"]["diningcodeRank"] = i + 1
+        p_type = cp.place_type or llm_type_map.get(cp.name) or "restaurant"
+        if p_type not in _DEFAULT_LABELS:
+            p_type = "restaurant"
+        first_source = cp.sources[0] if cp.sources else None
+        label = cp.category or _DEFAULT_LABELS[p_type]
+
+        yield RECORD_TYPES[p_type](
+            crawled=True,
+            id=cp.id,
+            name=cp.name,
+            description=cp.description or (first_source.snippet if first_source else None) or "다이닝코드 크롤링",
+            lat=cp.lat,
+            lng=cp.lng,
+            price_range=cp.price_range or "미정",
+            atmosphere=cp.atmosphere or "미정",
+            good_for=cp.good_for or "미정",
+            rating=first_source.rating if first_source else 0,
+            review_count=first_source.review_count if first_source else 0,
+            parking_available=False,
+            nearby_parking=None,
+            tags=cp.tags,
+            category=label,
+            specialty=label,
+        )
+
+
+def rank_by_diningcode(crawled_as_places: list[dict], ranks: dict[int, int]) -> None:
+    """Add diningcodeRank to crawled places from place_cache.diningcode_ranks.
+
+    ``ranks`` maps crawled place id → rank over a superset (usually the same
+    bounds); ranks are renumbered 1..n over the places actually present, so
+    a filtered subset still starts at 1.
+    """
+    ranked = sorted((ranks[p["id"]], p) for p in crawled_as_places if p["id"] in ranks)
+    for i, (_, p) in enumerate(ranked):
+        if p.get("type") != "parking":
+            p["diningcodeRank"] = i + 1
 
 
 def deduplicate_places(seed_places: list[dict], crawled_as_places: list[dict]) -> list[dict]:
-    """Remove duplicate crawled places that match seed data by name."""
-    seed_names = {p["name"].lower() for p in seed_places}
-    unique_crawled = [p for p in crawled_as_places if p["name"].lower() not in seed_names]
-    return seed_places + unique_crawled
+    """Remove duplicate crawled places that fuzzy-match seed data (name similarity + 200m)."""
+    return seed_places + list(iter_unique_crawled(seed_places, crawled_as_places))
+
+
+def iter_unique_crawled(seed_places: list[dict], crawled_as_places: Iterable[dict]) -> Iterator[dict]:
+    """Streaming counterpart of deduplicate_places — yields only the crawled side."""
+    matcher = SeedMatcher(seed_places)
+    for p in crawled_as_places:
+        if not matcher.matches(p):
+            yield p
+
+
+_SEOUL_GU_RE = re.compile(r"^(서울특별시|서울)\s+(\S+[구군])")
+_METRO_GU_RE = re.compile(r"^(대구|부산|인천|광주|대전|울산)(광역시)?\s+(\S+[구군])")
+_PROVINCE_RE = re.compile(
+    r"^(경기도|충청[남북]도|전라[남북]도|경상[남북]도|강원도|제주특별자치도|세종특별자치시)\s*(\S+[시군구])?"
+)
+_ANY_REGION_RE = re.compile(r"(\S+[구군시])")
 
 
 def extract_region(address: str | None) -> str:
@@ -153,25 +225,22 @@ def extract_region(address: str | None) -> str:
         return "기타"
 
     # Metropolitan city + 구/군
-    m = re.match(r"^(서울특별시|서울)\s+(\S+[구군])", address)
+    m = _SEOUL_GU_RE.match(address)
     if m:
         return m.group(2)
 
     # Other metro cities
-    m = re.match(r"^(대구|부산|인천|광주|대전|울산)(광역시)?\s+(\S+[구군])", address)
+    m = _METRO_GU_RE.match(address)
     if m:
         return f"{m.group(1)} {m.group(3)}"
 
     # Province + city
-    m = re.match(
-        r"^(경기도|충청[남북]도|전라[남북]도|경상[남북]도|강원도|제주특별자치도|세종특별자치시)\s*(\S+[시군구])?",
-        address,
-    )
+    m = _PROVINCE_RE.match(address)
     if m:
         return f"{m.group(1)} {m.group(2)}" if m.group(2) else m.group(1)
 
     # Fallback
-    m = re.search(r"(\S+[구군시])", address)
+    m = _ANY_REGION_RE.search(address)
     if m:
         return m.group(1)
 
@@ -0,0 +1,172 @@
+"""Place merge — batch job that folds fuzzy duplicates in crawled_place into one row.
+
+find_duplicate_groups (MinHash/LSH + similarity + 200m) groups the stored
+places; in each group the place with the most sources (then the oldest)
+is kept. Its empty fields are filled from the duplicates, their sources
+are moved over (the newer crawl wins when both have the same source),
+menus are repointed, and the duplicates are deleted together with their
+grid counts and nearest-parking rows. The groups are found on a read
+session; each one is then merged in its own write transaction.
+
+Usage (from repo root):
+    python -m docs.samples.place_merge [--dry-run]
+"""
+
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from sqlalchemy import func, update
+
+from .agents.fuzzy_match import find_duplicate_groups
+from .models import (
+    CrawledPlace,
+    Menu,
+    NearbyParking,
+    PlaceSource,
+    dining_write_lock,
+    get_dining_read_session,
+    get_dining_session,
+    init_dining_db,
+)
+from .parking_index import update_nearby_parking
+from .place_cache import notify_places_changed, record_tombstones
+from .place_cluster import GridDeltas, crawled_type
+
+logger = logging.getLogger(__name__)
+
+_FILL_FIELDS = ("category", "description", "address", "lat", "lng", "phone", "price_range",
+                "atmosphere", "good_for", "image_url", "tags", "place_type")
+_SOURCE_FIELDS = ("source_url", "rating", "review_count", "snippet", "metadata_", "dc_score", "crawled_at")
+
+
+def find_merge_groups(session) -> list[list[dict]]:
+    """Duplicate groups as lists of {id, name, lat, lng, sources}, keeper first."""
+    rows = session.query(CrawledPlace.id, CrawledPlace.name, CrawledPlace.lat, CrawledPlace.lng).order_by(
+        CrawledPlace.id
+    ).all()
+    source_counts = dict(
+        session.query(PlaceSource.crawled_place_id, func.count(PlaceSource.id))
+        .group_by(PlaceSource.crawled_place_id)
+        .all()
+    )
+    places = [
+        {"id": r.id, "name": r.name, "lat": r.lat, "lng": r.lng, "sources": source_counts.get(r.id, 0)}
+        for r in rows
+    ]
+    groups = []
+    for indices in find_duplicate_groups(places):
+        group = [places[i] for i in indices]
+        group.sort(key=lambda p: (-p["sources"], p["id"]))
+        groups.append(group)
+    return groups
+
+
+def _merge_sources(session, keeper: CrawledPlace, dup: CrawledPlace) -> int:
+    by_source = {src.source: src for src in keeper.sources}
+    moved = 0
+    for src in session.query(PlaceSource).filter(PlaceSource.crawled_place_id == dup.id).all():
+        current = by_source.get(src.source)
+        if current is None:
+            src.crawled_place_id = keeper.id
+            by_source[src.source] = src
+            moved += 1
+        elif (src.crawled_at or datetime.min) > (current.crawled_at or datetime.min):
+            for field in _SOURCE_FIELDS:
+                setattr(current, field, getattr(src, field))
+    return moved
+
+
+def merge_group(session, keeper_id: int, duplicate_ids: list[int]) -> dict:
+    """Fold ``duplicate_ids`` into ``keeper_id`` in the caller's transaction (no commit).
+
+    Places deleted since the group was found are skipped.
+    """
+    keeper = session.get(CrawledPlace, keeper_id)
+    dups = session.query(CrawledPlace).filter(CrawledPlace.id.in_(duplicate_ids)).all() if keeper else []
+    if not dups:
+        return {"deleted": 0, "sourcesMoved": 0}
+    duplicate_ids = [dup.id for dup in dups]
+    old_cell = (keeper.lat, keeper.lng, crawled_type(keeper.place_type))
+    moved = 0
+    deleted = []
+    grid = GridDeltas()
+    for dup in dups:
+        for field in _FILL_FIELDS:
+            if getattr(keeper, field) in (None, "") and getattr(dup, field) not in (None, ""):
+                setattr(keeper, field, getattr(dup, field))
+        moved += _merge_sources(session, keeper, dup)
+        grid.add(dup.lat, dup.lng, crawled_type(dup.place_type), -1)
+        deleted.append((dup.id, dup.lat, dup.lng))
+    record_tombstones(session, "crawled", deleted)
+    session.flush()
+
+    # A menu the keeper already has stays on the duplicate and goes with it (ON DELETE CASCADE)
+    session.execute(
+        update(Menu).where(Menu.crawled_place_id.in_(duplicate_ids))
+        .values(crawled_place_id=keeper_id).prefix_with("OR IGNORE")
+    )
+    session.query(NearbyParking).filter(
+        NearbyParking.place_kind == "crawled", NearbyParking.place_id.in_(duplicate_ids)
+    ).delete(synchronize_session=False)
+    session.query(CrawledPlace).filter(CrawledPlace.id.in_(duplicate_ids)).delete(synchronize_session=False)
+
+    new_cell = (keeper.lat, keeper.lng, crawled_type(keeper.place_type))
+    grid.move(old_cell, new_cell)
+    grid.apply(session)
+    if old_cell[:2] != new_cell[:2]:
+        update_nearby_parking(session, "crawled", [(keeper.id, keeper.lat, keeper.lng)])
+    keeper.updated_at = datetime.now(timezone.utc)
+    return {"deleted": len(duplicate_ids), "sourcesMoved": moved}
+
+
+def merge_duplicates(dry_run: bool = False) -> dict:
+    """Find and merge every duplicate group in dining.db. Returns counts."""
+    stats = {"groups": 0, "deleted": 0, "sourcesMoved": 0, "failed": 0}
+    # The LSH pass only reads: keep it off the writer's single connection so
+    # other writers run in between, and lock per group below
+    read = get_dining_read_session()
+    try:
+        groups = find_merge_groups(read)
+    finally:
+        read.remove()
+    stats["groups"] = len(groups)
+
+    session = get_dining_session()
+    try:
+        for keeper, *dups in groups:
+            if dry_run:
+                logger.info("%s ← %s", keeper["name"], ", ".join(d["name"] for d in dups))
+                stats["deleted"] += len(dups)
+                continue
+            with dining_write_lock():
+                try:
+                    result = merge_group(session, keeper["id"], [d["id"] for d in dups])
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    stats["failed"] += 1
+                    logger.error('Failed to merge duplicates of "%s": %s', keeper["name"], e)
+                    continue
+            stats["deleted"] += result["deleted"]
+            stats["sourcesMoved"] += result["sourcesMoved"]
+    finally:
+        session.remove()
+
+    if stats["deleted"] and not dry_run:
+        notify_places_changed()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge fuzzy-duplicate crawled places in dining.db")
+    parser.add_argument("--dry-run", action="store_true", help="only log the groups that would be merged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_dining_db()
+    print(merge_duplicates(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
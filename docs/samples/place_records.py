@@ -0,0 +1,232 @@
+"""Compact slotted Place records and their JSON encoders.
+
+The records carry the same fields as the dicts built by ``place_mapper`` and
+encode to exactly the bytes that ``json.dumps(place_dict, **API_JSON_KWARGS)``
+produces, key order included. The API dict only exists for the moment it is
+handed to the encoder.
+"""
+
+import json
+from operator import attrgetter
+
+try:  # optional fast backend
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# Compact, insertion-ordered, UTF-8 — the same bytes Next.js' JSON.stringify sends
+API_JSON_KWARGS = {"ensure_ascii": False, "separators": (",", ":")}
+
+
+def _float_safe(v) -> bool:
+    """orjson and json only disagree on exponent floats (1e16 vs 1e+16) and NaN/Infinity."""
+    return v is None or not isinstance(v, float) or v == 0.0 or 1e-4 <= abs(v) < 1e16
+
+
+def _fast_safe(value) -> bool:
+    if isinstance(value, float):
+        return _float_safe(value)
+    if isinstance(value, dict):
+        return all(_fast_safe(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(_fast_safe(v) for v in value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return -(2 ** 63) <= value < 2 ** 64
+    return True
+
+
+def _backend_dumps(obj, fast: bool) -> bytes:
+    if fast and orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, **API_JSON_KWARGS).encode()
+
+
+def dumps(obj) -> bytes:
+    """Encode any API value; uses orjson when installed and byte-identical."""
+    return _backend_dumps(obj, orjson is not None and _fast_safe(obj))
+
+
+# --------------- Records ---------------
+
+
+def _compile_encoder(layout: tuple[tuple[str, str], ...]):
+    """Build the dict builder for a fixed (attr, apiKey) layout.
+
+    attrgetter + dict(zip(...)) stay in C; the result is handed straight to
+    the JSON backend and dropped.
+    """
+    keys = tuple(key for _, key in layout)
+    get_values = attrgetter(*(attr for attr, _ in layout))
+
+    def to_api(rec) -> dict:
+        d = dict(zip(keys, get_values(rec)))
+        if rec.diningcode_rank is not None:
+            d["diningcodeRank"] = rec.diningcode_rank
+        return d
+
+    return to_api
+
+
+class PlaceRecord:
+    """Base for slotted place records.
+
+    Supports the small mapping surface the rest of the code uses on place
+    dicts (``p["name"]``, ``p.get("type")``, ``p["diningcodeRank"] = n``).
+    """
+
+    __slots__ = ("crawled", "diningcode_rank")
+
+    TYPE = ""
+    SEED_LAYOUT: tuple[tuple[str, str], ...] = ()
+    CRAWLED_LAYOUT: tuple[tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._seed_to_api = staticmethod(_compile_encoder(cls.SEED_LAYOUT)) if cls.SEED_LAYOUT else None
+        cls._crawled_to_api = staticmethod(_compile_encoder(cls.CRAWLED_LAYOUT)) if cls.CRAWLED_LAYOUT else None
+        cls._ATTRS = {key: attr for attr, key in cls.SEED_LAYOUT + cls.CRAWLED_LAYOUT}
+        cls._ATTRS["diningcodeRank"] = "diningcode_rank"
+        cls._FIELDS = tuple(
+            s for klass in cls.__mro__ if klass is not PlaceRecord for s in getattr(klass, "__slots__", ())
+        )
+
+    def __init__(self, crawled: bool = False, **fields):
+        self.crawled = crawled
+        self.diningcode_rank = None
+        for attr in self._FIELDS:
+            setattr(self, attr, fields.get(attr))
+
+    def copy(self) -> "PlaceRecord":
+        """Field-for-field copy without diningcodeRank, for records shared through a cache."""
+        rec = object.__new__(type(self))
+        rec.crawled = self.crawled
+        rec.diningcode_rank = None
+        for attr in self._FIELDS:
+            setattr(rec, attr, getattr(self, attr))
+        return rec
+
+    def _layout(self):
+        return self.CRAWLED_LAYOUT if self.crawled else self.SEED_LAYOUT
+
+    def to_dict(self) -> dict:
+        """The camelCase API dict, identical to what place_mapper builds."""
+        return (self._crawled_to_api if self.crawled else self._seed_to_api)(self)
+
+    def fast_safe(self) -> bool:
+        return _float_safe(self.lat) and _float_safe(self.lng) and _float_safe(getattr(self, "rating", None))
+
+    def encode(self) -> bytes:
+        return _backend_dumps(self.to_dict(), self.fast_safe())
+
+    def __getitem__(self, key):
+        if key == "type":
+            return self.TYPE
+        attr = self._ATTRS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        value = getattr(self, attr)
+        if value is None and key == "diningcodeRank":
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return value
+
+    def __setitem__(self, key, value):
+        if key != "diningcodeRank":
+            raise KeyError(f"{type(self).__name__} only allows setting diningcodeRank")
+        self.diningcode_rank = value
+
+    def __contains__(self, key):
+        return any(k == key for _, k in self._layout()) or (key == "diningcodeRank" and self.diningcode_rank is not None)
+
+
+_COMMON_HEAD = (("id", "id"), ("name", "name"), ("description", "description"), ("lat", "lat"), ("lng", "lng"))
+_COMMON_TAIL = (
+    ("price_range", "priceRange"), ("atmosphere", "atmosphere"), ("good_for", "goodFor"),
+    ("rating", "rating"), ("review_count", "reviewCount"),
+    ("parking_available", "parkingAvailable"), ("nearby_parking", "nearbyParking"),
+)
+
+
+class _DiningRecord(PlaceRecord):
+    __slots__ = (
+        "id", "name", "description", "lat", "lng", "category", "specialty", "price_range",
+        "atmosphere", "good_for", "rating", "review_count", "parking_available", "nearby_parking", "tags",
+    )
+    LABEL = ("category", "category")
+
+    def __init_subclass__(cls, **kwargs):
+        cls.SEED_LAYOUT = _COMMON_HEAD + (("TYPE", "type"), cls.LABEL) + _COMMON_TAIL
+        cls.CRAWLED_LAYOUT = _COMMON_HEAD + _COMMON_TAIL + (("tags", "tags"), ("TYPE", "type"), cls.LABEL)
+        super().__init_subclass__(**kwargs)
+
+
+class RestaurantPlace(_DiningRecord):
+    __slots__ = ()
+    TYPE = "restaurant"
+
+
+class CafePlace(_DiningRecord):
+    __slots__ = ()
+    TYPE = "cafe"
+    LABEL = ("specialty", "specialty")
+
+
+class BarPlace(_DiningRecord):
+    __slots__ = ()
+    TYPE = "bar"
+
+
+class BakeryPlace(_DiningRecord):
+    __slots__ = ()
+    TYPE = "bakery"
+    LABEL = ("specialty", "specialty")
+
+
+class ParkingPlace(PlaceRecord):
+    __slots__ = (
+        "id", "name", "description", "lat", "lng", "parking_type", "address", "capacity", "hourly_rate",
+        "base_time", "base_rate", "extra_time", "extra_rate", "free_note", "operating_hours",
+    )
+    TYPE = "parking"
+    SEED_LAYOUT = _COMMON_HEAD + (
+        ("TYPE", "type"), ("parking_type", "parkingType"), ("address", "address"), ("capacity", "capacity"),
+        ("hourly_rate", "hourlyRate"), ("base_time", "baseTime"), ("base_rate", "baseRate"),
+        ("extra_time", "extraTime"), ("extra_rate", "extraRate"), ("free_note", "freeNote"),
+        ("operating_hours", "operatingHours"),
+    )
+
+
+RECORD_TYPES = {
+    "restaurant": RestaurantPlace,
+    "cafe": CafePlace,
+    "bar": BarPlace,
+    "bakery": BakeryPlace,
+    "parking": ParkingPlace,
+}
+
+
+def encode_place(place) -> bytes:
+    """Encode one record or legacy place dict as a JSON object."""
+    if isinstance(place, PlaceRecord):
+        return place.encode()
+    return dumps(place)
+
+
+def dumps_places(places) -> bytes:
+    """Encode a list of records and/or legacy place dicts as a JSON array."""
+    api = []
+    fast = orjson is not None
+    for p in places:
+        if isinstance(p, PlaceRecord):
+            api.append(p.to_dict())
+            fast = fast and p.fast_safe()
+        else:
+            api.append(p)
+            fast = fast and _fast_safe(p)
+    return _backend_dumps(api, fast)
@@ -0,0 +1,349 @@
+"""Columnar, memory-mapped place snapshot shared by all workers.
+
+Layout of a snapshot directory::
+
+    places.npy        structured array, one row per place (see SNAPSHOT_DTYPE)
+    str_offsets.npy   uint64 offsets into strings.bin (len = n_strings + 1)
+    strings.bin       interned UTF-8 strings, concatenated
+
+Writers build a new ``snapshot-<ts>`` directory and atomically repoint the
+``current`` symlink; workers mmap the files read-only, so the pages live once
+in the page cache and a new worker is ready as soon as the headers are read.
+Enabled by setting ``DINING_SNAPSHOT_DIR``.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from functools import cached_property
+
+import numpy as np
+
+from .place_records import RECORD_TYPES
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("DINING_SNAPSHOT_DIR", "")
+SNAPSHOT_DEBOUNCE_SEC = float(os.getenv("DINING_SNAPSHOT_DEBOUNCE_SEC", "5"))
+_RELOAD_CHECK_SEC = 1.0
+_KEEP_VERSIONS = 2
+
+TYPE_CODES = {"restaurant": 0, "cafe": 1, "bar": 2, "bakery": 3, "parking": 4}
+TYPE_NAMES = {v: k for k, v in TYPE_CODES.items()}
+UNCLASSIFIED = 255
+NO_INT = -1  # null sentinel for integer columns
+NO_STR = 0  # string index 0 is always None
+
+SNAPSHOT_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("lat", "<f8"),
+    ("lng", "<f8"),
+    ("type", "u1"),
+    ("crawled", "?"),
+    ("parking_available", "?"),
+    ("has_source", "?"),
+    ("rating", "<f8"),  # NaN when null
+    ("review_count", "<i4"),  # NO_INT when null
+    ("dc_score", "<f8"),  # NaN when the place has no DiningCode score
+    ("updated_at", "<i8"),  # epoch seconds, 0 for seed rows
+    ("capacity", "<i4"),
+    ("hourly_rate", "<i4"),
+    ("base_time", "<i4"),
+    ("base_rate", "<i4"),
+    ("extra_time", "<i4"),
+    ("extra_rate", "<i4"),
+    # interned string indexes
+    ("name", "<u4"),
+    ("description", "<u4"),
+    ("label", "<u4"),  # category / specialty / parking type
+    ("price_range", "<u4"),
+    ("atmosphere", "<u4"),
+    ("good_for", "<u4"),
+    ("nearby_parking", "<u4"),
+    ("tags", "<u4"),
+    ("address", "<u4"),
+    ("free_note", "<u4"),
+    ("operating_hours", "<u4"),
+])
+
+_STR_FIELDS = (
+    "name", "description", "label", "price_range", "atmosphere", "good_for",
+    "nearby_parking", "tags", "address", "free_note", "operating_hours",
+)
+_INT_FIELDS = ("capacity", "hourly_rate", "base_time", "base_rate", "extra_time", "extra_rate")
+
+
+class _StringTable:
+    def __init__(self):
+        self._index: dict[str, int] = {}
+        self._values: list[bytes] = [b""]
+
+    def intern(self, value: str | None) -> int:
+        if value is None:
+            return NO_STR
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self._values)
+            self._values.append(value.encode())
+        return idx
+
+    def write(self, dirpath: str):
+        offsets = np.zeros(len(self._values) + 1, dtype="<u8")
+        np.cumsum([len(v) for v in self._values], out=offsets[1:])
+        np.save(os.path.join(dirpath, "str_offsets.npy"), offsets)
+        with open(os.path.join(dirpath, "strings.bin"), "wb") as fh:
+            fh.write(b"".join(self._values))
+
+
+# --------------- Build ---------------
+
+
+def _epoch(dt) -> int:
+    if dt is None:
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _int(v) -> int:
+    return NO_INT if v is None else int(v)
+
+
+def _place_rows(session, strings: _StringTable):
+    """Yield one tuple per place, in SNAPSHOT_DTYPE field order."""
+    from .models import Cafe, ParkingLot, Restaurant
+    from .place_cache import iter_crawled_chunks
+
+    def row(**f):
+        for k in _STR_FIELDS:
+            f[k] = strings.intern(f.get(k))
+        for k in _INT_FIELDS:
+            f[k] = _int(f.get(k))
+        f.setdefault("crawled", False)
+        f.setdefault("parking_available", False)
+        f.setdefault("has_source", True)
+        f.setdefault("rating", 0.0)
+        f.setdefault("review_count", 0)
+        f.setdefault("dc_score", np.nan)
+        f.setdefault("updated_at", 0)
+        return tuple(f[name] for name in SNAPSHOT_DTYPE.names)
+
+    for r in session.query(Restaurant).yield_per(1000):
+        yield row(id=r.id, lat=r.lat, lng=r.lng, type=TYPE_CODES["restaurant"], name=r.name,
+                  description=r.description, label=r.category, price_range=r.price_range,
+                  atmosphere=r.atmosphere, good_for=r.good_for, rating=r.rating,
+                  review_count=r.review_count, parking_available=bool(r.parking_available),
+                  nearby_parking=r.nearby_parking)
+    for c in session.query(Cafe).yield_per(1000):
+        yield row(id=c.id, lat=c.lat, lng=c.lng, type=TYPE_CODES["cafe"], name=c.name,
+                  description=c.description, label=c.specialty, price_range=c.price_range,
+                  atmosphere=c.atmosphere, good_for=c.good_for, rating=c.rating,
+                  review_count=c.review_count, parking_available=bool(c.parking_available),
+                  nearby_parking=c.nearby_parking)
+    for p in session.query(ParkingLot).yield_per(1000):
+        yield row(id=p.id, lat=p.lat, lng=p.lng, type=TYPE_CODES["parking"], name=p.name,
+                  description=p.description, label=p.type, address=p.address, capacity=p.capacity,
+                  hourly_rate=p.hourly_rate, base_time=p.base_time, base_rate=p.base_rate,
+                  extra_time=p.extra_time, extra_rate=p.extra_rate, free_note=p.free_note,
+                  operating_hours=p.operating_hours)
+
+    for chunk in iter_crawled_chunks(session):
+        for cp in chunk:
+            first = cp.sources[0] if cp.sources else None
+            dc = next((s for s in cp.sources if s.source == "diningcode"), None)
+            score = np.nan if dc is None or dc.dc_score is None else dc.dc_score
+            yield row(
+                id=cp.id, lat=cp.lat, lng=cp.lng, crawled=True,
+                type=TYPE_CODES.get(cp.place_type, 0) if cp.place_type else UNCLASSIFIED,
+                name=cp.name,
+                description=cp.description or (first.snippet if first else None) or "다이닝코드 크롤링",
+                label=cp.category, price_range=cp.price_range or "미정", atmosphere=cp.atmosphere or "미정",
+                good_for=cp.good_for or "미정", tags=cp.tags,
+                has_source=first is not None,
+                rating=(np.nan if first.rating is None else first.rating) if first else 0.0,
+                review_count=_int(first.review_count) if first else 0,
+                dc_score=score, updated_at=_epoch(cp.updated_at),
+            )
+
+
+def write_snapshot(session, root: str = "") -> str:
+    """Build a snapshot from dining.db and atomically publish it. Returns its directory."""
+    root = root or SNAPSHOT_DIR
+    os.makedirs(root, exist_ok=True)
+    version_dir = os.path.join(root, f"snapshot-{time.time_ns()}")
+    os.mkdir(version_dir)
+
+    strings = _StringTable()
+    places = np.fromiter(_place_rows(session, strings), dtype=SNAPSHOT_DTYPE)
+    np.save(os.path.join(version_dir, "places.npy"), places)
+    strings.write(version_dir)
+    for name in os.listdir(version_dir):
+        with open(os.path.join(version_dir, name), "rb") as fh:
+            os.fsync(fh.fileno())
+
+    # Unique per call: overlapping rebuilds in one process must not share it
+    tmp_link = os.path.join(root, f".current-{os.getpid()}-{uuid.uuid4().hex}")
+    os.symlink(os.path.basename(version_dir), tmp_link)
+    os.replace(tmp_link, os.path.join(root, "current"))
+
+    versions = sorted(d for d in os.listdir(root) if d.startswith("snapshot-"))
+    for old in versions[:-_KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+    logger.info("[snapshot] published %d places, %d strings -> %s", len(places), len(strings._values), version_dir)
+    return version_dir
+
+
+_rebuild_timer: threading.Timer | None = None
+_rebuild_mutex = threading.Lock()
+
+
+def request_snapshot_rebuild() -> None:
+    """Debounced rebuild after writes; a burst of saves produces one snapshot."""
+    global _rebuild_timer
+    if not SNAPSHOT_DIR:
+        return
+
+    def _run():
+        from .models import get_dining_read_session
+
+        session = get_dining_read_session()
+        try:
+            write_snapshot(session)
+        except Exception as e:
+            logger.error("[snapshot] rebuild failed: %s", e)
+        finally:
+            session.remove()
+
+    with _rebuild_mutex:
+        if _rebuild_timer is not None:
+            _rebuild_timer.cancel()
+        _rebuild_timer = threading.Timer(SNAPSHOT_DEBOUNCE_SEC, _run)
+        _rebuild_timer.daemon = True
+        _rebuild_timer.start()
+
+
+# --------------- Read ---------------
+
+
+class PlaceSnapshot:
+    """Read-only view over one published snapshot directory."""
+
+    def __init__(self, version_dir: str):
+        self.version_dir = version_dir
+        self.places = np.load(os.path.join(version_dir, "places.npy"), mmap_mode="r")
+        self._offsets = np.load(os.path.join(version_dir, "str_offsets.npy"), mmap_mode="r")
+        blob_path = os.path.join(version_dir, "strings.bin")
+        self._blob = np.memmap(blob_path, dtype="u1", mode="r") if os.path.getsize(blob_path) else None
+
+    def __len__(self):
+        return len(self.places)
+
+    def string(self, idx: int) -> str | None:
+        if idx == NO_STR:
+            return None
+        start, end = int(self._offsets[idx]), int(self._offsets[idx + 1])
+        return self._blob[start:end].tobytes().decode()
+
+    def query(self, bounds: dict | None = None, types: list[str] | None = None) -> np.ndarray:
+        """Indexes of places in bounds (and of the given types), vectorized over the arrays."""
+        p = self.places
+        mask = np.ones(len(p), dtype=bool)
+        if bounds:
+            mask &= (p["lat"] >= bounds["swLat"]) & (p["lat"] <= bounds["neLat"])
+            mask &= (p["lng"] >= bounds["swLng"]) & (p["lng"] <= bounds["neLng"])
+        if types:
+            mask &= np.isin(p["type"], [TYPE_CODES[t] for t in types if t in TYPE_CODES])
+        return np.flatnonzero(mask)
+
+    @cached_property
+    def watermark(self) -> datetime:
+        """Newest crawled write in the snapshot (naive UTC); delta syncs from its answers start here."""
+        ts = int(self.places["updated_at"].max()) if len(self.places) else 0
+        return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+    def has_unclassified(self, idx: np.ndarray) -> bool:
+        return bool((self.places["type"][idx] == UNCLASSIFIED).any())
+
+    def rank(self, idx: np.ndarray, by: str = "rating") -> np.ndarray:
+        """Reorder indexes best-first by rating or DiningCode score (NaN scores last)."""
+        key = self.places[by if by != "diningcode" else "dc_score"][idx]
+        key = np.where(np.isnan(key), -np.inf, key) if key.dtype.kind == "f" else key
+        return idx[np.argsort(-key, kind="stable")]
+
+    def diningcode_ranks(self, idx: np.ndarray) -> dict[int, int]:
+        """diningcodeRank per row index — score descending, ties by id, as place_cache.diningcode_ranks."""
+        p = self.places
+        scored = idx[p["crawled"][idx] & ~np.isnan(p["dc_score"][idx])]
+        ordered = scored[np.lexsort((p["id"][scored], -p["dc_score"][scored]))]
+        return {int(i): rank for rank, i in enumerate(ordered, start=1)}
+
+    def records(self, idx: np.ndarray) -> list:
+        """Materialize PlaceRecords for the given row indexes."""
+        rows = self.places[idx]
+        ranks = self.diningcode_ranks(idx)
+        s = self.string
+        out = []
+        for i, row in zip(idx.tolist(), rows):
+            ptype = TYPE_NAMES.get(int(row["type"]), "restaurant")
+            if ptype == "parking":
+                rec = RECORD_TYPES["parking"](
+                    id=int(row["id"]), name=s(row["name"]), description=s(row["description"]),
+                    lat=float(row["lat"]), lng=float(row["lng"]), parking_type=s(row["label"]),
+                    address=s(row["address"]), free_note=s(row["free_note"]),
+                    operating_hours=s(row["operating_hours"]),
+                    **{k: (None if row[k] == NO_INT else int(row[k])) for k in _INT_FIELDS},
+                )
+            else:
+                crawled = bool(row["crawled"])
+                label = s(row["label"])
+                if crawled and label is None:
+                    label = {"restaurant": "맛집", "cafe": "카페", "bar": "술집", "bakery": "빵집"}[ptype]
+                if crawled and not row["has_source"]:
+                    rating, review_count = 0, 0
+                else:
+                    rating = None if np.isnan(row["rating"]) else float(row["rating"])
+                    review_count = None if row["review_count"] == NO_INT else int(row["review_count"])
+                rec = RECORD_TYPES[ptype](
+                    crawled=crawled, id=int(row["id"]), name=s(row["name"]),
+                    description=s(row["description"]), lat=float(row["lat"]), lng=float(row["lng"]),
+                    category=label, specialty=label, price_range=s(row["price_range"]),
+                    atmosphere=s(row["atmosphere"]), good_for=s(row["good_for"]),
+                    rating=rating, review_count=review_count,
+                    parking_available=bool(row["parking_available"]),
+                    nearby_parking=s(row["nearby_parking"]), tags=s(row["tags"]),
+                )
+                if i in ranks and ptype != "parking":
+                    rec.diningcode_rank = ranks[i]
+            out.append(rec)
+        return out
+
+
+_snapshot: PlaceSnapshot | None = None
+_snapshot_checked_at = 0.0
+
+
+def get_snapshot() -> PlaceSnapshot | None:
+    """Process-wide snapshot, re-mapped when a newer version is published."""
+    global _snapshot, _snapshot_checked_at
+    if not SNAPSHOT_DIR:
+        return None
+    now = time.monotonic()
+    if _snapshot is not None and now - _snapshot_checked_at < _RELOAD_CHECK_SEC:
+        return _snapshot
+    _snapshot_checked_at = now
+    try:
+        target = os.path.join(SNAPSHOT_DIR, os.readlink(os.path.join(SNAPSHOT_DIR, "current")))
+    except OSError:
+        return _snapshot
+    if _snapshot is None or _snapshot.version_dir != target:
+        try:
+            _snapshot = PlaceSnapshot(target)
+        except OSError as e:
+            logger.error("[snapshot] failed to map %s: %s", target, e)
+    return _snapshot
@@ -0,0 +1,254 @@
+"""Bulk pre-warm crawl — region × cuisine keywords across a process pool.
+
+Regions are the LANDMARK_MAP entries (one per location) plus the 구/시
+regions of stored places; each is paired with every PREWARM_CUISINES
+keyword. Each worker process takes PREWARM_BATCH keywords at a time,
+fetches and parses their DiningCode list pages under one global request
+rate shared through a multiprocessing value, runs them through dedup,
+geocoding, classification and save_crawled_places_bulk, and marks the
+keywords in prewarm_job (resumable) and crawl_page_state (so the crawl
+route serves them from cache). Workers write under dining_write_lock, which
+serialises them across processes; the parent only gathers counts.
+
+Usage (from repo root):
+    python -m docs.samples.prewarm [--processes 4] [--rate 2] [--limit 100] [--restart]
+"""
+
+import os
+import time
+import logging
+import argparse
+import multiprocessing
+
+from .agents.dedup import deduplicate_places as merge_crawled_places
+from .agents.diningcode import fetch_list_page, page_fingerprint, parse_list_page
+from .classify import classify_places
+from .crawl_pipeline import record_page_state
+from .geocode import LANDMARK_MAP, geocode
+from .metrics import counter, span
+from .models import CrawledPlace, PrewarmJob, dining_write_lock, get_dining_session, init_dining_db
+from .place_cache import save_crawled_places_bulk
+from .place_mapper import extract_region
+
+logger = logging.getLogger(__name__)
+
+PREWARM_PROCESSES = int(os.getenv("DINING_PREWARM_PROCESSES", str(os.cpu_count() or 2)))
+PREWARM_RATE = float(os.getenv("DINING_PREWARM_RATE", "2"))  # list pages per second, all workers together
+PREWARM_BATCH = int(os.getenv("DINING_PREWARM_BATCH", "20"))  # pages per dedup/classify/save round
+PREWARM_MAX_ATTEMPTS = int(os.getenv("DINING_PREWARM_MAX_ATTEMPTS", "3"))
+PREWARM_CUISINES = [
+    c.strip()
+    for c in os.getenv("DINING_PREWARM_CUISINES", "맛집,한식,일식,중식,양식,고기,카페,베이커리,술집,이자카야").split(",")
+    if c.strip()
+]
+
+PREWARM_PAGES = counter("dining_prewarm_pages_total", "Pre-warm list pages by outcome")
+
+
+# --------------- Keyword grid ---------------
+
+
+def prewarm_regions(session) -> list[str]:
+    """LANDMARK_MAP names (first alias per location) followed by stored 구/시 regions."""
+    regions: list[str] = []
+    seen_points = set()
+    for name, loc in LANDMARK_MAP.items():
+        point = (loc["lat"], loc["lng"])
+        if point not in seen_points:
+            seen_points.add(point)
+            regions.append(name)
+
+    stored = {
+        extract_region(address)
+        for (address,) in session.query(CrawledPlace.address).filter(CrawledPlace.address.isnot(None)).distinct()
+    }
+    stored.discard("기타")
+    return regions + sorted(stored - set(regions))
+
+
+def prewarm_keywords(regions: list[str], cuisines: list[str] = PREWARM_CUISINES) -> list[str]:
+    return [f"{region} {cuisine}" for region in regions for cuisine in cuisines]
+
+
+def sync_jobs(session, keywords: list[str], restart: bool = False) -> list[str]:
+    """Add missing prewarm_job rows and return the keywords still to crawl, in grid order."""
+    with dining_write_lock():
+        jobs = {job.keyword: job for job in session.query(PrewarmJob).filter(PrewarmJob.keyword.in_(keywords))}
+        for keyword in keywords:
+            job = jobs.get(keyword)
+            if job is None:
+                jobs[keyword] = job = PrewarmJob(keyword=keyword, status="pending", attempts=0)
+                session.add(job)
+            elif restart:
+                job.status, job.attempts, job.error = "pending", 0, None
+        session.commit()
+    return [
+        k for k in keywords
+        if jobs[k].status == "pending" or (jobs[k].status == "failed" and jobs[k].attempts < PREWARM_MAX_ATTEMPTS)
+    ]
+
+
+# --------------- Worker processes ---------------
+
+
+class SharedRateLimiter:
+    """Global request spacing shared by every worker process."""
+
+    def __init__(self, rate_per_sec: float, ctx=multiprocessing):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next = ctx.Value("d", 0.0)  # wall-clock time of the next free slot
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._next.get_lock():
+            now = time.time()
+            slot = max(now, self._next.value)
+            self._next.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiter: SharedRateLimiter | None = None
+
+
+def _init_worker(limiter: SharedRateLimiter):
+    global _limiter
+    _limiter = limiter
+
+
+def _fetch_keyword(keyword: str) -> dict:
+    if _limiter is not None:
+        _limiter.wait()
+    try:
+        html = fetch_list_page(keyword)
+        return {"keyword": keyword, "hash": page_fingerprint(html), "places": parse_list_page(html), "error": None}
+    except Exception as e:
+        return {"keyword": keyword, "hash": None, "places": [], "error": str(e)[:300]}
+
+
+def _crawl_batch(keywords: list[str]) -> dict:
+    """Fetch and persist a batch of keywords; returns per-page outcomes for the parent's stats."""
+    cpu_start = time.process_time()
+    results = [_fetch_keyword(keyword) for keyword in keywords]
+    session = get_dining_session()
+    try:
+        saved = _persist_batch(session, results)
+    finally:
+        session.remove()
+    return {
+        "pages": [(r["keyword"], len(r["places"]), r["error"]) for r in results],
+        "saved": saved,
+        "pid": os.getpid(),
+        "cpu": time.process_time() - cpu_start,
+    }
+
+
+# --------------- Dedup → geocode → classify → save ---------------
+
+
+def _persist_batch(session, results: list[dict]) -> int:
+    ok = [r for r in results if r["error"] is None]
+    raw = [p for r in ok for p in r["places"]]
+    saved = 0
+    if raw:
+        with span("prewarm.merge", places=len(raw)):
+            merged = merge_crawled_places(raw)
+        for place in merged:
+            if not (place.get("lat") and place.get("lng")) and place.get("name"):
+                geo = geocode(place.get("address") or place["name"])
+                if geo:
+                    place["lat"], place["lng"] = geo["lat"], geo["lng"]
+                    place["address"] = place.get("address") or geo["address"]
+        located = [p for p in merged if p.get("lat") and p.get("lng")]
+        type_map = classify_places(located)
+        for p in located:
+            p["placeType"] = type_map.get(p["name"], "restaurant")
+        saved = save_crawled_places_bulk(session, located)
+
+    with dining_write_lock():
+        for r in results:
+            job = session.get(PrewarmJob, r["keyword"]) or PrewarmJob(keyword=r["keyword"], attempts=0)
+            session.add(job)
+            job.attempts = (job.attempts or 0) + 1
+            job.status = "failed" if r["error"] else "done"
+            job.error = r["error"]
+            job.place_count = len(r["places"])
+            if r["error"] is None:
+                record_page_state(session, r["keyword"], r["hash"], len(r["places"]))  # commits the job too
+        session.commit()
+    return saved
+
+
+def prewarm(
+    keywords: list[str] | None = None,
+    processes: int = PREWARM_PROCESSES,
+    rate: float = PREWARM_RATE,
+    batch_size: int = PREWARM_BATCH,
+    restart: bool = False,
+    limit: int | None = None,
+) -> dict:
+    """Crawl every pending keyword of the grid. Returns throughput and CPU stats."""
+    session = get_dining_session()
+    try:
+        if keywords is None:
+            keywords = prewarm_keywords(prewarm_regions(session))
+        pending = sync_jobs(session, keywords, restart)[:limit]
+    finally:
+        # Workers write under dining_write_lock; an open writer connection
+        # here would hold it for the whole run
+        session.remove()
+    stats = {"keywords": len(keywords), "pending": len(pending), "pages": 0, "failed": 0, "places": 0, "saved": 0}
+    if not pending:
+        return stats
+
+    processes = max(1, min(processes, len(pending)))
+    ctx = multiprocessing.get_context()
+    limiter = SharedRateLimiter(rate, ctx)
+    worker_cpu: dict[int, float] = {}
+    parent_cpu = time.process_time()
+    started = time.perf_counter()
+    # Small grids still give every worker a batch
+    batch_size = max(1, min(batch_size, -(-len(pending) // processes)))
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    with ctx.Pool(processes, initializer=_init_worker, initargs=(limiter,)) as pool:
+        for result in pool.imap_unordered(_crawl_batch, batches):
+            worker_cpu[result["pid"]] = worker_cpu.get(result["pid"], 0.0) + result["cpu"]
+            stats["saved"] += result["saved"]
+            for keyword, place_count, error in result["pages"]:
+                if error:
+                    stats["failed"] += 1
+                    PREWARM_PAGES.inc(outcome="error")
+                    logger.warning("[prewarm] %s: %s", keyword, error)
+                else:
+                    stats["pages"] += 1
+                    stats["places"] += place_count
+                    PREWARM_PAGES.inc(outcome="ok")
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["pagesPerMin"] = round(stats["pages"] / elapsed * 60, 1) if elapsed else None
+    stats["workerCpu"] = [round(cpu / elapsed, 3) for cpu in sorted(worker_cpu.values(), reverse=True)]
+    stats["parentCpu"] = round((time.process_time() - parent_cpu) / elapsed, 3)
+    stats["cpuPerCore"] = round((sum(stats["workerCpu"]) + stats["parentCpu"]) / (os.cpu_count() or 1), 3)
+    logger.info("[prewarm] %s", stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm dining.db with region × cuisine DiningCode crawls")
+    parser.add_argument("--processes", type=int, default=PREWARM_PROCESSES)
+    parser.add_argument("--rate", type=float, default=PREWARM_RATE, help="list pages per second across all workers")
+    parser.add_argument("--batch-size", type=int, default=PREWARM_BATCH)
+    parser.add_argument("--limit", type=int, help="crawl at most this many pending keywords")
+    parser.add_argument("--restart", action="store_true", help="re-crawl keywords that are already done")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_dining_db()
+    print(prewarm(processes=args.processes, rate=args.rate, batch_size=args.batch_size,
+                  restart=args.restart, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
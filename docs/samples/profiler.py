@@ -0,0 +1,239 @@
+"""Sampling profiler — collapsed stacks of sampled or slow requests, per endpoint.
+
+Off unless DINING_PROFILE_SAMPLE_RATE or DINING_PROFILE_SLOW_MS is set. A
+profiled request registers the threads working for it (its own, plus
+search-stage pool threads while they run one of its stages); a single
+daemon thread wakes every DINING_PROFILE_INTERVAL_MS, reads their frames
+with sys._current_frames() and counts each stack. Nothing is traced or
+hooked, so code runs at full speed; the cost is the sampler's stack walk.
+
+Head-sampled requests always contribute. With a slow threshold every
+request is sampled and its stacks are kept only if it ended over the
+threshold. Kept stacks are merged per endpoint as "frame;frame;frame count"
+lines — the collapsed format flamegraph.pl, inferno and speedscope read —
+and served by GET /dining/api/profile (admin token required).
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PROFILE_SAMPLE_RATE = float(os.getenv("DINING_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("DINING_PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("DINING_PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_STACKS = int(os.getenv("DINING_PROFILE_MAX_STACKS", "5000"))  # distinct stacks kept per endpoint
+PROFILE_MAX_DEPTH = 96
+OTHER_STACK = "[other stacks]"
+
+
+class _Profile:
+    __slots__ = ("endpoint", "head_sampled", "samples", "threads", "active")
+
+    def __init__(self, endpoint: str, head_sampled: bool):
+        self.endpoint = endpoint
+        self.head_sampled = head_sampled
+        self.samples: dict[str, int] = {}
+        self.threads: set[int] = set()
+        self.active = True
+
+
+_current: ContextVar["_Profile | None"] = ContextVar("dining_profile", default=None)
+_by_thread: dict[int, _Profile] = {}  # thread id → profile it is working for
+_lock = threading.Condition()
+_sampler: threading.Thread | None = None
+_aggregates: dict[str, dict] = {}  # endpoint → {"requests", "samples", "stacks"}
+_labels: dict = {}  # code object → "module:function"
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_MS > 0
+
+
+# --------------- Sampler ---------------
+
+
+def _label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        marker = path.rfind("site-packages/")
+        if marker >= 0:
+            path = path[marker + len("site-packages/"):]
+        else:
+            path = "/".join(path.split(os.sep)[-2:])
+        label = _labels[code] = f"{path.removesuffix('.py')}:{code.co_name}"
+    return label
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < PROFILE_MAX_DEPTH:
+        names.append(_label(frame.f_code))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def _sample_loop():
+    interval = PROFILE_INTERVAL_MS / 1000
+    me = threading.get_ident()
+    while True:
+        with _lock:
+            while not _by_thread:
+                _lock.wait()
+            targets = dict(_by_thread)
+        frames = sys._current_frames()
+        stacks = [(profile, _collapse(frames[tid])) for tid, profile in targets.items()
+                  if tid != me and tid in frames]
+        del frames
+        with _lock:
+            for profile, stack in stacks:
+                if profile.active:
+                    profile.samples[stack] = profile.samples.get(stack, 0) + 1
+        time.sleep(interval)
+
+
+def _ensure_sampler() -> None:
+    # Called with _lock held
+    global _sampler
+    if _sampler is None:
+        _sampler = threading.Thread(target=_sample_loop, name="dining-profiler", daemon=True)
+        _sampler.start()
+
+
+def _reset_after_fork():
+    # The sampler thread does not survive fork; the child starts its own on first use
+    global _sampler, _lock
+    _sampler = None
+    _lock = threading.Condition()
+    _by_thread.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# --------------- Request hooks ---------------
+
+
+def _attach(profile: _Profile, tid: int) -> None:
+    with _lock:
+        _by_thread[tid] = profile
+        profile.threads.add(tid)
+        _ensure_sampler()
+        _lock.notify()
+
+
+def _detach(profile: _Profile, tid: int) -> None:
+    with _lock:
+        if _by_thread.get(tid) is profile:
+            del _by_thread[tid]
+        profile.threads.discard(tid)
+
+
+def start_profile(endpoint: str) -> _Profile | None:
+    """Begin profiling the current request if it is sampled (or could turn out slow)."""
+    if not profiling_enabled():
+        return None
+    head = PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+    if not head and PROFILE_SLOW_MS <= 0:
+        return None
+    profile = _Profile(endpoint, head)
+    _current.set(profile)
+    _attach(profile, threading.get_ident())
+    return profile
+
+
+def finish_profile(profile: _Profile | None, elapsed_sec: float) -> bool:
+    """Stop sampling ``profile``; merge its stacks into the endpoint's if it was sampled or slow."""
+    if profile is None:
+        return False
+    with _lock:
+        profile.active = False
+        for tid in profile.threads:
+            if _by_thread.get(tid) is profile:
+                del _by_thread[tid]
+        profile.threads.clear()
+        keep = profile.head_sampled or (PROFILE_SLOW_MS > 0 and elapsed_sec * 1000 >= PROFILE_SLOW_MS)
+        if not keep or not profile.samples:
+            return False
+        agg = _aggregates.setdefault(profile.endpoint, {"requests": 0, "samples": 0, "stacks": {}})
+        agg["requests"] += 1
+        stacks = agg["stacks"]
+        for stack, n in profile.samples.items():
+            agg["samples"] += n
+            if stack not in stacks and len(stacks) >= PROFILE_MAX_STACKS:
+                stack = OTHER_STACK
+            stacks[stack] = stacks.get(stack, 0) + n
+    return True
+
+
+@contextmanager
+def profile_thread():
+    """Count this thread's stacks toward the current request's profile while the block runs.
+
+    For work a request hands to pool threads (contexts copied with
+    contextvars carry the profile along); a no-op when nothing is profiled.
+    """
+    profile = _current.get()
+    tid = threading.get_ident()
+    if profile is None or not profile.active or tid in profile.threads:
+        yield
+        return
+    _attach(profile, tid)
+    try:
+        yield
+    finally:
+        _detach(profile, tid)
+
+
+# --------------- Reports ---------------
+
+
+def collapsed_stacks(endpoint: str | None = None) -> str:
+    """Aggregated stacks as collapsed text, one "endpoint;frame;... count" line per stack.
+
+    The endpoint is the root frame, so one flamegraph shows every endpoint
+    side by side; pass ``endpoint`` to get just that one (without the prefix).
+    """
+    with _lock:
+        items = [(ep, dict(agg["stacks"])) for ep, agg in _aggregates.items() if endpoint in (None, ep)]
+    lines = []
+    for ep, stacks in items:
+        prefix = "" if endpoint else f"{ep};"
+        lines += [f"{prefix}{stack} {n}" for stack, n in sorted(stacks.items(), key=lambda kv: -kv[1])]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def profile_summary(top: int = 10) -> dict:
+    """Per endpoint: profiled requests, samples, sampled milliseconds and the heaviest leaf frames."""
+    with _lock:
+        snapshot = {ep: (agg["requests"], agg["samples"], dict(agg["stacks"])) for ep, agg in _aggregates.items()}
+    out = {}
+    for ep, (requests, samples, stacks) in snapshot.items():
+        leaves: dict[str, int] = {}
+        for stack, n in stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + n
+        out[ep] = {
+            "requests": requests,
+            "samples": samples,
+            "sampledMs": round(samples * PROFILE_INTERVAL_MS, 1),
+            "topFrames": [{"frame": f, "samples": n}
+                          for f, n in sorted(leaves.items(), key=lambda kv: -kv[1])[:top]],
+        }
+    return {
+        "enabled": profiling_enabled(),
+        "sampleRate": PROFILE_SAMPLE_RATE,
+        "slowMs": PROFILE_SLOW_MS,
+        "intervalMs": PROFILE_INTERVAL_MS,
+        "endpoints": out,
+    }
+
+
+def reset_profiles() -> None:
+    with _lock:
+        _aggregates.clear()
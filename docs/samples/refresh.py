@@ -0,0 +1,225 @@
+"""Stale-while-revalidate refresh scheduler for crawled places.
+
+Crawl requests are answered from the cache whenever a keyword has been
+crawled before; keywords older than REFRESH_MAX_AGE_HOURS are queued for a
+background revalidation instead of blocking the user on a live crawl.
+The queue is ordered by recent request frequency (exponentially decayed) and
+drained by a small fixed pool of worker threads.
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from .agents.diningcode import fetch_list_page, page_fingerprint, parse_list_page
+from .crawl_pipeline import record_page_state, run_crawl
+from .metrics import counter, gauge, span
+from .models import (
+    CrawledPlace,
+    CrawlPageState,
+    PlaceSource,
+    dining_write_lock,
+    get_dining_read_session,
+    get_dining_session,
+)
+from .place_cache import notify_places_changed
+
+logger = logging.getLogger(__name__)
+
+REFRESH_MAX_AGE_HOURS = float(os.getenv("DINING_REFRESH_MAX_AGE_HOURS", "24"))
+REFRESH_CONCURRENCY = int(os.getenv("DINING_REFRESH_CONCURRENCY", "2"))
+REFRESH_QUEUE_MAX = int(os.getenv("DINING_REFRESH_QUEUE_MAX", "256"))
+POPULARITY_HALF_LIFE_SEC = float(os.getenv("DINING_REFRESH_HALF_LIFE_SEC", "3600"))
+
+CACHE_REQUESTS = counter("dining_cache_requests_total", "Crawl requests by cache result (fresh|stale|miss)")
+REFRESH_JOBS = counter("dining_refresh_jobs_total", "Background revalidations by outcome")
+REFRESH_QUEUE_DEPTH = gauge("dining_refresh_queue_depth", "Keywords waiting for revalidation")
+
+
+def _as_utc(ts: datetime | None) -> datetime | None:
+    # SQLite drops tzinfo on the way back
+    if ts is not None and ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+class RefreshScheduler:
+    """Popularity-ordered revalidation queue with bounded concurrency."""
+
+    def __init__(self, concurrency: int = REFRESH_CONCURRENCY, max_age_hours: float = REFRESH_MAX_AGE_HOURS):
+        self.concurrency = max(1, concurrency)
+        self.max_age = timedelta(hours=max_age_hours)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._popularity: dict[str, tuple[float, float]] = {}  # keyword -> (score, last_ts)
+        self._pending: dict[str, dict | None] = {}  # keyword -> bounds of the latest request
+        self._in_flight: set[str] = set()
+        self._workers: list[threading.Thread] = []
+
+    # --------------- Popularity ---------------
+
+    def _score(self, keyword: str, now: float) -> float:
+        score, ts = self._popularity.get(keyword, (0.0, now))
+        return score * math.pow(0.5, (now - ts) / POPULARITY_HALF_LIFE_SEC)
+
+    def record_request(self, keyword: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._popularity[keyword] = (self._score(keyword, now) + 1, now)
+            if len(self._popularity) > REFRESH_QUEUE_MAX * 4:
+                # Forget the coldest half so the table stays bounded
+                ranked = sorted(self._popularity, key=lambda k: self._score(k, now))
+                for k in ranked[: len(ranked) // 2]:
+                    if k not in self._pending:
+                        del self._popularity[k]
+
+    # --------------- Lookup ---------------
+
+    def lookup(self, keyword: str) -> tuple[str, CrawlPageState | None]:
+        """Classify a crawl request as fresh, stale or miss and count it."""
+        self.record_request(keyword)
+        session = get_dining_read_session()
+        try:
+            state = session.get(CrawlPageState, keyword)
+            if state is not None:
+                session.expunge(state)
+        finally:
+            session.remove()
+
+        if state is None:
+            result = "miss"
+        elif datetime.now(timezone.utc) - _as_utc(state.checked_at) > self.max_age:
+            result = "stale"
+        else:
+            result = "fresh"
+        CACHE_REQUESTS.inc(result=result)
+        return result, state
+
+    # --------------- Queue ---------------
+
+    def enqueue(self, keyword: str, bounds: dict | None = None) -> bool:
+        """Queue a revalidation; a keyword already queued or running is not duplicated."""
+        with self._wakeup:
+            if keyword in self._in_flight:
+                return False
+            if keyword not in self._pending and len(self._pending) >= REFRESH_QUEUE_MAX:
+                REFRESH_JOBS.inc(outcome="dropped")
+                return False
+            self._pending[keyword] = bounds
+            REFRESH_QUEUE_DEPTH.set(len(self._pending))
+            self._ensure_workers()
+            self._wakeup.notify()
+        return True
+
+    def _ensure_workers(self):
+        self._workers = [t for t in self._workers if t.is_alive()]
+        while len(self._workers) < self.concurrency:
+            t = threading.Thread(target=self._run, name=f"dining-refresh-{len(self._workers)}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def _next_job(self) -> tuple[str, dict | None]:
+        with self._wakeup:
+            while not self._pending:
+                self._wakeup.wait()
+            now = time.monotonic()
+            keyword = max(self._pending, key=lambda k: self._score(k, now))
+            bounds = self._pending.pop(keyword)
+            self._in_flight.add(keyword)
+            REFRESH_QUEUE_DEPTH.set(len(self._pending))
+            return keyword, bounds
+
+    def _run(self):
+        while True:
+            keyword, bounds = self._next_job()
+            try:
+                outcome = revalidate(keyword, bounds)
+            except Exception as e:
+                logger.error("[refresh] %s failed: %s", keyword, e)
+                outcome = "error"
+            finally:
+                with self._lock:
+                    self._in_flight.discard(keyword)
+            REFRESH_JOBS.inc(outcome=outcome)
+
+    def status(self) -> dict:
+        fresh = CACHE_REQUESTS.value(result="fresh")
+        stale = CACHE_REQUESTS.value(result="stale")
+        miss = CACHE_REQUESTS.value(result="miss")
+        total = fresh + stale + miss
+        with self._lock:
+            now = time.monotonic()
+            queued = sorted(self._pending, key=lambda k: -self._score(k, now))
+            in_flight = sorted(self._in_flight)
+        return {
+            "requests": {"fresh": fresh, "stale": stale, "miss": miss},
+            "hitRatio": round((fresh + stale) / total, 4) if total else None,
+            "liveCrawlShare": round(miss / total, 4) if total else None,
+            "queued": queued,
+            "inFlight": in_flight,
+            "concurrency": self.concurrency,
+        }
+
+
+# --------------- Revalidation ---------------
+
+
+def touch_crawled_places(session, source_urls: list[str]) -> int:
+    """Bump updated_at on crawled places whose DiningCode source is on the page."""
+    if not source_urls:
+        return 0
+    ids = select(PlaceSource.crawled_place_id).where(
+        PlaceSource.source == "diningcode",
+        PlaceSource.source_url.in_(source_urls),
+    )
+    with dining_write_lock():
+        touched = (
+            session.query(CrawledPlace)
+            .filter(CrawledPlace.id.in_(ids))
+            .update({CrawledPlace.updated_at: datetime.now(timezone.utc)}, synchronize_session=False)
+        )
+        session.commit()
+    return touched
+
+
+def revalidate(keyword: str, bounds: dict | None = None) -> str:
+    """Re-fetch the keyword's list page; only re-run the pipeline if it changed."""
+    with span("refresh.fetch", keyword=keyword):
+        html = fetch_list_page(keyword)
+    fingerprint = page_fingerprint(html)
+
+    # Read the stored hash on a read session: the write session's connection
+    # is only checked out under the write lock (see models.dining_write_lock)
+    read = get_dining_read_session()
+    try:
+        state = read.get(CrawlPageState, keyword)
+        unchanged = state is not None and state.content_hash == fingerprint
+    finally:
+        read.remove()
+
+    if unchanged:
+        session = get_dining_session()
+        try:
+            with span("refresh.touch"):
+                urls = [p["sourceUrl"] for p in parse_list_page(html) if p.get("sourceUrl")]
+                touched = touch_crawled_places(session, urls)
+                record_page_state(session, keyword, fingerprint)
+        finally:
+            session.remove()
+        if touched:
+            notify_places_changed()
+        return "unchanged"
+
+    with span("refresh.crawl", keyword=keyword):
+        # run_crawl yields progress only; a failure raises and _run records it
+        for _ in run_crawl(keyword, bounds, html=html):
+            pass
+    return "changed"
+
+
+refresh_scheduler = RefreshScheduler()
@@ -0,0 +1,128 @@
+"""Course route optimizer — orders course stops by walking distance.
+
+The LLM picks which places go in a course; the visiting order and the
+routeSummary walking times are computed here from coordinates. Courses are
+2–5 stops, so every order is tried: a parking stop is pinned first, the
+walk starts from the anchor when there is no parking, and a cafe/bakery
+before a meal costs DESSERT_FIRST_PENALTY_M so that "맛집 → 카페" wins ties.
+A parking stop carrying an estimatedCost (parking_cost.py) shows it in the
+routeSummary and as the course's parkingCost.
+"""
+
+import os
+import math
+import logging
+from functools import lru_cache
+from itertools import permutations
+
+from .llm_service import calc_distance_m
+
+logger = logging.getLogger(__name__)
+
+WALK_M_PER_MIN = float(os.getenv("DINING_WALK_M_PER_MIN", "67"))  # 도보 15분 ≈ 1km
+WALK_DETOUR = float(os.getenv("DINING_WALK_DETOUR", "1.2"))  # street path vs. straight line
+DESSERT_FIRST_PENALTY_M = 300
+_EXACT_MAX_STOPS = 7  # 7! = 5040 orders; beyond that, nearest neighbour
+
+_MEAL_TYPES = {"restaurant", "bar"}
+_DESSERT_TYPES = {"cafe", "bakery"}
+
+
+def walk_minutes(distance_m: float) -> int:
+    return max(1, math.ceil(distance_m * WALK_DETOUR / WALK_M_PER_MIN))
+
+
+@lru_cache(maxsize=65536)
+def _pair_m(a: tuple[float, float], b: tuple[float, float]) -> int:
+    return calc_distance_m(a[0], a[1], b[0], b[1])
+
+
+def distance_m(a: tuple[float, float], b: tuple[float, float]) -> int:
+    """Cached symmetric distance between two (lat, lng) points."""
+    return _pair_m(a, b) if a <= b else _pair_m(b, a)
+
+
+def _path_cost(order: list[int], coords: list, types: list[str], start) -> int:
+    cost = distance_m(start, coords[order[0]]) if start is not None else 0
+    for i, j in zip(order, order[1:]):
+        cost += distance_m(coords[i], coords[j])
+    seen_dessert = False
+    for i in order:
+        if types[i] in _DESSERT_TYPES:
+            seen_dessert = True
+        elif types[i] in _MEAL_TYPES and seen_dessert:
+            cost += DESSERT_FIRST_PENALTY_M
+    return cost
+
+
+def best_order(coords: list[tuple[float, float]], types: list[str], start=None) -> list[int]:
+    """Cheapest visiting order of the given points (indices), optionally from a start point."""
+    n = len(coords)
+    if n <= 1:
+        return list(range(n))
+    if n <= _EXACT_MAX_STOPS:
+        return list(min(permutations(range(n)), key=lambda o: _path_cost(list(o), coords, types, start)))
+
+    # Nearest neighbour from the start (or the first stop)
+    remaining = set(range(n))
+    current = start if start is not None else coords[0]
+    order = []
+    while remaining:
+        nxt = min(remaining, key=lambda i: distance_m(current, coords[i]))
+        order.append(nxt)
+        remaining.discard(nxt)
+        current = coords[nxt]
+    return order
+
+
+def optimize_course(course: dict, places: dict, anchor: dict | None = None) -> dict:
+    """Re-order one course's stops and rebuild its routeSummary.
+
+    ``places`` maps (type, id) to the API place dict; stops without
+    coordinates keep the LLM's order and the course is returned unchanged.
+    """
+    stops = sorted(course.get("stops", []), key=lambda s: s.get("order", 0))
+    located = [places.get((s["type"], s["id"])) for s in stops]
+    if not stops or any(p is None or p.get("lat") is None or p.get("lng") is None for p in located):
+        return course
+
+    parking = [i for i, s in enumerate(stops) if s["type"] == "parking"][:1]
+    rest = [i for i in range(len(stops)) if i not in parking]
+    coords = [(located[i]["lat"], located[i]["lng"]) for i in rest]
+    types = [stops[i]["type"] for i in rest]
+
+    if parking:
+        start = (located[parking[0]]["lat"], located[parking[0]]["lng"])
+    elif anchor and anchor.get("lat") is not None:
+        start = (anchor["lat"], anchor["lng"])
+    else:
+        start = None
+    ordered = parking + [rest[i] for i in best_order(coords, types, start)]
+
+    new_stops = []
+    parts = []
+    total_min = 0
+    prev = None
+    for n, i in enumerate(ordered, start=1):
+        place = located[i]
+        point = (place["lat"], place["lng"])
+        if prev is not None:
+            minutes = walk_minutes(distance_m(prev, point))
+            total_min += minutes
+            parts.append(f"도보{minutes}분")
+        cost = place.get("estimatedCost") if stops[i]["type"] == "parking" else None
+        parts.append(place["name"] if cost is None else f"{place['name']}(주차 {cost:,}원)")
+        new_stops.append({**stops[i], "order": n})
+        prev = point
+
+    result = {**course, "stops": new_stops, "routeSummary": " → ".join(parts), "totalWalkMin": total_min}
+    if parking and located[parking[0]].get("estimatedCost") is not None:
+        result["parkingCost"] = located[parking[0]]["estimatedCost"]
+        result["parkingMinutes"] = located[parking[0]]["stayMinutes"]
+    return result
+
+
+def optimize_courses(courses: list[dict], places: list[dict], anchor: dict | None = None) -> list[dict]:
+    """optimize_course over every course; places is the candidate list the courses were built from."""
+    by_key = {(p.get("type"), p.get("id")): p for p in places}
+    return [optimize_course(c, by_key, anchor) for c in courses]
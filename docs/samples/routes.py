@@ -0,0 +1,633 @@
+"""Dining Flask Blueprint — /dining/api/* routes."""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
+from sqlalchemy.orm import selectinload
+
+from .classify import classify_and_persist
+from .crawl_pipeline import run_crawl
+from .facet_index import FACETS, query_facets
+from .metrics import counter, current_trace_id, finish_trace, recent_traces, render_prometheus, span, start_trace
+from .menu_ingest import find_menus
+from .models import Cafe, CrawledPlace, ParkingLot, Restaurant, get_dining_read_session, get_dining_session
+from .openrouter_client import budget_status
+from .parking_index import PARKING_K, PARKING_MAX_M, nearest_parking
+from .place_cache import (
+    crawled_changes,
+    data_watermark,
+    decode_watermark,
+    diningcode_ranks,
+    encode_watermark,
+    find_cached_places_page,
+    iter_crawled_chunks,
+    places_version,
+    watermark_matches_seed,
+)
+from .place_cluster import CLUSTER_MAX_ZOOM, cluster_places
+from .place_mapper import (
+    deduplicate_places,
+    iter_crawled_records,
+    iter_seed_records,
+    iter_unique_crawled,
+    rank_by_diningcode,
+)
+from .place_records import dumps, dumps_places, encode_place
+from .profiler import collapsed_stacks, profile_summary, reset_profiles
+from .refresh import refresh_scheduler
+from .search_pipeline import run_search
+from .tile_cache import in_bounds, in_tile, tile_bounds, tiled
+
+logger = logging.getLogger(__name__)
+
+dining_bp = Blueprint("dining", __name__, url_prefix="/dining")
+
+PLACES_RESPONSES = counter("dining_places_responses_total", "GET /api/places answers by mode")
+
+
+@dining_bp.before_request
+def _begin_trace():
+    g.trace_token = start_trace(request.endpoint or request.path)
+    g.trace_id = current_trace_id()
+
+
+@dining_bp.after_request
+def _end_trace(response):
+    token = g.pop("trace_token", None)
+    if token is not None:
+        response.headers["X-Trace-Id"] = g.trace_id
+        finish_trace(token, response.status_code)
+    return response
+
+
+def _parse_bounds() -> dict | None:
+    bounds = {k: request.args.get(k, type=float, default=0.0) for k in ("swLat", "swLng", "neLat", "neLng")}
+    if not any(bounds.values()):
+        return None
+    return bounds
+
+
+def _json_response(body: bytes, status: int = 200) -> Response:
+    return Response(body, status=status, mimetype="application/json")
+
+
+def _stream_json_array(items):
+    """Encode an iterable as a JSON array, one element per chunk."""
+    yield b"["
+    first = True
+    for item in items:
+        yield (b"" if first else b",") + encode_place(item)
+        first = False
+    yield b"]"
+
+
+def _classify_unclassified(crawled_places) -> dict:
+    unclassified = [cp for cp in crawled_places if not cp.place_type]
+    if not unclassified:
+        return {}
+    return classify_and_persist(get_dining_session(), [
+        {"id": cp.id, "name": cp.name, "category": cp.category,
+         "tags": cp.tags, "description": cp.description}
+        for cp in unclassified
+    ])
+
+
+def _load_places_from_snapshot(bounds: dict) -> list | None:
+    """Answer from the shared mmap snapshot; None when it is off or needs classification."""
+    if not os.getenv("DINING_SNAPSHOT_DIR"):
+        return None
+    from .place_snapshot import get_snapshot
+
+    snap = get_snapshot()
+    if snap is None:
+        return None
+    idx = snap.query(bounds)
+    if snap.has_unclassified(idx):
+        return None  # the DB path classifies and republishes
+    records = snap.records(idx)
+    return deduplicate_places([r for r in records if not r.crawled], [r for r in records if r.crawled])
+
+
+def _query_in_bounds(session, model, bounds: dict):
+    query = session.query(model)
+    if model is CrawledPlace:
+        query = query.options(selectinload(CrawledPlace.sources))  # read by iter_crawled_records
+    return query.filter(
+        model.lat >= bounds["swLat"], model.lat <= bounds["neLat"],
+        model.lng >= bounds["swLng"], model.lng <= bounds["neLng"],
+    )
+
+
+def _tile_records(session, tile: tuple[int, int]) -> tuple[list, list[int] | None]:
+    """Seed and crawled records of one tile, classified and mapped but not ranked."""
+    bounds = tile_bounds(tile)
+    restaurants, cafes, parking_lots, crawled_places = (
+        [r for r in _query_in_bounds(session, model, bounds) if in_tile(r.lat, r.lng, tile)]
+        for model in (Restaurant, Cafe, ParkingLot, CrawledPlace)
+    )
+    llm_type_map = _classify_unclassified(crawled_places)
+    records = list(iter_seed_records(restaurants, cafes, parking_lots))
+    records += iter_crawled_records(crawled_places, llm_type_map)
+    # Rows the classifier could not type are served with the default but not cached
+    settled = all(cp.place_type or cp.name in llm_type_map for cp in crawled_places)
+    return records, [cp.id for cp in crawled_places] if settled else None
+
+
+def _load_places_from_tiles(session, bounds: dict, fresh_as_of: tuple | None = None) -> list | None:
+    """Answer by merging the cached tiles covering ``bounds``; None for viewports too wide to tile."""
+    with span("places.tiles"):
+        records = tiled(session, "mapped", bounds, lambda tile: _tile_records(session, tile), fresh_as_of)
+    if records is None:
+        return None
+    with span("places.map", rows=len(records)):
+        records = [r.copy() for r in records if in_bounds(r.lat, r.lng, bounds)]
+        crawled_as_places = [r for r in records if r.crawled]
+        rank_by_diningcode(crawled_as_places, diningcode_ranks(session, bounds))
+        return deduplicate_places([r for r in records if not r.crawled], crawled_as_places)
+
+
+def _load_places(bounds: dict, fresh_as_of: tuple | None = None) -> list:
+    """Seed + crawled places in bounds, classified, ranked and deduplicated.
+
+    ``fresh_as_of`` (from _places_etag) makes a tile-cache answer at least
+    as new as the ETag and watermark sent with it.
+    """
+    places = _load_places_from_snapshot(bounds)
+    if places is not None:
+        return places
+
+    session = get_dining_read_session()
+    try:
+        places = _load_places_from_tiles(session, bounds, fresh_as_of)
+        if places is not None:
+            return places
+
+        with span("places.query"):
+            restaurants = _query_in_bounds(session, Restaurant, bounds).all()
+            cafes = _query_in_bounds(session, Cafe, bounds).all()
+            parking_lots = _query_in_bounds(session, ParkingLot, bounds).all()
+            crawled_places = _query_in_bounds(session, CrawledPlace, bounds).all()
+            ranks = diningcode_ranks(session, bounds)
+
+        llm_type_map = _classify_unclassified(crawled_places)
+
+        with span("places.map", rows=len(crawled_places)):
+            seed_places = list(iter_seed_records(restaurants, cafes, parking_lots))
+            crawled_as_places = list(iter_crawled_records(crawled_places, llm_type_map))
+            rank_by_diningcode(crawled_as_places, ranks)
+            return deduplicate_places(seed_places, crawled_as_places)
+    finally:
+        session.remove()
+
+
+def _parse_facet_filters() -> dict[str, list[str]]:
+    """?type=cafe,bar&goodFor=데이트 → {"type": ["cafe", "bar"], "goodFor": ["데이트"]}."""
+    filters = {}
+    for facet in FACETS:
+        values = [v.strip() for raw in request.args.getlist(facet) for v in raw.split(",") if v.strip()]
+        if values:
+            filters[facet] = values
+    return filters
+
+
+def _faceted_places(bounds: dict, filters: dict[str, list[str]]) -> Response:
+    """Places matching the facet filters plus per-facet counts, answered from the facet index."""
+    session = get_dining_read_session()
+    try:
+        with span("places.facets"):
+            matches, counts = query_facets(session, bounds, filters)
+        ids = defaultdict(list)
+        for kind, pid in matches:
+            ids[kind].append(pid)
+
+        def by_ids(model, kind, *options):
+            rows = []
+            for i in range(0, len(ids[kind]), 500):
+                rows += session.query(model).options(*options).filter(model.id.in_(ids[kind][i:i + 500])).all()
+            return rows
+
+        with span("places.query", rows=len(matches)):
+            restaurants = by_ids(Restaurant, "restaurant")
+            cafes = by_ids(Cafe, "cafe")
+            parking_lots = by_ids(ParkingLot, "parking")
+            crawled_places = by_ids(CrawledPlace, "crawled", selectinload(CrawledPlace.sources))
+            ranks = diningcode_ranks(session, bounds) if crawled_places else {}
+
+        llm_type_map = _classify_unclassified(crawled_places)
+        seed_places = list(iter_seed_records(restaurants, cafes, parking_lots))
+        crawled_as_places = list(iter_crawled_records(crawled_places, llm_type_map))
+        rank_by_diningcode(crawled_as_places, ranks)
+        places = deduplicate_places(seed_places, crawled_as_places)
+    finally:
+        session.remove()
+
+    with span("places.encode"):
+        body = b'{"total":%d,"facets":%s,"places":%s}' % (len(places), dumps(counts), dumps_places(places))
+    return _json_response(body)
+
+
+def _snapshot_watermark() -> datetime | None:
+    if not os.getenv("DINING_SNAPSHOT_DIR"):
+        return None
+    from .place_snapshot import get_snapshot
+
+    snap = get_snapshot()
+    return snap.watermark if snap is not None else None
+
+
+def _places_etag(bounds: dict) -> tuple[str, str, tuple]:
+    """(ETag, delta watermark, fresh_as_of) for this request, read before the body is built.
+
+    A write landing in between only makes the body newer than its tag, which
+    costs the client one extra download later, never a stale 304. The body
+    must not be older, so cached answers are built with ``fresh_as_of``.
+    """
+    session = get_dining_read_session()
+    try:
+        version = places_version(session, bounds)
+        watermark = db_watermark = data_watermark(session)
+    finally:
+        session.remove()
+    snap_watermark = _snapshot_watermark()
+    if snap_watermark is not None:
+        watermark = min(watermark, snap_watermark)  # snapshot answers may lag dining.db
+    tag = hashlib.sha1(repr((sorted(request.args.items(multi=True)), version, snap_watermark)).encode())
+    return tag.hexdigest()[:24], encode_watermark(watermark, version[1]), (db_watermark, version[1])
+
+
+def _places_delta(bounds: dict, token: str, watermark: str, fresh_as_of: tuple) -> Response:
+    """Crawled places changed since ``token`` as {"watermark", "reset", "upserts", "removed", "ranks"}.
+
+    ``upserts`` are place objects in bounds to add or replace, ``removed``
+    crawled place ids to drop (deleted, moved out of bounds or now hidden as
+    duplicates of seed data) and ``ranks`` the diningcodeRank of every ranked
+    crawled place in bounds (only when something changed). When the token is
+    from other seed data, older than the tombstones or too much changed,
+    ``reset`` is true and ``upserts`` holds the full answer. The seed
+    version is the one _places_etag read (``fresh_as_of``), not read again.
+    """
+    try:
+        since, seed_hash = decode_watermark(token)
+    except ValueError:
+        return jsonify({"error": "Invalid since watermark"}), 400
+
+    session = get_dining_read_session()
+    try:
+        with span("places.delta"):
+            changes = None
+            if watermark_matches_seed(seed_hash, fresh_as_of[1]):
+                changes = crawled_changes(session, since)
+            if changes is not None:
+                changed, tombstones = changes
+                located = [cp for cp in changed if cp.lat is not None and cp.lng is not None]
+                inside = [cp for cp in located if in_bounds(cp.lat, cp.lng, bounds)]
+                removed = {cp.id for cp in changed} - {cp.id for cp in inside}
+                removed |= {t.place_id for t in tombstones
+                            if t.lat is not None and t.lng is not None and in_bounds(t.lat, t.lng, bounds)}
+                ranks = diningcode_ranks(session, bounds) if changed or removed else {}
+                seed_places = []
+                if inside:
+                    seed_places = list(iter_seed_records(*(
+                        _query_in_bounds(session, model, bounds).all() for model in (Restaurant, Cafe, ParkingLot)
+                    )))
+        if changes is not None:
+            crawled_as_places = list(iter_crawled_records(inside, _classify_unclassified(inside)))
+            upserts = list(iter_unique_crawled(seed_places, crawled_as_places))
+            removed |= {p["id"] for p in crawled_as_places} - {p["id"] for p in upserts}
+            for p in upserts:
+                if p["id"] in ranks and p.get("type") != "parking":
+                    p["diningcodeRank"] = ranks[p["id"]]
+    finally:
+        session.remove()
+
+    if changes is None:
+        PLACES_RESPONSES.inc(mode="reset")
+        upserts, removed, ranks = _load_places(bounds, fresh_as_of), set(), {}
+    else:
+        PLACES_RESPONSES.inc(mode="delta")
+    with span("places.encode", rows=len(upserts)):
+        body = b'{"watermark":%s,"reset":%s,"upserts":%s,"removed":%s,"ranks":%s}' % (
+            dumps(watermark), b"true" if changes is None else b"false", dumps_places(upserts),
+            dumps(sorted(removed)), dumps({str(pid): rank for pid, rank in ranks.items()} or None),
+        )
+    return _json_response(body)
+
+
+@dining_bp.route("/api/places", methods=["GET"])
+def places():
+    """Places in bounds as a JSON array.
+
+    With facet filters (type, priceRange, atmosphere, goodFor, tags; values
+    comma-separated or repeated, OR within a facet, AND across facets) or
+    ?facets=1, the answer comes from the facet index as
+    {"total", "facets": {facet: [{"value", "count"}]}, "places"}.
+
+    Answers carry an ETag (304 on a matching If-None-Match) and an
+    X-Places-Watermark; sending that back as ?since= returns only what
+    changed (see _places_delta).
+    """
+    bounds = _parse_bounds()
+    if bounds is None:
+        return jsonify({"error": "Bounds parameters required"}), 400
+    etag, watermark, fresh_as_of = _places_etag(bounds)
+    if request.if_none_match.contains(etag):
+        PLACES_RESPONSES.inc(mode="not_modified")
+        response = Response(status=304)
+    else:
+        filters = _parse_facet_filters()
+        since = request.args.get("since")
+        if filters or request.args.get("facets"):
+            PLACES_RESPONSES.inc(mode="facets")
+            response = _faceted_places(bounds, filters)
+        elif since:
+            response = _places_delta(bounds, since, watermark, fresh_as_of)
+        else:
+            PLACES_RESPONSES.inc(mode="full")
+            places = _load_places(bounds, fresh_as_of)
+            with span("places.encode"):
+                response = _json_response(dumps_places(places))
+        if isinstance(response, tuple):
+            return response
+    response.set_etag(etag)
+    response.headers["X-Places-Watermark"] = watermark
+    return response
+
+
+@dining_bp.route("/api/places/clusters", methods=["GET"])
+def place_clusters():
+    bounds = _parse_bounds()
+    if bounds is None:
+        return jsonify({"error": "Bounds parameters required"}), 400
+    zoom = request.args.get("zoom", type=int, default=CLUSTER_MAX_ZOOM + 1)
+
+    # Zoomed in far enough — individual markers are cheap again
+    if zoom > CLUSTER_MAX_ZOOM:
+        places = [p.to_dict() for p in _load_places(bounds)]
+        return _json_response(dumps({"zoom": zoom, "clusters": [], "places": places}))
+
+    session = get_dining_read_session()
+    try:
+        clusters = cluster_places(session, bounds, zoom)
+    finally:
+        session.remove()
+    return jsonify({"zoom": zoom, "clusters": clusters, "places": []})
+
+
+@dining_bp.route("/api/places/stream", methods=["GET"])
+def places_stream():
+    """Same places as /api/places, streamed as a JSON array chunk by chunk.
+
+    Crawled places are read with keyset pagination, so peak memory is one
+    chunk regardless of how many rows the bounds cover. diningcodeRank needs
+    the full set and is therefore not included here.
+    """
+    bounds = _parse_bounds()
+    if bounds is None:
+        return jsonify({"error": "Bounds parameters required"}), 400
+
+    def generate():
+        session = get_dining_read_session()
+        try:
+            seed_places = list(iter_seed_records(*(
+                _query_in_bounds(session, model, bounds) for model in (Restaurant, Cafe, ParkingLot)
+            )))
+            yield from seed_places
+            for chunk in iter_crawled_chunks(session, bounds):
+                llm_type_map = _classify_unclassified(chunk)
+                yield from iter_unique_crawled(seed_places, iter_crawled_records(chunk, llm_type_map))
+        finally:
+            session.remove()
+
+    return Response(stream_with_context(_stream_json_array(generate())), mimetype="application/json")
+
+
+@dining_bp.route("/api/menus", methods=["GET"])
+def menus():
+    """Menus by ?placeId= (crawled place, indexed) or ?placeName= (seed places)."""
+    place_id = request.args.get("placeId", type=int)
+    place_name = request.args.get("placeName")
+    if place_id is None and not place_name:
+        return jsonify({"error": "placeId or placeName parameter required"}), 400
+    session = get_dining_read_session()
+    try:
+        return jsonify(find_menus(session, place_id, place_name))
+    finally:
+        session.remove()
+
+
+@dining_bp.route("/api/parking/nearest", methods=["GET"])
+def parking_nearest():
+    """K nearest parking lots to ?lat=&lng= (&k=3&maxM=1500), with walking minutes."""
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    if lat is None or lng is None:
+        return jsonify({"error": "lat and lng parameters required"}), 400
+    k = max(1, min(request.args.get("k", type=int, default=PARKING_K), 20))
+    max_m = request.args.get("maxM", type=float, default=PARKING_MAX_M)
+    session = get_dining_read_session()
+    try:
+        return jsonify(nearest_parking(session, lat, lng, k, max_m))
+    finally:
+        session.remove()
+
+
+@dining_bp.route("/api/parking/costs", methods=["GET"])
+def parking_costs():
+    """Lots in bounds ranked by the estimated fee of a stay and the walk to the destination.
+
+    ?minutes=150 (default DINING_PARKING_STAY_MIN); the destination is
+    ?lat=&lng= or the centre of the bounds; &limit=20.
+    """
+    bounds = _parse_bounds()
+    if bounds is None:
+        return jsonify({"error": "Bounds parameters required"}), 400
+    try:
+        from .parking_cost import DEFAULT_STAY_MIN, clamp_stay, rank_parking
+    except ImportError as e:  # numpy missing
+        logger.warning("[parking] fee ranking unavailable: %s", e)
+        return jsonify({"error": "주차 요금 계산을 사용할 수 없습니다."}), 503
+
+    minutes = clamp_stay(request.args.get("minutes", default=DEFAULT_STAY_MIN))
+    limit = max(1, min(request.args.get("limit", type=int, default=20), 200))
+    session = get_dining_read_session()
+    try:
+        lots = rank_parking(session, bounds, minutes, request.args.get("lat", type=float),
+                            request.args.get("lng", type=float), limit)
+    finally:
+        session.remove()
+    return jsonify({"stayMinutes": minutes, "lots": lots})
+
+
+@dining_bp.route("/api/places/cached", methods=["GET"])
+def places_cached():
+    """Cursor-paginated cached crawl results: ?cursor=<nextCursor>&limit=500&stale=1."""
+    bounds = _parse_bounds()
+    limit = max(1, min(request.args.get("limit", type=int, default=500), 5000))
+    session = get_dining_read_session()
+    try:
+        items, next_cursor = find_cached_places_page(
+            session,
+            bounds,
+            max_age_hours=None if request.args.get("stale") == "1"
+            else request.args.get("maxAgeHours", type=int, default=24),
+            cursor=request.args.get("cursor"),
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        session.remove()
+    return jsonify({"items": items, "nextCursor": next_cursor})
+
+
+def _with_parking_costs(places: list[dict], minutes) -> list[dict]:
+    """Add stayMinutes/estimatedCost to the parking places, for the LLM and the course builder."""
+    lot_ids = [p["id"] for p in places if p.get("type") == "parking"]
+    if not lot_ids:
+        return places
+    try:
+        from .parking_cost import clamp_stay, get_fee_table
+    except ImportError as e:  # numpy missing: courses are built without fees
+        logger.warning("[search] parking costs unavailable: %s", e)
+        return places
+
+    minutes = clamp_stay(minutes)
+    session = get_dining_read_session()
+    try:
+        costs = get_fee_table(session).costs_for(lot_ids, minutes)
+    finally:
+        session.remove()
+    for p in places:
+        if p.get("type") == "parking" and p["id"] in costs:
+            p["stayMinutes"] = minutes
+            p["estimatedCost"] = costs[p["id"]]
+    return places
+
+
+@dining_bp.route("/api/places/search", methods=["POST"])
+def search():
+    data = request.get_json(silent=True) or {}
+    query = data.get("query")
+    if not query:
+        return jsonify({"error": "query is required"}), 400
+
+    try:
+        status, body = run_search(query, data.get("bounds"),
+                                  lambda b: _with_parking_costs([p.to_dict() for p in _load_places(b)],
+                                                                data.get("parkingMinutes")))
+    except Exception as e:
+        logger.error("Search error: %s", e)
+        return jsonify({"error": "검색 처리 중 오류가 발생했습니다."}), 500
+    return _json_response(dumps(body), status)
+
+
+def _sse(data: dict) -> str:
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@dining_bp.route("/api/places/crawl", methods=["POST"])
+def crawl():
+    data = request.get_json(silent=True) or {}
+    keyword = (data.get("keyword") or "").strip()
+    bounds = data.get("bounds")
+    if not keyword:
+        return jsonify({"error": "keyword required"}), 400
+
+    # Stale-while-revalidate: any previous crawl is served immediately, old ones
+    # are refreshed in the background. {"refresh": true} forces a live crawl.
+    if not data.get("refresh"):
+        result, state = refresh_scheduler.lookup(keyword)
+        if result == "stale":
+            refresh_scheduler.enqueue(keyword, bounds)
+        if state is not None:
+            return Response(
+                _sse({"step": "done", "count": state.place_count or 0, "parkingAdded": 0,
+                      "keyword": keyword, "cache": result}),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
+
+    def generate():
+        # The SSE body outlives the request hooks, so the stream gets its own trace
+        token = start_trace("dining.crawl.stream")
+        try:
+            for event in run_crawl(keyword, bounds):
+                yield _sse(event)
+        except Exception as e:
+            logger.error("Crawl API error: %s", e)
+            yield _sse({"step": "error", "message": "크롤링 중 오류가 발생했습니다."})
+        finally:
+            finish_trace(token)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+    )
+
+
+@dining_bp.route("/api/metrics", methods=["GET"])
+def metrics():
+    """Prometheus text exposition of stage/request histograms and counters.
+
+    Values are the answering worker's own, labelled worker="<pid>"; see metrics.py.
+    """
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+def _admin_denied():
+    """403 unless the X-Admin-Token header matches DINING_ADMIN_TOKEN (always 403 when that is unset)."""
+    token = os.getenv("DINING_ADMIN_TOKEN")
+    if not token or not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return jsonify({"error": "Admin token required"}), 403
+    return None
+
+
+@dining_bp.route("/api/traces", methods=["GET"])
+def traces():
+    """Recent sampled or slow request traces, each broken down by stage.
+
+    Spans carry query text; requires the X-Admin-Token header like /api/profile.
+    """
+    denied = _admin_denied()
+    if denied:
+        return denied
+    return jsonify(recent_traces(request.args.get("limit", type=int, default=50)))
+
+
+@dining_bp.route("/api/profile", methods=["GET", "DELETE"])
+def profile():
+    """Sampled request stacks per endpoint (see profiler.py).
+
+    Default: collapsed stacks as text, ready for flamegraph.pl / speedscope
+    (?endpoint=dining.search for one endpoint). ?format=json gives request
+    and sample counts with the heaviest frames; DELETE clears the stacks.
+    Requires the X-Admin-Token header; disabled unless DINING_ADMIN_TOKEN is set.
+    """
+    denied = _admin_denied()
+    if denied:
+        return denied
+    if request.method == "DELETE":
+        reset_profiles()
+        return jsonify({"ok": True})
+    if request.args.get("format") == "json":
+        return jsonify(profile_summary(request.args.get("top", type=int, default=10)))
+    return Response(collapsed_stacks(request.args.get("endpoint")), mimetype="text/plain")
+
+
+@dining_bp.route("/api/refresh/status", methods=["GET"])
+def refresh_status():
+    """Cache hit ratio, share of crawls that waited on a live crawl, and the refresh queue."""
+    return jsonify(refresh_scheduler.status())
+
+
+@dining_bp.route("/api/llm/budget", methods=["GET"])
+def llm_budget():
+    """Current LLM token window and in-flight calls; totals are in /api/metrics."""
+    return jsonify(budget_status())
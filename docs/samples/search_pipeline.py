@@ -0,0 +1,257 @@
+"""Search pipeline — /api/places/search as a graph of concurrent stages under one deadline.
+
+    location (LLM) ──► geocode ──► places ──┬──► recommendations (LLM)
+    landmark in query ──► speculative places ┘  └──► keyword fallback
+
+Places for the landmark named in the query (or for the map viewport) load
+while the location LLM call is in flight and are used when the geocoded
+bounds agree. The keyword fallback is computed next to the recommendations
+call and answers the request if the deadline passes first. LLM calls get
+the time left as their timeout, which covers reading the response body, so
+nothing outlives the request by much.
+"""
+
+import os
+import logging
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextvars import copy_context
+
+from .geocode import bounds_from_center, geocode, landmark_in_text
+from .llm_service import extract_location, get_recommendations, keyword_fallback
+from .metrics import counter, span
+from .profiler import profile_thread
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RADIUS_KM = 1.5
+SEARCH_DEADLINE_SEC = float(os.getenv("DINING_SEARCH_DEADLINE_SEC", "55"))
+SEARCH_WORKERS = int(os.getenv("DINING_SEARCH_WORKERS", "16"))
+SEARCH_CONCURRENT = os.getenv("DINING_SEARCH_CONCURRENT", "1") == "1"  # 0 = one stage after another
+FALLBACK_GRACE_SEC = 2.0  # how long the keyword fallback may still take once the deadline has passed
+
+SEARCH_STAGES = counter("dining_search_stages_total", "Search pipeline stages by stage and outcome")
+
+NO_LOCATION_WARNING = "AI 서비스에 연결할 수 없어 위치를 자동 인식하지 못했습니다. 현재 지도 영역에서 키워드 기반으로 검색합니다."
+SLOW_LLM_WARNING = "AI 추천이 지연되어 키워드 기반 검색 결과를 대신 표시합니다."
+
+
+class DeadlineExceeded(Exception):
+    """The search deadline passed before a stage finished."""
+
+
+# --------------- Task graph ---------------
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(SEARCH_WORKERS, thread_name_prefix="dining-search")
+        return _pool
+
+
+def _reset_after_fork():
+    # Pool threads do not survive fork; the child builds its own pool on first use
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class TaskGraph:
+    """Stages that start as soon as their inputs are ready, sharing one deadline.
+
+    ``add(name, fn, *deps)`` runs ``fn(*dep_results)`` on the shared pool
+    (inline, in insertion order, when ``concurrent`` is False). A stage whose
+    input failed fails with the same error. ``cancel()`` drops stages that
+    have not started; running ones end on their own timeouts.
+    """
+
+    def __init__(self, deadline_sec: float, concurrent: bool = True):
+        self.deadline = time.monotonic() + deadline_sec
+        self.concurrent = concurrent
+        self._futures: dict[str, Future] = {}
+        self._cancelled = threading.Event()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._futures
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def add(self, name: str, fn, *deps: str) -> None:
+        future: Future = Future()
+        inputs = [self._futures[d] for d in deps]
+        self._futures[name] = future
+        context = copy_context()  # pool threads keep the request's trace
+
+        def run():
+            if self._cancelled.is_set():
+                future.cancel()
+            if not future.set_running_or_notify_cancel():
+                SEARCH_STAGES.inc(stage=name, outcome="cancelled")
+                return
+            try:
+                args = [f.result() for f in inputs]
+                with span(f"search.{name}"), profile_thread():
+                    result = fn(*args)
+            except BaseException as e:
+                SEARCH_STAGES.inc(stage=name, outcome="error")
+                future.set_exception(e)
+            else:
+                SEARCH_STAGES.inc(stage=name, outcome="ok")
+                future.set_result(result)
+
+        if not self.concurrent:
+            run()
+            return
+
+        waiting = [len(inputs)]
+        lock = threading.Lock()
+
+        def input_done(_):
+            with lock:
+                waiting[0] -= 1
+                ready = waiting[0] == 0
+            if ready:
+                _executor().submit(context.run, run)
+
+        if not inputs:
+            _executor().submit(context.run, run)
+        for f in inputs:
+            f.add_done_callback(input_done)
+
+    def result(self, name: str, timeout: float | None = None):
+        """Wait for a stage until the deadline (or ``timeout``); re-raises the stage's own error."""
+        try:
+            return self._futures[name].result(timeout=self.remaining() if timeout is None else timeout)
+        except FutureTimeout:
+            SEARCH_STAGES.inc(stage=name, outcome="timeout")
+            raise DeadlineExceeded(name) from None
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        for future in self._futures.values():
+            future.cancel()
+
+
+# --------------- Search ---------------
+
+
+def _response(llm_result: dict, places: list[dict], center: dict | None) -> dict:
+    place_map = {p["id"]: p for p in places}
+    referenced = []
+    seen = set()
+    for course in llm_result["courses"]:
+        for stop in course["stops"]:
+            if stop["id"] not in seen and stop["id"] in place_map:
+                seen.add(stop["id"])
+                referenced.append(place_map[stop["id"]])
+
+    first_course = llm_result["courses"][0] if llm_result["courses"] else None
+    return {
+        "summary": llm_result["summary"],
+        "persona": llm_result["persona"],
+        "courses": llm_result["courses"],
+        "recommendations": first_course["stops"] if first_course else [],
+        "routeSummary": first_course["routeSummary"] if first_course else "",
+        "places": referenced,
+        "center": center,
+    }
+
+
+def run_search(query: str, viewport: dict | None, load_places, concurrent: bool = SEARCH_CONCURRENT) -> tuple[int, dict]:
+    """Answer a natural-language search; returns (HTTP status, JSON body).
+
+    ``load_places(bounds)`` returns the place dicts in bounds (routes passes
+    the classified, ranked and deduplicated loader).
+    """
+    graph = TaskGraph(SEARCH_DEADLINE_SEC, concurrent)
+    graph.add("location", lambda: extract_location(query, timeout=max(graph.remaining(), 0.1)))
+
+    speculative = None
+    if concurrent:
+        guess = landmark_in_text(query)
+        speculative = bounds_from_center(guess["lat"], guess["lng"], SEARCH_RADIUS_KM) if guess else viewport
+        if speculative:
+            graph.add("speculative_places", lambda: load_places(speculative))
+
+    def locate(loc: dict):
+        geo = geocode(loc["location"]) if loc.get("location") else None
+        if not geo:
+            return viewport, None
+        center = {"lat": geo["lat"], "lng": geo["lng"], "name": loc["location"]}
+        return bounds_from_center(geo["lat"], geo["lng"], SEARCH_RADIUS_KM), center
+
+    def places_in(located):
+        bounds, _ = located
+        if not bounds:
+            return None
+        if "speculative_places" in graph:
+            if bounds == speculative:
+                try:
+                    places = graph.result("speculative_places")
+                    SEARCH_STAGES.inc(stage="speculative_places", outcome="reused")
+                    return places
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    logger.warning("[search] speculative load failed, reloading: %s", e)
+            else:
+                SEARCH_STAGES.inc(stage="speculative_places", outcome="discarded")
+        return load_places(bounds)
+
+    graph.add("geocode", locate, "location")
+    graph.add("places", places_in, "geocode")
+    graph.add("recommendations",
+              lambda located, places: get_recommendations(query, places, located[1], timeout=max(graph.remaining(), 0.1))
+              if places else None, "geocode", "places")
+    if concurrent:
+        graph.add("fallback", lambda located, places: keyword_fallback(query, places, located[1]) if places else None,
+                  "geocode", "places")
+
+    try:
+        loc = graph.result("location")
+        bounds, center = graph.result("geocode")
+        if not bounds:
+            return 400, {"error": "위치를 확인할 수 없습니다. 지도에서 검색하거나 위치를 포함해 주세요."}
+        places = graph.result("places")
+        if not places:
+            return 200, {
+                "summary": "이 지역에 등록된 장소가 없습니다.",
+                "persona": "",
+                "courses": [],
+                "recommendations": [],
+                "routeSummary": "",
+                "places": [],
+                "center": center,
+            }
+
+        warning = NO_LOCATION_WARNING if loc.get("error") else None
+        try:
+            llm_result = graph.result("recommendations")
+        except DeadlineExceeded:
+            if "fallback" not in graph:
+                raise
+            logger.warning("[search] recommendations missed the %.0fs deadline, using keyword fallback",
+                           SEARCH_DEADLINE_SEC)
+            llm_result = dict(graph.result("fallback", timeout=FALLBACK_GRACE_SEC), warning=SLOW_LLM_WARNING)
+
+        body = _response(llm_result, places, center)
+        warning = llm_result.get("warning") or warning
+        if warning:
+            body["warning"] = warning
+        return 200, body
+    except (DeadlineExceeded, CancelledError) as e:
+        logger.error("[search] deadline exceeded at %s", e)
+        return 504, {"error": "검색 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요."}
+    finally:
+        graph.cancel()
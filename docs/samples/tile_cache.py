@@ -0,0 +1,264 @@
+"""Tile cache — place lists per fixed map tile in a memory-bounded LRU.
+
+Viewports are arbitrary float boxes, so two nearly identical pans never
+share a query. Tiles are not: a viewport is answered by merging the
+zoom-TILE_ZOOM tiles it covers (the same 360/2^z grid place_cluster uses),
+each loaded and mapped once and then served from memory until a write
+lands in it, its TTL runs out or the LRU evicts it.
+
+Writes invalidate only the tiles they touch: save_crawled_places drops its
+tiles directly, and every lookup first (at most once per _RELOAD_CHECK_SEC,
+right after notify_places_changed, or whenever the caller has seen a newer
+write) reads the crawled rows and tombstones written since the last check by
+any worker and drops the tiles those places were cached in or moved to. A
+seed data reload clears everything.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from .facet_index import seed_signature
+from .metrics import counter, gauge
+from .models import CrawledPlace, PlaceTombstone
+
+logger = logging.getLogger(__name__)
+
+TILE_ZOOM = int(os.getenv("DINING_TILE_ZOOM", "14"))  # ~2km tiles around Seoul
+TILE_CACHE_ENABLED = os.getenv("DINING_TILE_CACHE", "1") == "1"
+TILE_CACHE_PLACES = int(os.getenv("DINING_TILE_CACHE_PLACES", "200000"))  # places held per cache, across tiles
+TILE_TTL_SEC = float(os.getenv("DINING_TILE_TTL_SEC", "600"))
+MAX_TILES_PER_QUERY = 64  # wider viewports skip the cache and query directly
+_RELOAD_CHECK_SEC = 1.0
+_CATCH_UP_OVERLAP = timedelta(seconds=2)
+
+TILE_LOOKUPS = counter("dining_tile_cache_lookups_total", "Tile cache lookups by cache and outcome")
+TILE_PLACES = gauge("dining_tile_cache_places", "Places held in the tile cache")
+
+
+def _tile_size(zoom: int) -> float:
+    return 360.0 / (2 ** zoom)
+
+
+def tile_of(lat: float, lng: float, zoom: int = TILE_ZOOM) -> tuple[int, int]:
+    """(tx, ty) of the tile containing a coordinate."""
+    size = _tile_size(zoom)
+    return math.floor(lng / size), math.floor(lat / size)
+
+
+def tile_bounds(tile: tuple[int, int], zoom: int = TILE_ZOOM) -> dict:
+    size = _tile_size(zoom)
+    tx, ty = tile
+    return {"swLat": ty * size, "swLng": tx * size, "neLat": (ty + 1) * size, "neLng": (tx + 1) * size}
+
+
+def tiles_covering(bounds: dict, zoom: int = TILE_ZOOM) -> list[tuple[int, int]] | None:
+    """Tiles overlapping ``bounds``; None when there are more than MAX_TILES_PER_QUERY."""
+    x0, y0 = tile_of(bounds["swLat"], bounds["swLng"], zoom)
+    x1, y1 = tile_of(bounds["neLat"], bounds["neLng"], zoom)
+    if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_TILES_PER_QUERY:
+        return None
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def in_bounds(lat: float, lng: float, bounds: dict) -> bool:
+    return bounds["swLat"] <= lat <= bounds["neLat"] and bounds["swLng"] <= lng <= bounds["neLng"]
+
+
+def in_tile(lat: float, lng: float, tile: tuple[int, int]) -> bool:
+    """Exact tile membership; tile_bounds overlap on the shared edges, this does not."""
+    return tile_of(lat, lng) == tile
+
+
+class TileCache:
+    """LRU of tile → items, bounded by the number of items held and by a TTL.
+
+    ``get(tile, load)`` calls ``load(tile)`` on a miss; it returns
+    ``(items, crawled_ids)`` and the ids let a write to a place drop the tile
+    it was cached in even after the place moved (None: serve, don't keep).
+    A load that overlaps an invalidation is returned but not kept.
+    """
+
+    def __init__(self, name: str, max_items: int = TILE_CACHE_PLACES, ttl_sec: float = TILE_TTL_SEC):
+        self.name = name
+        self.max_items = max_items
+        self.ttl_sec = ttl_sec
+        self._tiles: OrderedDict = OrderedDict()  # tile → (expires_at, items, crawled_ids)
+        self._tile_by_id: dict[int, tuple[int, int]] = {}
+        self._items = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, tile: tuple[int, int], load) -> list:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tiles.get(tile)
+            if entry is not None and entry[0] > now:
+                self._tiles.move_to_end(tile)
+                self.hits += 1
+                TILE_LOOKUPS.inc(cache=self.name, outcome="hit")
+                return entry[1]
+            if entry is not None:
+                self._drop(tile)
+            generation = self._generation
+            self.misses += 1
+        TILE_LOOKUPS.inc(cache=self.name, outcome="miss")
+
+        items, crawled_ids = load(tile)
+        with self._lock:
+            if crawled_ids is not None and generation == self._generation and tile not in self._tiles:
+                self._tiles[tile] = (time.monotonic() + self.ttl_sec, items, crawled_ids)
+                self._tile_by_id.update(dict.fromkeys(crawled_ids, tile))
+                self._items += len(items)
+                while self._items > self.max_items and len(self._tiles) > 1:
+                    self._drop(next(iter(self._tiles)))
+                TILE_PLACES.set(self._items, cache=self.name)
+        return items
+
+    def _drop(self, tile) -> None:
+        _, items, crawled_ids = self._tiles.pop(tile)
+        self._items -= len(items)
+        for pid in crawled_ids:
+            if self._tile_by_id.get(pid) == tile:
+                del self._tile_by_id[pid]
+
+    def invalidate(self, tiles=(), crawled_ids=()) -> int:
+        """Drop ``tiles`` and the tiles holding ``crawled_ids``; returns how many were cached."""
+        with self._lock:
+            self._generation += 1
+            doomed = set(tiles) | {self._tile_by_id[pid] for pid in crawled_ids if pid in self._tile_by_id}
+            dropped = 0
+            for tile in doomed:
+                if tile in self._tiles:
+                    self._drop(tile)
+                    dropped += 1
+            TILE_PLACES.set(self._items, cache=self.name)
+            return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._tiles.clear()
+            self._tile_by_id.clear()
+            self._items = 0
+            TILE_PLACES.set(0, cache=self.name)
+
+
+# --------------- Process-wide caches ---------------
+
+_caches: dict[str, TileCache] = {}
+_caches_lock = threading.Lock()
+_watermark = None  # newest crawled write / deletion already applied
+_seed_sig = None
+_checked_at = 0.0
+_sync_lock = threading.Lock()
+
+
+def get_tile_cache(name: str) -> TileCache:
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = TileCache(name)
+        return _caches[name]
+
+
+def invalidate_tiles(points) -> None:
+    """Drop the tiles containing (lat, lng) ``points`` from every cache (after a local write)."""
+    tiles = {tile_of(lat, lng) for lat, lng in points if lat is not None and lng is not None}
+    if tiles:
+        for cache in list(_caches.values()):
+            cache.invalidate(tiles)
+
+
+def _sync(session) -> None:
+    global _watermark, _seed_sig
+    sig = seed_signature(session)
+    if sig != _seed_sig:
+        if _seed_sig is not None:
+            logger.info("[tiles] seed data changed, clearing tile caches")
+        for cache in list(_caches.values()):
+            cache.clear()
+        _seed_sig = sig
+        _watermark = max(
+            filter(None, (session.query(func.max(CrawledPlace.updated_at)).scalar(),
+                          session.query(func.max(PlaceTombstone.deleted_at)).scalar())),
+            default=None,
+        )
+        return
+
+    changed = session.query(CrawledPlace.id, CrawledPlace.lat, CrawledPlace.lng, CrawledPlace.updated_at)
+    removed = session.query(PlaceTombstone.place_id, PlaceTombstone.deleted_at).filter(
+        PlaceTombstone.place_kind == "crawled"
+    )
+    if _watermark is not None:
+        edge = _watermark - _CATCH_UP_OVERLAP
+        changed = changed.filter(CrawledPlace.updated_at >= edge)
+        removed = removed.filter(PlaceTombstone.deleted_at >= edge)
+    changed, removed = changed.all(), removed.all()
+    if not changed and not removed:
+        return
+    tiles = {tile_of(r.lat, r.lng) for r in changed if r.lat is not None and r.lng is not None}
+    ids = [r.id for r in changed] + [r.place_id for r in removed]
+    for cache in list(_caches.values()):
+        cache.invalidate(tiles, ids)
+    _watermark = max(filter(None, [_watermark] + [r.updated_at for r in changed] + [r.deleted_at for r in removed]),
+                     default=None)
+
+
+def _covers(fresh_as_of: tuple | None) -> bool:
+    # Has the cache applied every write up to (data watermark, seed signature)?
+    if fresh_as_of is None:
+        return True
+    watermark, seed_sig = fresh_as_of
+    applied = _watermark.replace(tzinfo=None) if _watermark is not None else datetime(1970, 1, 1)
+    return seed_sig == _seed_sig and applied >= watermark
+
+
+def catch_up_tiles(session, fresh_as_of: tuple | None = None) -> None:
+    """Apply writes made by any worker since the last check.
+
+    Rate-limited to once per _RELOAD_CHECK_SEC, except that a caller which
+    already read the database's (data_watermark, seed_signature) — the
+    /api/places ETag — passes it as ``fresh_as_of`` and the cache catches up
+    at once if it is behind, so a body is never older than its tag.
+    """
+    global _checked_at
+    with _sync_lock:
+        now = time.monotonic()
+        if now - _checked_at < _RELOAD_CHECK_SEC and _covers(fresh_as_of):
+            return
+        _checked_at = now
+        _sync(session)
+
+
+def mark_tiles_stale():
+    """Post-write hook: the next lookup catches up instead of waiting for the check interval."""
+    global _checked_at
+    _checked_at = 0.0
+
+
+def tiled(session, cache_name: str, bounds: dict, load, fresh_as_of: tuple | None = None) -> list | None:
+    """Items of every tile covering ``bounds`` (unfiltered), or None when the cache does not apply.
+
+    ``fresh_as_of`` is passed through to catch_up_tiles.
+    """
+    if not TILE_CACHE_ENABLED:
+        return None
+    tiles = tiles_covering(bounds)
+    if tiles is None:
+        return None
+    catch_up_tiles(session, fresh_as_of)
+    cache = get_tile_cache(cache_name)
+    items = []
+    for tile in tiles:
+        items += cache.get(tile, load)
+    return items
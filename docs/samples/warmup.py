@@ -0,0 +1,96 @@
+"""Pre-fork warm-up — build the read-only serving state once in the Gunicorn master.
+
+With ``preload_app = True`` the master imports the app; ``when_ready`` then
+imports the serving modules, builds the parking, fee and facet indexes and maps
+the place snapshot before any worker is forked, so every worker starts with
+them already in (copy-on-write shared) memory instead of rebuilding them on
+its first request. SQLite connections are closed before the fork and
+models.py rebuilds its engines lazily in each child.
+
+gunicorn.conf.py:
+
+    preload_app = True
+    from docs.samples.warmup import when_ready  # noqa: F401
+
+HTTP and HTML libraries are imported on first use by the modules that need
+them; requests (geocoding, LLM calls) is preloaded here, bs4 (crawl path
+only) is not.
+"""
+
+import gc
+import importlib
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("DINING_WARMUP", "1") == "1"
+
+# Everything /api/places and /api/places/search touch; routes imports the rest
+SERVE_MODULES = (
+    "profiler",
+    "metrics",
+    "models",
+    "geocode",
+    "place_records",
+    "place_mapper",
+    "place_cluster",
+    "parking_index",
+    "facet_index",
+    "tile_cache",
+    "place_cache",
+    "llm_service",
+    "routes",
+)
+
+
+def _timed(stats: dict, key: str, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    stats[key] = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+def warm_up() -> dict:
+    """Import, index and map everything read-only; returns per-stage milliseconds."""
+    stats: dict = {"importMs": {}}
+    for name in SERVE_MODULES:
+        _timed(stats["importMs"], name, importlib.import_module, f"{__package__}.{name}")
+    _timed(stats["importMs"], "requests", importlib.import_module, "requests")
+
+    from .facet_index import get_facet_index
+    from .models import dispose_engines, get_dining_read_session
+    from .parking_index import get_parking_index
+
+    try:
+        from .parking_cost import get_fee_table
+    except ImportError:  # numpy missing; searches then skip parking fees
+        get_fee_table = None
+
+    session = get_dining_read_session()
+    try:
+        _timed(stats, "parkingIndexMs", get_parking_index, session)
+        _timed(stats, "facetIndexMs", get_facet_index, session)
+        if get_fee_table is not None:
+            _timed(stats, "parkingFeesMs", get_fee_table, session)
+    finally:
+        session.remove()
+    if os.getenv("DINING_SNAPSHOT_DIR"):
+        from .place_snapshot import get_snapshot
+
+        _timed(stats, "snapshotMs", get_snapshot)
+    dispose_engines()
+
+    # Keep the collector from writing to (and so un-sharing) pages of everything built so far
+    gc.collect()
+    gc.freeze()
+    stats["frozenObjects"] = gc.get_freeze_count()
+    logger.info("[warmup] %s", stats)
+    return stats
+
+
+def when_ready(server):
+    """Gunicorn hook: runs in the master after preload, before the first worker is forked."""
+    if WARMUP_ENABLED:
+        warm_up()